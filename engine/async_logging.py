@@ -0,0 +1,96 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+OVERFLOW_POLICIES = ("drop", "block")
+
+_listener = None
+_handler = None
+_handlers = []
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler of the simulation loop: records are put on a bounded queue as they are, and a background thread
+    formats and writes them. When the queue is full, the record is either dropped (and counted) or the caller waits.
+    """
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop"):
+        """
+        Constructor for BoundedQueueHandler class.
+        :param log_queue: The bounded queue read by the writer thread.
+        :param overflow: drop (lose the new records while the queue is full) or block (wait for the writer).
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown log overflow policy: {overflow}.")
+        super().__init__(log_queue)
+        self.__block = overflow == "block"
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The message is formatted by the writer thread, the record never leaves the process
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.__block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room in a full queue rather than failing to stop the writer
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(engine_config: dict):
+    """
+    Route the logging of the simulator through a bounded queue written by a background thread, so that the tick loop
+    never waits on console or file I/O. The handlers already attached to the root logger (a stream handler with the
+    default format if there is none) are moved behind the queue. Only the first call has an effect.
+    :param engine_config: Engine configuration, as returned by load_engine_from_yaml.
+    """
+    global _listener, _handler, _handlers
+    if _listener is not None:
+        return
+    engine = engine_config["engine"]
+    root = logging.getLogger()
+    root.setLevel(engine.get("log_level", "INFO"))
+    _handlers = root.handlers[:]
+    if not _handlers:
+        stream = logging.StreamHandler()
+        stream.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        _handlers = [stream]
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    _handler = BoundedQueueHandler(queue.Queue(maxsize=engine.get("log_queue_size", 10000)),
+                                   engine.get("log_overflow", "drop"))
+    root.addHandler(_handler)
+    _listener = _Listener(_handler.queue, *_handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """
+    Write the queued records, stop the writer thread and give the handlers back to the root logger.
+    """
+    global _listener, _handler
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_handler)
+    _listener.stop()
+    for handler in _handlers:
+        root.addHandler(handler)
+    if _handler.dropped:
+        logging.getLogger(__name__).warning("%d log records were dropped while the log queue was full.",
+                                            _handler.dropped)
+    _listener = None
+    _handler = None
@@ -1,7 +1,5 @@
 from itertools import starmap
 
-import pygame as pg
-
 
 class Placeable:
     """
@@ -65,6 +63,7 @@ class Rectangle(Placeable):
         abs_y = int(self.y * tile_size)
         abs_width = int(self.width * tile_size)
         abs_height = int(self.height * tile_size)
+        import pygame as pg
         pg.draw.rect(screen, self.color, (abs_x, abs_y, abs_width, abs_height))
 
 class Polygon(Placeable):
@@ -77,6 +76,7 @@ class Polygon(Placeable):
 
     def draw(self, screen, screen_width, screen_height, tile_size):
         processed_points = list(starmap(lambda x, y: (x * tile_size, y * tile_size), self.points))
+        import pygame as pg
         pg.draw.polygon(screen, self.color, processed_points)
 
 class Circle(Placeable):
@@ -91,4 +91,5 @@ class Circle(Placeable):
         abs_y = int(self.y * tile_size + tile_size / 2)
         abs_radius = tile_size / 2.5
 
+        import pygame as pg
         pg.draw.circle(screen, self.color, (abs_x, abs_y), abs_radius)
\ No newline at end of file
@@ -0,0 +1,215 @@
+import os
+
+from engine.async_logging import configure_logging
+from interaction.disease.health_manager import PandemicStateManager
+from interaction.disease.spread_simulator import SpreadSimulator
+from interaction.recording.event_log import EventLog, EventSink, TextEventFormatter
+from interaction.sampler import Sampler
+from interaction.scene_orchestrator import SceneOrchestrator
+from interaction.scheduler import AgentScheduler
+from interaction.timer import Timer
+from interaction.traversealgorithms.flowfield import FlowFieldSet
+from interaction.traversealgorithms.navigator import Navigator
+from interaction.traversealgorithms.path_queue import PathRequestQueue
+from loader.agents_loader import load_agents_from_yaml
+from loader.map_compiler import CompiledMap, compile_map
+
+
+def build_orchestrator(engine_config: dict,
+                       width=800,
+                       height=600,
+                       tile_size=5,
+                       map_file='config/map.yaml',
+                       agent_file='config/agents.yaml',
+                       viewer=False) -> SceneOrchestrator:
+    """
+    Build a ready-to-run SceneOrchestrator from the configuration files, without any rendering dependency.
+    :param engine_config: Engine configuration, as returned by load_engine_from_yaml.
+    :param width: Width of the simulated area in pixels.
+    :param height: Height of the simulated area in pixels.
+    :param tile_size: Tile size of each tile.
+    :param map_file: Path to the yaml configuration file.
+    :param agent_file: Path to the yaml configuration file.
+    :param viewer: True if the scene is drawn, every day is then simulated tick by tick.
+    :return: The orchestrator of the scene.
+    """
+    if not os.path.exists(map_file):
+        raise FileNotFoundError(f"File {map_file} not found.")
+    if width % tile_size != 0 or height % tile_size != 0:
+        raise ValueError("Width and height must be divisible by tile_size.")
+    # Logging goes through a background writer thread from now on
+    configure_logging(engine_config)
+
+    # Load scene configuration (reusing the compiled map when the map file did not change)
+    compiled_map = compile_map(
+        map_file, width=width, height=height, tile_size=tile_size,
+        map_density=engine_config["engine"]["map_density"],
+        cache_dir=engine_config["engine"].get("map_cache_dir")
+    )
+    placeables = compiled_map.scene
+    agents, teacher = load_agents_from_yaml(agent_file)
+
+    # Load engine configuration
+    start_time_str = engine_config["engine"]["start_time"]  # e.g. "07:30"
+    end_time_str = engine_config["engine"]["end_time"]  # e.g. "13:50"
+    num_weeks = engine_config["engine"]["num_weeks"]  # e.g. 2
+    collision_grid = compiled_map.collision_grid
+    population_engine = engine_config["engine"].get("population_engine", "objects")
+    if population_engine not in ("objects", "arrays"):
+        raise ValueError(f"Unknown population engine: {population_engine}.")
+    pathfinding = engine_config["engine"].get("pathfinding", "astar")
+    if pathfinding not in ("astar", "jps", "hpa", "flowfield"):
+        raise ValueError(f"Unknown pathfinding strategy: {pathfinding}.")
+    if pathfinding in ("hpa", "flowfield"):
+        # These read the grid cell by cell in python loops, much faster on lists than on the array that A* and JPS use
+        collision_grid = collision_grid.tolist()
+    flow_fields = None
+    if pathfinding == "flowfield":
+        flow_fields = FlowFieldSet(collision_grid, _fixed_destinations(compiled_map,
+                                                                       engine_config["engine"]["map_density"]))
+    navigator = Navigator(collision_grid, cache_size=engine_config["engine"].get("path_cache_size", 4096),
+                          flow_fields=flow_fields, algorithm="astar" if pathfinding == "flowfield" else pathfinding,
+                          cluster_size=engine_config["engine"].get("hpa_cluster_size", 10))
+    # Optional per-phase profiling of the ticks, the agents find it in their properties
+    profiler = None
+    if engine_config["engine"].get("profile", False):
+        from interaction.recording.tick_profiler import TickProfiler
+        profiler = TickProfiler(engine_config["engine"].get("profile_dir", "log_processing/profile"),
+                                trace_steps=engine_config["engine"].get("profile_trace_steps", 20000))
+    agents_prop = {
+        "start_time": engine_config["engine"]["start_time"],
+        "end_time": engine_config["engine"]["end_time"],
+        "map_density": engine_config["engine"]["map_density"],
+        "grid_density": engine_config["engine"]["grid_density"],
+        "infection_prob": engine_config["engine"]["infection_prob"],
+        "base_shedding": engine_config["engine"]["base_shedding"],
+        "tile_size": tile_size,
+        "height": height,
+        "width": width,
+        "collision_grid": collision_grid,
+        "navigator": navigator,
+        "path_queue": PathRequestQueue(navigator, engine_config["engine"].get("path_expansion_budget", 0), profiler),
+        "time_step_seconds": engine_config["engine"]["time_step_seconds"],
+        "sampler": Sampler(engine_config["engine"].get("random_seed")),
+    }
+    if profiler is not None:
+        agents_prop["profiler"] = profiler
+
+    # Validate agents properties and map properties
+    if (teacher.schedule["arriving"] < engine_config["engine"]["start_time"] or
+            teacher.schedule["leaving"] >= engine_config["engine"]["end_time"]):
+        raise ValueError("Arriving and leaving times should be included in the total time of the simulation.")
+
+    for agent in agents:
+        if (agent.schedule["arriving"] < engine_config["engine"]["start_time"] or
+                agent.schedule["leaving"] >= engine_config["engine"]["end_time"]):
+            raise ValueError("Arriving and leaving times should be included in the total time of the simulation.")
+
+    if agents_prop["tile_size"] % agents_prop["map_density"] != 0:
+        raise ValueError("Map density must be divisible by tile size.")
+
+    timer = Timer(
+        start_time=start_time_str,
+        end_time=end_time_str,
+        num_weeks=num_weeks,
+        time_step_seconds=engine_config["engine"]["time_step_seconds"]
+    )
+    agents_prop["clock"] = timer.clock
+
+    # Resolve the per-tick constants of every agent once
+    for agent in agents + ([teacher] if teacher else []):
+        agent.compile_profile(agents_prop, placeables)
+
+    spread_simulator = SpreadSimulator(
+        rows=height // tile_size * engine_config["engine"]["grid_density"],
+        cols=width // tile_size * engine_config["engine"]["grid_density"],
+        max_load=engine_config["engine"]["max_load"],
+        decay_const=engine_config["engine"]["decay_const"],
+        diffusion_coeff=engine_config["engine"]["diffusion_coeff"],
+        min_load=engine_config["engine"].get("min_load", 0.0)
+    )
+    # Optional trajectory recording (students first, then the teacher)
+    recorder = None
+    trajectory_file = engine_config["engine"].get("trajectory_file")
+    if trajectory_file:
+        from interaction.recording.trajectory_recorder import TrajectoryRecorder
+        agent_ids = [agent.id for agent in agents] + ([teacher.id] if teacher else [])
+        recorder = TrajectoryRecorder(trajectory_file, agent_ids)
+    # Events (day starts and health transitions): typed log and/or text log
+    events = TextEventFormatter() if engine_config["engine"].get("text_log", True) else EventSink()
+    event_log_file = engine_config["engine"].get("event_log_file")
+    if event_log_file:
+        agent_ids = [agent.id for agent in agents] + ([teacher.id] if teacher else [])
+        metadata = {"engine": engine_config["engine"], "map_file": map_file, "agent_file": agent_file,
+                    "width": width, "height": height, "tile_size": tile_size}
+        events = EventLog(event_log_file, timer, agent_ids, metadata,
+                          formatter=events if engine_config["engine"].get("text_log", True) else None)
+    # Optional contact network, written out per day
+    contacts = None
+    contact_network_dir = engine_config["engine"].get("contact_network_dir")
+    if contact_network_dir:
+        from interaction.recording.contact_network import ContactNetwork
+        agent_ids = [agent.id for agent in agents] + ([teacher.id] if teacher else [])
+        contacts = ContactNetwork(contact_network_dir, agent_ids,
+                                  radius=engine_config["engine"].get("contact_radius", 2),
+                                  seconds_per_tick=engine_config["engine"]["time_step_seconds"])
+    # Optional population-level health bookkeeping (always used by the struct-of-arrays engine)
+    health = None
+    infection_model = engine_config["engine"].get("infection_model", "per_tick")
+    if infection_model == "dose" and population_engine != "arrays" and \
+            not engine_config["engine"].get("population_health", False):
+        raise ValueError("The dose infection model needs population_health or the arrays engine.")
+    everyone = agents + ([teacher] if teacher else [])
+    if population_engine == "arrays" or engine_config["engine"].get("population_health", False):
+        from interaction.disease.population_health import PopulationHealth
+        health = PopulationHealth([agent.id for agent in everyone], timer, agents_prop["sampler"],
+                                  agents_prop["infection_prob"], infection_model=infection_model, events=events)
+        for index, agent in enumerate(everyone):
+            agent.attach_health(health.handle(index))
+    else:
+        # Per-agent health managers drawing from the sampler of the run and reporting to its sink
+        for agent in everyone:
+            agent.attach_health(PandemicStateManager(agent.id, agents_prop["sampler"], events))
+    # Optional struct-of-arrays engine, the agents then only provide their static attributes
+    population = None
+    if population_engine == "arrays":
+        from interaction.agents.population import Population
+        population = Population(agents, teacher, agents_prop, placeables, health, agents_prop["sampler"])
+    # Optional active-set scheduling of the agent objects
+    scheduler = None
+    if population is None and engine_config["engine"].get("active_set_scheduler", False):
+        scheduler = AgentScheduler(agents + ([teacher] if teacher else []), timer.clock)
+
+    return SceneOrchestrator(
+        agents=agents,
+        agents_prop=agents_prop,
+        teacher=teacher,
+        placeables=placeables,
+        timer=timer,
+        spread_simulator=spread_simulator,
+        recorder=recorder,
+        population=population,
+        scheduler=scheduler,
+        event_jump=engine_config["engine"].get("event_jump", False),
+        skip_quiet_days=engine_config["engine"].get("skip_quiet_days", False) and not viewer,
+        health=health,
+        contacts=contacts,
+        events=events,
+        profiler=profiler
+    )
+
+
+def _fixed_destinations(compiled_map: CompiledMap, map_density) -> list[list[tuple[int, int]]]:
+    """
+    List the destinations agents walk to: every chair, the armchair, the entrance and the back hotspot.
+    :return: One list of (row, col) cells per destination.
+    """
+    destinations = [[(int(row), int(col))] for col, row in compiled_map.chairs]
+    for index in compiled_map.by_type.get("Armchair", [])[:1]:
+        armchair = compiled_map.placeables[index]
+        destinations.append([(int(armchair.y * map_density), int(armchair.x * map_density))])
+    for name in ("Entrance", "BackHotspot"):
+        if name in compiled_map.hotspots:
+            left, top, width, height = compiled_map.hotspots[name]
+            destinations.append([(row, col) for row in range(top, top + height) for col in range(left, left + width)])
+    return destinations
@@ -3,14 +3,10 @@ import os
 import pygame as pg
 import logging
 
-from interaction.disease.spread_simulator import SpreadSimulator
-from interaction.traversealgorithms.collisiongrid import build_collision_grid
-from interaction.scene_orchestrator import SceneOrchestrator
-from interaction.timer import Timer
-from loader.agents_loader import load_agents_from_yaml
-from loader.scene_loader import load_scene_from_yaml
 from loader.engine_loader import load_engine_from_yaml
+from engine.async_logging import shutdown_logging
 from engine.scenedrawer import SceneDrawer
+from engine.simulation_builder import build_orchestrator
 
 
 class SimulationEngine:
@@ -53,74 +49,24 @@ class SimulationEngine:
         self.__running = True
         self.__clock = pg.time.Clock()
 
-        # Load scene configuration
-        placeables = load_scene_from_yaml(map_file)
-        agents, teacher = load_agents_from_yaml(agent_file)
-
         # Load engine configuration
         engine_config = load_engine_from_yaml(engine_file)
-        start_time_str = engine_config["engine"]["start_time"]  # e.g. "07:30"
-        end_time_str = engine_config["engine"]["end_time"]  # e.g. "13:50"
-        num_weeks = engine_config["engine"]["num_weeks"]  # e.g. 2
-        collision_grid = build_collision_grid(
-            placeables, width=1200, height=720,
-            tile_size=tile_size, map_density=engine_config["engine"]["map_density"]
-        )
-        agents_prop = {
-            "start_time": engine_config["engine"]["start_time"],
-            "end_time": engine_config["engine"]["end_time"],
-            "map_density": engine_config["engine"]["map_density"],
-            "grid_density": engine_config["engine"]["grid_density"],
-            "infection_prob": engine_config["engine"]["infection_prob"],
-            "base_shedding": engine_config["engine"]["base_shedding"],
-            "tile_size": self.__tile_size,
-            "height": self.__height,
-            "width": self.__width,
-            "collision_grid": collision_grid,
-            "time_step_seconds": engine_config["engine"]["time_step_seconds"],
-        }
-
-        # Validate agents properties and map properties
-        if (teacher.schedule["arriving"] < engine_config["engine"]["start_time"] or
-                teacher.schedule["leaving"] >= engine_config["engine"]["end_time"]):
-            raise ValueError("Arriving and leaving times should be included in the total time of the simulation.")
-
-        for agent in agents:
-            if (agent.schedule["arriving"] < engine_config["engine"]["start_time"] or
-                    agent.schedule["leaving"] >= engine_config["engine"]["end_time"]):
-                raise ValueError("Arriving and leaving times should be included in the total time of the simulation.")
-
-        if agents_prop["tile_size"] % agents_prop["map_density"] != 0:
-            raise ValueError("Map density must be divisible by tile size.")
-
-        # Set logger properties
+
+        # Set logger properties (the handlers are configured by build_orchestrator)
         self.__logger = logging.getLogger(self.__class__.__name__)
-        logging.basicConfig(level=logging.INFO)
 
         # Discrete stepping / speed config
         self.__time_step_sec = engine_config["engine"]["time_step_seconds"]  # e.g. 5
         self.__speed_x = engine_config["engine"]["speed_x"]  # e.g. 1 (can be changed)
 
-        timer = Timer(
-            start_time=start_time_str,
-            end_time=end_time_str,
-            num_weeks=num_weeks,
-            time_step_seconds=self.__time_step_sec
-        )
-        spread_simulator = SpreadSimulator(
-            rows=self.__height // self.__tile_size * engine_config["engine"]["grid_density"],
-            cols=self.__width // self.__tile_size * engine_config["engine"]["grid_density"],
-            max_load=engine_config["engine"]["max_load"],
-            decay_const=engine_config["engine"]["decay_const"],
-            diffusion_coeff=engine_config["engine"]["diffusion_coeff"]
-        )
-        self.__orchestrator = SceneOrchestrator(
-            agents=agents,
-            agents_prop=agents_prop,
-            teacher=teacher,
-            placeables=placeables,
-            timer=timer,
-            spread_simulator=spread_simulator
+        self.__orchestrator = build_orchestrator(
+            engine_config,
+            width=self.__width,
+            height=self.__height,
+            tile_size=self.__tile_size,
+            map_file=map_file,
+            agent_file=agent_file,
+            viewer=True
         )
 
         self.__drawer = SceneDrawer(self.__screen, self.__orchestrator)
@@ -130,6 +76,7 @@ class SimulationEngine:
         self.__logger.info("Starting simulation engine ...")
 
         self.__running = True
+        profiler = self.__orchestrator.profiler
 
         # The real time between steps depends on speed_x.
         while self.__running:
@@ -147,10 +94,14 @@ class SimulationEngine:
                 self.__running = False
                 continue
 
-            # 4. Draw the scene
+            # 4. Draw the scene (charged to the step that was just simulated)
+            if profiler is not None:
+                profiler.switch("render")
             self.__screen.fill((0, 0, 0))  # Clear screen
             self.__drawer.draw_scene(self.__tile_size)
             pg.display.flip()
+            if profiler is not None:
+                profiler.switch(None)
 
             # 5. Wait in real time depending on speed
             real_sleep = 1.0 / self.__speed_x
@@ -162,5 +113,7 @@ class SimulationEngine:
         """
         Clean up the pygame engine and quit.
         """
+        self.__orchestrator.close()
         pg.quit()
         self.__logger.info('Quitting the simulator engine.')
+        shutdown_logging()
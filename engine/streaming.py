@@ -0,0 +1,138 @@
+from collections import namedtuple
+from datetime import datetime
+from typing import Iterator
+
+from engine.simulation_builder import build_orchestrator
+from interaction.scene_orchestrator import SceneOrchestrator
+from interaction.utilities import PandemicStatus
+from loader.engine_loader import load_engine_from_yaml
+
+
+AgentState = namedtuple("AgentState", ["id", "grid_position", "activity", "place", "status"])
+
+
+class TickSnapshot:
+    """
+    Lightweight view over the simulation right after one tick.
+    Nothing is copied when the snapshot is created: agent states, the particle field and the statistics are read
+    from the live simulation on request, so a snapshot is only valid until the iterator is advanced.
+    """
+    __slots__ = ("_orchestrator", "_tick", "_time", "_week", "_day_of_week")
+
+    def __init__(self, orchestrator: SceneOrchestrator, tick: int, time: datetime, week: int, day_of_week: str):
+        self._orchestrator = orchestrator
+        self._tick = tick
+        self._time = time
+        self._week = week
+        self._day_of_week = day_of_week
+
+    @property
+    def tick(self) -> int:
+        """
+        Get the number of ticks simulated so far (1 for the first tick).
+        """
+        return self._tick
+
+    @property
+    def time(self) -> datetime:
+        """
+        Get the simulated time of the tick.
+        """
+        return self._time
+
+    @property
+    def week(self) -> int:
+        return self._week
+
+    @property
+    def day_of_week(self) -> str:
+        return self._day_of_week
+
+    def agent_states(self) -> list[AgentState]:
+        """
+        Get the state of every agent (students first, then the teacher).
+        :return: A list of AgentState tuples.
+        """
+        return [AgentState(agent.id, agent.grid_position, agent.activity, agent.place, agent.pandemic_status)
+                for agent in self._orchestrator.recorded_agents]
+
+    def status_counts(self) -> dict[int, int]:
+        """
+        Count the agents in each pandemic status.
+        :return: A dictionary PandemicStatus -> number of agents.
+        """
+        counts = {PandemicStatus.SUSCEPTIBLE: 0, PandemicStatus.INFECTED: 0,
+                  PandemicStatus.QUARANTINED: 0, PandemicStatus.RECOVERED: 0}
+        for agent in self._orchestrator.recorded_agents:
+            counts[agent.pandemic_status] += 1
+        return counts
+
+    def field(self) -> list[list[float]]:
+        """
+        Get a read-only view of the particle field. The grid is not copied.
+        :return: The 2D list [row][col] of particle loads.
+        """
+        return self._orchestrator.spread_simulator.grid
+
+    def field_stats(self) -> dict[str, float]:
+        """
+        Compute summary statistics of the particle field.
+        :return: A dictionary with the total, mean and max load.
+        """
+        spread_simulator = self._orchestrator.spread_simulator
+        total = 0.0
+        peak = 0.0
+        for row in spread_simulator.grid:
+            total += sum(row)
+            peak = max(peak, max(row))
+        return {
+            "total_load": total,
+            "mean_load": total / (spread_simulator.rows * spread_simulator.cols),
+            "max_load": peak,
+        }
+
+
+def iter_ticks(engine_file='config/engine.yaml',
+               stride=1,
+               width=1200,
+               height=720,
+               tile_size=60,
+               map_file='config/map.yaml',
+               agent_file='config/agents.yaml') -> Iterator[TickSnapshot]:
+    """
+    Run a headless simulation and lazily yield a snapshot every `stride` ticks.
+    When the orchestrator jumps over an idle stretch, a single snapshot is yielded for the whole stretch.
+    Breaking out of the loop (or closing the generator) stops the run and releases its resources.
+    :param engine_file: Path to the yaml configuration file, or an already loaded engine configuration.
+    :param stride: Number of ticks between two snapshots.
+    :param width: Width of the simulated area in pixels.
+    :param height: Height of the simulated area in pixels.
+    :param tile_size: Tile size of each tile.
+    :param map_file: Path to the yaml configuration file.
+    :param agent_file: Path to the yaml configuration file.
+    :return: An iterator of TickSnapshot objects.
+    """
+    if stride < 1:
+        raise ValueError("Stride must be a positive number of ticks.")
+
+    engine_config = load_engine_from_yaml(engine_file) if isinstance(engine_file, str) else engine_file
+    orchestrator = build_orchestrator(
+        engine_config,
+        width=width,
+        height=height,
+        tile_size=tile_size,
+        map_file=map_file,
+        agent_file=agent_file
+    )
+    timer = orchestrator.timer
+    try:
+        tick = 0
+        while not orchestrator.finished:
+            time, week, day_of_week = timer.current_time_of_day, timer.current_week, timer.day_of_week_str
+            previous = tick
+            # Several ticks at once when the orchestrator jumps over an idle stretch
+            tick += orchestrator.simulate_once()
+            if tick // stride > previous // stride:
+                yield TickSnapshot(orchestrator, tick, time, week, day_of_week)
+    finally:
+        orchestrator.close()
@@ -1,11 +1,16 @@
 from datetime import time, datetime
+from typing import TYPE_CHECKING
 
-import pygame as pg
-
-from engine.placeable import Placeable
+from interaction.agents.profile import AgentProfile
 from interaction.disease.spread_simulator import SpreadSimulator
-from interaction.traversealgorithms.random_block import random_subtile_in_rectangle
+from interaction.sampler import Sampler
+from interaction.timer import DayClock
+from interaction.traversealgorithms.random_block import random_subtile
 from interaction.utilities import *
+from loader.scene_loader import Scene
+
+if TYPE_CHECKING:
+    import pygame as pg
 
 
 def next_class_start(curr_time: time) -> time:
@@ -35,58 +40,48 @@ def find_placeable_by_type(placeables, _type):
     """
     Filter the placeables list to find the placeable by type. If there are multiple placeables of specified type,
     the first occurence is returned.
-    :param placeables: List of placeables.
+    :param placeables: Scene (indexed lookup) or list of placeables.
     :param _type: Type of the placeable represented as string
     :return: the placeable with the specified type.
     """
+    if isinstance(placeables, Scene):
+        return placeables.first(_type)
     for p in placeables:
         if p.name == _type:
             return p
     return None
 
 
-def decide_next_target(agent, placeables, map_density):
+def decide_next_target(agent, scene: Scene, map_density, sampler: Sampler):
     """
     Choose next target coordinates based on the current time and state of the agents.
     :param agent: A reference to the agents.
-    :param placeables: A list of placeables.
+    :param scene: The indexed scene.
     :param map_density: The density of the standard tile.
+    :param sampler: The sampler the random positions are drawn from.
     :return: A tuple that represents the next target coordinates.
     """
-    if agent.place in [Place.DESK, Place.TEACHER_DESK]:
-        chair = None
-        # Generate the position of the chair
-        if agent.place == Place.DESK:
-            chair = get_chair_for_agent(placeables, agent.chair_index)
-        elif agent.place == Place.TEACHER_DESK:
-            chair = find_placeable_by_type(placeables, "Armchair")
-        if chair:
-            sub_left = int(chair.x * map_density)
-            sub_top = int(chair.y * map_density)
-            return sub_left, sub_top
+    if agent.place in (Place.DESK, Place.TEACHER_DESK):
+        return agent.profile.chair_cell
 
     hotspot = None
     if agent.place == Place.ENTRANCE:
         # Generate a random position on the entrance
-        hotspot = find_placeable_by_type(placeables, "Entrance")
+        hotspot = scene.hotspot("Entrance")
     elif agent.place == Place.BACK:
         # Generate a random position on the BackHotspot
-        hotspot = find_placeable_by_type(placeables, "BackHotspot")
-    return random_subtile_in_rectangle(hotspot, map_density) if hotspot else None
+        hotspot = scene.hotspot("BackHotspot")
+    return random_subtile(hotspot, sampler) if hotspot else None
 
 
-def get_chair_for_agent(placeables, index):
+def get_chair_for_agent(scene: Scene, index):
     """
     Return the chair associated with the given index.
-    :param placeables: List of placeables.
+    :param scene: The indexed scene.
     :param index: Index of the chair.
     :return: Chair associated with the given index.
     """
-    # Filter the placeables and keep only the 'Chair' type
-    chairs = [p for p in placeables if p.name == "Chair"]
-    if index < len(chairs):
-        return chairs[index]
-    return None
+    return scene.chair(index)
 
 
 def draw_circle(screen, px, py, text, tile_size, map_density, pandemic_status: PandemicStatus):
@@ -101,6 +96,7 @@ def draw_circle(screen, px, py, text, tile_size, map_density, pandemic_status: P
     :param pandemic_status: The pandemic status of the agent.
     """
     if map_density:
+        import pygame as pg
         tx = int(px * map_density)
         ty = int(py * map_density)
 
@@ -143,6 +139,23 @@ class Agent:
         self._behaviour = behaviour
         self._mask = mask
         self._vaccine = vaccine
+        self._profile = None
+
+    @property
+    def profile(self) -> AgentProfile:
+        """
+        Get the constants compiled by compile_profile.
+        """
+        return self._profile
+
+    def compile_profile(self, agent_props: dict, scene: Scene):
+        """
+        Resolve the per-tick constants of the agent. Must be called before the first tick, and again if the mask,
+        vaccine, behaviour or schedule of the agent change.
+        :param agent_props: Dictionary of agent properties.
+        :param scene: The indexed scene.
+        """
+        pass
 
     @property
     def id(self):
@@ -192,19 +205,43 @@ class Agent:
     def vaccine(self, new_vaccine):
         self._vaccine = new_vaccine
 
-    def act(self, current_date: datetime.date, current_time: str, placeables: list[Placeable],
-            agent_props, spread_simulator: SpreadSimulator):
+    def attach_health(self, health):
+        """
+        Replace the PandemicStateManager of the agent, e.g. by its handle in a PopulationHealth, which then applies
+        the daily transitions for the whole population.
+        :param health: An object with the interface of PandemicStateManager.
+        """
+        pass
+
+    def remove_from_environment(self):
+        """
+        Take the agent out of the room (used when it is quarantined).
+        """
+        pass
+
+    def act(self, current_dt: datetime, tick: int, placeables: Scene, agent_props, spread_simulator: SpreadSimulator):
         """
         Called each simulation 'tick'. Manages daily logic, based on the agent's state.
-        :param current_date: The current date of the simulation.
-        :param current_time: The current time of the simulation.
-        :param placeables: List of placeables.
+        :param current_dt: The current date and time of the simulation, None when the health of the agents is kept by a
+        PopulationHealth (which reads the tick counter).
+        :param tick: The number of ticks since the start of the day.
+        :param placeables: The indexed scene.
         :param agent_props: Dictionary of agent properties.
         :param spread_simulator: Reference to SpreadSimulator object.
         """
         pass
 
-    def draw(self, screen: pg.Surface, screen_width: int, screen_height: int, tile_size: int):
+    def next_wake_tick(self, tick: int, clock: DayClock):
+        """
+        Called by the active-set scheduler after act. Only the movement logic has to be considered: infectious and
+        exposed agents are woken at every tick by the scheduler.
+        :param tick: The tick at which the agent acted.
+        :param clock: The clock of the day.
+        :return: The first tick after tick at which act may change the agent, None if not before the next day.
+        """
+        return tick + 1
+
+    def draw(self, screen: "pg.Surface", screen_width: int, screen_height: int, tile_size: int):
         """
         Draws the character on the screen.
         :param screen: Reference to the screen to draw on.
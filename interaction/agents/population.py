@@ -0,0 +1,368 @@
+import numpy as np
+
+from interaction.agents.agent import Agent, draw_circle
+from interaction.agents.teacher import Teacher
+from interaction.disease.population_health import PopulationHealth
+from interaction.disease.spread_simulator import SpreadSimulator
+from interaction.sampler import Sampler
+from interaction.utilities import Activity, Place, PandemicStatus
+from loader.scene_loader import Scene
+
+
+NO_PLACE = 0
+NO_TICK = -1
+
+
+class AgentView:
+    """
+    Read-only view of one agent of a Population, with the attributes of Student and Teacher that are used for
+    rendering, recording and streaming.
+    """
+    __slots__ = ("__population", "__index", "__agent")
+
+    def __init__(self, population: "Population", index: int, agent: Agent):
+        """
+        Constructor for AgentView class.
+        :param population: The population that holds the state of the agent.
+        :param index: Index of the agent in the arrays of the population.
+        :param agent: The agent the population was built from (for its static attributes).
+        """
+        self.__population = population
+        self.__index = index
+        self.__agent = agent
+
+    @property
+    def id(self):
+        return self.__agent.id
+
+    @property
+    def schedule(self):
+        return self.__agent.schedule
+
+    @property
+    def style(self):
+        return self.__agent.style
+
+    @property
+    def behaviour(self):
+        return self.__agent.behaviour
+
+    @property
+    def mask(self):
+        return self.__agent.mask
+
+    @property
+    def vaccine(self):
+        return self.__agent.vaccine
+
+    @property
+    def profile(self):
+        return self.__agent.profile
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def grid_position(self) -> tuple[int, int]:
+        return int(self.__population.gx[self.__index]), int(self.__population.gy[self.__index])
+
+    @property
+    def activity(self) -> int:
+        return int(self.__population.activity[self.__index])
+
+    @property
+    def place(self):
+        place = int(self.__population.place[self.__index])
+        return place if place != NO_PLACE else None
+
+    @property
+    def pandemic_status(self) -> int:
+        return int(self.__population.status[self.__index])
+
+    def draw(self, screen, screen_width, screen_height, tile_size):
+        gx, gy = self.grid_position
+        label = "T" if isinstance(self.__agent, Teacher) else f"{self.id}"
+        draw_circle(screen, gx, gy, label, tile_size, self.profile.map_density, self.pandemic_status)
+
+
+class Population:
+    """
+    Struct-of-arrays population engine: the state of every agent (position, activity, place, timers) and the
+    constants of their profiles are stored in parallel numpy arrays, and each tick updates all the agents at once.
+    The health of the agents is kept by a PopulationHealth, in the same order.
+    It reproduces the behaviour of Student.act and Teacher.act, with two differences:
+      - every agent reads the droplet load before any agent sheds during the tick,
+      - the random draws are vectorised.
+    Only the agents walking a path are handled one by one, since paths are objects.
+    """
+    def __init__(self, students: list, teacher, agent_props: dict, scene: Scene, health: PopulationHealth,
+                 sampler: Sampler):
+        """
+        Constructor for Population class. The profiles of the agents must be compiled.
+        :param students: List of Student objects.
+        :param teacher: Teacher object, or None.
+        :param agent_props: Dictionary of agent properties.
+        :param scene: The indexed scene.
+        :param health: Health manager of the students, then the teacher.
+        :param sampler: The sampler to draw from.
+        """
+        self.__health = health
+        self.__sampler = sampler
+        agents = list(students) + ([teacher] if teacher else [])
+        n = len(agents)
+        self.__agents = agents
+        self.__grid_density = agent_props.get("grid_density", 1)
+        self.__entrance = scene.hotspot("Entrance")
+        self.__back = scene.hotspot("BackHotspot")
+
+        # Profile constants
+        profiles = [agent.profile for agent in agents]
+        self.__teacher_mask = np.array([isinstance(agent, Teacher) for agent in agents], dtype=bool)
+        self.__mask_eff = np.array([p.mask_efficiency for p in profiles], dtype=float)
+        self.__vaccine_eff = np.array([p.vaccine_efficiency for p in profiles], dtype=float)
+        self.__break_prob = np.array([p.break_probability for p in profiles], dtype=float)
+        self.__shed_amount = np.array([p.shed_amount for p in profiles], dtype=float)
+        self.__infection_k = np.array([p.infection_k for p in profiles], dtype=float)
+        self.__arrival_tick = np.array([p.arrival_tick for p in profiles], dtype=np.int64)
+        self.__leaving_tick = np.array([p.leaving_tick for p in profiles], dtype=np.int64)
+        self.__chair_x = np.array([p.chair_cell[0] if p.chair_cell else -1 for p in profiles], dtype=np.int32)
+        self.__chair_y = np.array([p.chair_cell[1] if p.chair_cell else -1 for p in profiles], dtype=np.int32)
+
+        # Movement state
+        self.gx = np.full(n, -1, dtype=np.int32)
+        self.gy = np.full(n, -1, dtype=np.int32)
+        self.activity = np.full(n, Activity.OUTSIDE, dtype=np.int8)
+        self.place = np.full(n, NO_PLACE, dtype=np.int8)
+        self.__restart = np.ones(n, dtype=bool)
+        self.__break = ~self.__teacher_mask  # students start allowed to take a break, the teacher does not
+        self.__last_tick = np.full(n, NO_TICK, dtype=np.int64)
+        self.__desk_delay_end = np.full(n, NO_TICK, dtype=np.int64)
+        self.__has_target = np.zeros(n, dtype=bool)
+        self.__target_x = np.zeros(n, dtype=np.int32)
+        self.__target_y = np.zeros(n, dtype=np.int32)
+        self.__paths = [None] * n
+        self.__requests = [None] * n
+
+        self.__views = [AgentView(self, i, agent) for i, agent in enumerate(agents)]
+        self.__student_views = [view for view, teacher in zip(self.__views, self.__teacher_mask) if not teacher]
+
+    def __len__(self):
+        return len(self.__agents)
+
+    @property
+    def health(self) -> PopulationHealth:
+        return self.__health
+
+    @property
+    def status(self) -> np.ndarray:
+        return self.__health.status
+
+    @property
+    def views(self) -> list[AgentView]:
+        return self.__views
+
+    @property
+    def students(self) -> list[AgentView]:
+        return self.__student_views
+
+    @property
+    def teacher(self):
+        indices = np.flatnonzero(self.__teacher_mask)
+        return self.__views[indices[0]] if len(indices) else None
+
+    # ----------------------------------
+    # Health
+    # ----------------------------------
+
+    def morning_infection_check(self):
+        """
+        Recoveries and daily infection draws, applied by the health manager.
+        """
+        self.__health.morning_check()
+
+    def end_of_day_test(self):
+        """
+        Vectorised end of day test: symptomatic agents are quarantined and removed from the environment.
+        """
+        self.__health.end_of_day_test()
+        quarantined = self.status == PandemicStatus.QUARANTINED
+        self.activity[quarantined] = Activity.OUTSIDE
+        self.gx[quarantined] = -1
+        self.gy[quarantined] = -1
+
+    # ----------------------------------
+    # Act Logic
+    # ----------------------------------
+
+    def act(self, tick: int, agent_props: dict, spread_simulator: SpreadSimulator):
+        """
+        Advance every agent by one tick (vectorised Student.act and Teacher.act).
+        :param tick: The number of ticks since the start of the day.
+        :param agent_props: Dictionary of agent properties.
+        :param spread_simulator: Reference to SpreadSimulator object.
+        """
+        active = self.status != PandemicStatus.QUARANTINED
+        gd = self.__grid_density
+        # Only set while profiling
+        profiler = agent_props.get("profiler")
+        if profiler is not None:
+            phase = profiler.switch("act.infection")
+
+        if spread_simulator:
+            # Environment => mask => vaccine => infection chance
+            exposed = np.flatnonzero(active & (self.status == PandemicStatus.SUSCEPTIBLE) & (self.gx >= 0))
+            if len(exposed):
+                load = spread_simulator.block_loads(self.gy[exposed] * gd, self.gx[exposed] * gd, gd)
+                raw_prob = 1 - np.exp(-self.__infection_k[exposed] * load * (1 - self.__mask_eff[exposed]))
+                p_infection = raw_prob * (1 - self.__vaccine_eff[exposed])
+                self.__health.expose(exposed, p_infection)
+
+            # Shed
+            if profiler is not None:
+                profiler.switch("act.shedding")
+            infectious = active & self.__health.infectious()
+            if infectious.any():
+                spread_simulator.add_block_sources(self.gy[infectious] * gd, self.gx[infectious] * gd, gd,
+                                                   self.__shed_amount[infectious])
+
+        # Pre-symptomatic => symptomatic
+        if profiler is not None:
+            profiler.switch("act.infection")
+        self.__health.update_during_day()
+
+        if profiler is not None:
+            profiler.switch("act.movement")
+        self._move(active, tick, agent_props)
+        if profiler is not None:
+            profiler.switch(phase)
+
+    def _move(self, active: np.ndarray, tick: int, agent_props: dict):
+        clock = agent_props["clock"]
+        in_break = clock.is_break(tick)
+        teacher = self.__teacher_mask
+        student = ~teacher
+        self.__restart |= active & ((self.__last_tick == NO_TICK) | (tick < self.__last_tick))
+        if not in_break:
+            self.__break |= active & student
+
+        # The branches are chosen from the activity at the start of the tick
+        outside = active & (self.activity == Activity.OUTSIDE)
+        moving = active & (self.activity == Activity.MOVING)
+        idle = active & (self.activity == Activity.IDLE)
+
+        # 1) Spawn on a random tile of the entrance
+        spawn = outside & (tick >= self.__arrival_tick) & \
+            (self.__restart | (teacher & self.__break & (not in_break)))
+        if self.__entrance is not None and spawn.any():
+            self.__restart[spawn] = False
+            self.__break[spawn & teacher] = False
+            self.gx[spawn], self.gy[spawn] = self._random_cells(self.__entrance, int(spawn.sum()))
+            self._set_moving(spawn, Place.BACK)
+
+        # 2) Follow or compute the paths
+        self._walk(moving, agent_props)
+
+        # 3) Idle agents: leave, go back to the desk, or take a break
+        at_entrance = idle & (self.place == Place.ENTRANCE)
+        self.activity[at_entrance] = Activity.OUTSIDE
+        self.gx[at_entrance] = -1
+        self.gy[at_entrance] = -1
+
+        inside = idle & ~at_entrance
+        leaving = inside & (tick >= self.__leaving_tick)
+        self._set_moving(leaving, Place.ENTRANCE)
+        staying = inside & ~leaving
+
+        students = staying & student
+        if in_break:
+            breaking = students & (self.place != Place.BACK) & self.__break
+            self.__break[breaking] = False
+            takes_break = breaking & (self.__sampler.random(len(self)) < self.__break_prob)
+            if takes_break.any():
+                # Short desk delay, up to 5 minutes
+                wait_minutes = np.minimum(self.__sampler.gamma(2.0, 1.0, size=int(takes_break.sum())), 5)
+                self.__desk_delay_end[takes_break] = tick + np.ceil(wait_minutes * 60 / clock.time_step_seconds)
+        delay_over = students & (self.__desk_delay_end != NO_TICK) & (tick >= self.__desk_delay_end)
+        self.__desk_delay_end[delay_over] = NO_TICK
+        self._set_moving(delay_over, Place.BACK)
+        if not in_break:
+            self._set_moving(students & (self.place != Place.DESK), Place.DESK)
+
+        teachers = staying & teacher
+        if not in_break:
+            self._set_moving(teachers & (self.place != Place.TEACHER_DESK), Place.TEACHER_DESK)
+        else:
+            takes_break = teachers & (self.place == Place.TEACHER_DESK) & \
+                (self.__sampler.random(len(self)) < self.__break_prob)
+            self._set_moving(takes_break, Place.ENTRANCE)
+            self.__break[takes_break] = True
+
+        self.__last_tick[active] = tick
+
+    def _walk(self, moving: np.ndarray, agent_props: dict):
+        # Pick the targets of the agents that have none (vectorised decide_next_target)
+        needs_target = moving & ~self.__has_target
+        for place, rect in ((Place.ENTRANCE, self.__entrance), (Place.BACK, self.__back)):
+            mask = needs_target & (self.place == place)
+            if rect is not None and mask.any():
+                self.__target_x[mask], self.__target_y[mask] = self._random_cells(rect, int(mask.sum()))
+                self.__has_target[mask] = True
+        seated = needs_target & ((self.place == Place.DESK) | (self.place == Place.TEACHER_DESK)) & \
+            (self.__chair_x >= 0)
+        self.__target_x[seated] = self.__chair_x[seated]
+        self.__target_y[seated] = self.__chair_y[seated]
+        self.__has_target[seated] = True
+
+        path_queue = agent_props["path_queue"]
+        paths, requests = self.__paths, self.__requests
+        for i in np.flatnonzero(moving):
+            path = paths[i]
+            if not path:
+                if not self.__has_target[i]:
+                    continue
+                queued = requests[i] is not None
+                if not queued:
+                    start_cell = (int(self.gy[i]), int(self.gx[i]))
+                    requests[i] = path_queue.request(start_cell, (int(self.__target_y[i]), int(self.__target_x[i])))
+                if not requests[i].done:
+                    continue  # wait in place until the path is ready
+                path = requests[i].path
+                requests[i] = None
+                if not path:
+                    # If the point cannot be reached, become IDLE
+                    self.activity[i] = Activity.IDLE
+                    continue
+                paths[i] = path
+                if not queued:
+                    continue  # found during this act, followed from the next tick
+                # Searched by the queue after the previous act, as if it had been found then
+            nr, nc = path.next_cell()
+            self.gx[i], self.gy[i] = nc, nr
+            if not path:
+                # If the destination has been reached, the agent becomes IDLE
+                self.activity[i] = Activity.IDLE
+
+    def _set_moving(self, mask: np.ndarray, place: int):
+        """
+        Vectorised agent_properties = (Activity.MOVING, place): the agents drop their path and target.
+        """
+        indices = np.flatnonzero(mask)
+        if not len(indices):
+            return
+        self.activity[indices] = Activity.MOVING
+        self.place[indices] = place
+        self.__has_target[indices] = False
+        for i in indices:
+            self.__paths[i] = None
+            if self.__requests[i] is not None:
+                self.__requests[i].cancel()
+                self.__requests[i] = None
+
+    def _random_cells(self, rect: tuple[int, int, int, int], count: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorised random_subtile.
+        """
+        left, top, width, height = rect
+        return (self.__sampler.integers(left, left + width, size=count),
+                self.__sampler.integers(top, top + height, size=count))
@@ -0,0 +1,64 @@
+from interaction.utilities import behaviour_probabilities, mask_protection_probabilities, \
+    vaccine_protection_probabilities
+
+
+class AgentProfile:
+    """
+    Constants an agent needs at every tick, resolved once when the simulation is built:
+    the efficiencies looked up from the mask and vaccine names, the schedule as tick indices (ticks since the start
+    of the day) and the values taken from the engine configuration.
+    """
+    __slots__ = ("mask_efficiency", "vaccine_efficiency", "break_probability", "shed_amount", "infection_k",
+                 "arrival_tick", "leaving_tick", "chair_cell", "grid_density", "map_density")
+
+    def __init__(self, mask_efficiency: float, vaccine_efficiency: float, break_probability: float,
+                 shed_amount: float, infection_k: float, arrival_tick: int, leaving_tick: int, chair_cell,
+                 grid_density: int, map_density: int):
+        """
+        Constructor for AgentProfile class.
+        :param mask_efficiency: Fraction of the droplets stopped by the mask.
+        :param vaccine_efficiency: Fraction of the infection probability removed by the vaccine.
+        :param break_probability: Probability to take a break, from the behaviour of the agent.
+        :param shed_amount: Load shed per tick and sub-cell when infectious (mask included).
+        :param infection_k: Scale factor between the inhaled load and the infection probability.
+        :param arrival_tick: First tick of the day at which the agent arrives.
+        :param leaving_tick: First tick of the day at which the agent leaves.
+        :param chair_cell: Sub-tile (col, row) of the seat of the agent, None if it has none.
+        :param grid_density: Density of the spread grid.
+        :param map_density: Density of the standard tile.
+        """
+        self.mask_efficiency = mask_efficiency
+        self.vaccine_efficiency = vaccine_efficiency
+        self.break_probability = break_probability
+        self.shed_amount = shed_amount
+        self.infection_k = infection_k
+        self.arrival_tick = arrival_tick
+        self.leaving_tick = leaving_tick
+        self.chair_cell = chair_cell
+        self.grid_density = grid_density
+        self.map_density = map_density
+
+    @classmethod
+    def compile(cls, agent, agent_props: dict, chair_cell, infection_k: float) -> "AgentProfile":
+        """
+        Build the profile of an agent.
+        :param agent: The agent (its mask, vaccine, behaviour and schedule are read).
+        :param agent_props: Dictionary of agent properties (with the DayClock under "clock").
+        :param chair_cell: Sub-tile (col, row) of the seat of the agent, None if it has none.
+        :param infection_k: Default scale factor, overridden by agent_props["infection_k"].
+        :return: The profile.
+        """
+        clock = agent_props["clock"]
+        mask_efficiency = mask_protection_probabilities.get(agent.mask, 0.0)
+        return cls(
+            mask_efficiency=mask_efficiency,
+            vaccine_efficiency=vaccine_protection_probabilities.get(agent.vaccine, 0.0),
+            break_probability=behaviour_probabilities[agent.behaviour],
+            shed_amount=agent_props["base_shedding"] * (1 - mask_efficiency),
+            infection_k=agent_props.get("infection_k", infection_k),
+            arrival_tick=clock.tick_of(agent.schedule["arriving"]),
+            leaving_tick=clock.tick_of(agent.schedule["leaving"]),
+            chair_cell=chair_cell,
+            grid_density=agent_props.get("grid_density", 1),
+            map_density=agent_props["map_density"],
+        )
@@ -1,15 +1,14 @@
 import math
-import random
 from datetime import datetime
 
-from interaction.agents.agent import Agent, find_placeable_by_type, decide_next_target, draw_circle, in_bounds, \
-    heuristic
+from interaction.agents.agent import Agent, decide_next_target, draw_circle
+from interaction.agents.profile import AgentProfile
 from interaction.disease.spread_simulator import SpreadSimulator
 from interaction.disease.health_manager import PandemicStateManager
-from interaction.traversealgorithms.pathfinder import PathFinder
-from interaction.traversealgorithms.random_block import random_subtile_in_rectangle
-from interaction.utilities import Activity, Place, behaviour_probabilities, mask_protection_probabilities, \
-    vaccine_protection_probabilities
+from interaction.timer import DayClock
+from interaction.traversealgorithms.random_block import random_subtile
+from interaction.utilities import Activity, Place, infection_scale_factors
+from loader.scene_loader import Scene
 
 
 class Teacher(Agent):
@@ -24,7 +23,6 @@ class Teacher(Agent):
         :param vaccine: The vaccine.
         """
         super().__init__(id, schedule, style, behaviour, mask, vaccine)
-        self.__map_density = None  # Be careful to initiate this parameter :)
 
         # Current pandemic status of the agents [susceptible, infected, quarantined, recovered]
         self.__health_manager = PandemicStateManager(agent_id=id)
@@ -33,13 +31,14 @@ class Teacher(Agent):
         self.__activity = Activity.OUTSIDE
         self.__place = None
         self.__state = {
-            "last_time": None,
+            "last_tick": None,
             "restart": True,
             "break": False,
         }
 
-        # A* path
-        self.__path = []
+        # A* path, consumed through a cursor
+        self.__path = None
+        self.__path_request = None  # pending PathRequest while the path is being searched
         self.__target = None  # (col, row) in sub-tile
 
         # agent's position in sub-tile coordinates (grid-based)
@@ -81,9 +80,23 @@ class Teacher(Agent):
         activity, place = value
         self.activity = activity
         self.place = place
-        self.__path = []
+        self.__path = None
+        if self.__path_request is not None:
+            self.__path_request.cancel()
+            self.__path_request = None
         self.__target = None
 
+    @property
+    def pandemic_status(self):
+        return self.__health_manager.status
+
+    def compile_profile(self, agent_props: dict, scene: Scene):
+        armchair = scene.first("Armchair")
+        map_density = agent_props["map_density"]
+        chair_cell = (int(armchair.x * map_density), int(armchair.y * map_density)) if armchair else None
+        self._profile = AgentProfile.compile(self, agent_props, chair_cell=chair_cell,
+                                             infection_k=infection_scale_factors["teacher"])
+
     # ----------------------------------
     # Health Manager Hooks
     # ----------------------------------
@@ -103,7 +116,7 @@ class Teacher(Agent):
 
         infection_prob = agent_props.get("infection_prob", 0.0)
         if self.__health_manager.is_susceptible():
-            if random.random() < infection_prob:
+            if agent_props["sampler"].random() < infection_prob:
                 self.__health_manager.become_infected(current_dt)
 
     def update_during_day(self, current_dt: datetime):
@@ -119,77 +132,87 @@ class Teacher(Agent):
         self.__health_manager.end_of_day_test(current_dt)
         if self.__health_manager.is_quarantined():
             # We consider agent removed from environment
-            self.__activity = Activity.OUTSIDE
-            self.__gx = -1
-            self.__gy = -1
+            self.remove_from_environment()
+
+    def remove_from_environment(self):
+        self.__activity = Activity.OUTSIDE
+        self.__gx = -1
+        self.__gy = -1
+
+    def attach_health(self, health):
+        self.__health_manager = health
 
     def _check_infection_from_environment(
             self,
             current_dt: datetime,
-            spread_simulator: SpreadSimulator,
-            agent_props: dict
+            spread_simulator: SpreadSimulator
     ):
         """
         If the agent is susceptible, we check the local droplet load,
         apply mask & vaccine, and see if infection occurs.
         """
-        mask_eff = mask_protection_probabilities.get(self.mask, 0.0)
-        vaccine_eff = vaccine_protection_probabilities.get(self.vaccine, 0.0)
+        profile = self.profile
 
         # 1) Gather total droplet load from sub-cells
-        start_x = self.__gx * agent_props.get("grid_density", 1)
-        start_y = self.__gy * agent_props.get("grid_density", 1)
+        grid_density = profile.grid_density
+        start_x = self.__gx * grid_density
+        start_y = self.__gy * grid_density
 
         total_load = 0.0
         count = 0
-        for rx in range(start_x, start_x + agent_props.get("grid_density", 1)):
-            for ry in range(start_y, start_y + agent_props.get("grid_density", 1)):
+        for rx in range(start_x, start_x + grid_density):
+            for ry in range(start_y, start_y + grid_density):
                 abs_load = spread_simulator.get_rate(ry, rx)  # Possibly you define this
                 total_load += abs_load
                 count += 1
         avg_load = total_load / count if count > 0 else 0.0
 
         # 2) Apply mask => a fraction passes
-        load_after_mask = avg_load * (1 - mask_eff)
+        load_after_mask = avg_load * (1 - profile.mask_efficiency)
 
         # 3) Convert load => infection probability
         #    Option: exponential approach => p = 1 - exp(-k * load_after_mask)
-        k = agent_props.get("infection_k", 0.00014)  # TODO: a scale factor for environment-based infection
-        raw_prob = 1 - math.exp(-k * load_after_mask)
+        raw_prob = 1 - math.exp(-profile.infection_k * load_after_mask)
 
         # 4) Vaccine further reduces infection chance
         #    E.g. final p = raw_prob * (1 - vaccine_eff)
-        p_infection = raw_prob * (1 - vaccine_eff)
+        p_infection = raw_prob * (1 - profile.vaccine_efficiency)
 
-        # Random draw => infect
-        if random.random() < p_infection:
-            self.__health_manager.become_infected(current_dt)
+        # Random draw (or dose accumulation) => infect
+        self.__health_manager.expose(p_infection, current_dt)
 
     # ----------------------------------
     # Act Logic
     # ----------------------------------
 
-    def _simulate_movement_and_breaks(self, current_time, placeables, agent_props):
-        # parse times
-        fmt = "%H:%M:%S"
-        arriving_time = datetime.strptime(self.schedule["arriving"], fmt).time()
-        leaving_time = datetime.strptime(self.schedule["leaving"], fmt).time()
-        current_time = datetime.strptime(current_time, fmt).time()
+    def _follow_path(self):
+        """
+        Move to the next point of the path.
+        """
+        nr, nc = self.__path.next_cell()
+        self.grid_position = (nc, nr)
+        if not self.__path:
+            # If the destination has been reached, the agents become IDLE
+            self.activity = Activity.IDLE
+
+    def _simulate_movement_and_breaks(self, tick: int, placeables, agent_props):
+        profile = self.profile
+        in_break = agent_props["clock"].is_break(tick)
 
         # Reset restart parameter
-        if self.__state["last_time"] is None or current_time < self.__state["last_time"]:
+        if self.__state["last_tick"] is None or tick < self.__state["last_tick"]:
             self.__state["restart"] = True
 
         # 1) Check if the agents is outside the environment and the time to arrive => Spawn on a random tile on the entrance
         if self.activity == Activity.OUTSIDE:
-            if current_time >= arriving_time and (
-                    self.__state["restart"] or current_time.minute < 50 and self.__state["break"]):
-                entrance = find_placeable_by_type(placeables, "Entrance")
+            if tick >= profile.arrival_tick and (
+                    self.__state["restart"] or not in_break and self.__state["break"]):
+                entrance = placeables.hotspot("Entrance")
                 if entrance is not None:
                     # print(f"[INFO] Agent teacher spawned on the entrance")
                     self.__state["restart"] = False
                     self.__state["break"] = False
-                    self.grid_position = random_subtile_in_rectangle(entrance, map_density=agent_props["map_density"])
+                    self.grid_position = random_subtile(entrance, agent_props["sampler"])
 
                     # Prepare self properties
                     self.agent_properties = (Activity.MOVING, Place.BACK)
@@ -199,27 +222,31 @@ class Teacher(Agent):
             # If there is no path, compute one
             if not self.__path:
                 if self.__target is None:
-                    self.__target = decide_next_target(self, placeables, map_density=agent_props["map_density"])
+                    self.__target = decide_next_target(self, placeables, map_density=profile.map_density,
+                                                       sampler=agent_props["sampler"])
                 # use A* to compute the path
                 if self.__target is not None:
                     start_cell = (self.__gy, self.__gx)
                     goal_cell = (self.__target[1], self.__target[0])
-                    path = PathFinder.astar_pathfinding(agent_props["collision_grid"], start_cell, goal_cell,
-                                                        in_bounds, heuristic)
+                    queued = self.__path_request is not None
+                    if not queued:
+                        self.__path_request = agent_props["path_queue"].request(start_cell, goal_cell)
+                    if not self.__path_request.done:
+                        return  # wait in place until the path is ready
+                    path = self.__path_request.path
+                    self.__path_request = None
                     if not path:
                         # If the point cannot be reached, become IDLE
                         self.activity = Activity.IDLE
                         return
-                    # store path except the first coordinates (the starting point)
-                    self.__path = path[1:]
+                    # the path cursor already skips the first coordinates (the starting point)
+                    self.__path = path
+                    if queued:
+                        # Searched by the queue after the previous act, as if it had been found then
+                        self._follow_path()
             # If there is a path, move to the next point
             else:
-                next_cell = self.__path.pop(0)
-                nr, nc = next_cell
-                self.grid_position = (nc, nr)
-                if not self.__path:
-                    # If the destination has been reached, the agents become IDLE
-                    self.activity = Activity.IDLE
+                self._follow_path()
 
         # 3) If agents is in the idle state, check for break or leaving
         elif self.activity == Activity.IDLE:
@@ -230,50 +257,86 @@ class Teacher(Agent):
                 self.grid_position = (-1, -1)
             else:
                 # If agent's day is over
-                if current_time >= leaving_time:
+                if tick >= profile.leaving_tick:
                     # Prepare self properties
                     self.agent_properties = (Activity.MOVING, Place.ENTRANCE)
                 # If the class is started and the agents is not at his desk
-                elif current_time.minute < 50 and self.place != Place.TEACHER_DESK:
+                elif not in_break and self.place != Place.TEACHER_DESK:
                     self.agent_properties = (Activity.MOVING, Place.TEACHER_DESK)
                 # If it's time for a break depending on the teacher's style
-                elif current_time.minute >= 50 and self.place == Place.TEACHER_DESK:
-                    if random.random() < behaviour_probabilities[self.behaviour]:
+                elif in_break and self.place == Place.TEACHER_DESK:
+                    if agent_props["sampler"].random() < profile.break_probability:
                         self.agent_properties = (Activity.MOVING, Place.ENTRANCE)
                         self.__state["break"] = True
 
-        self.__state["last_time"] = current_time
-        # print(f"[INFO] Agent {self.id} is now at {self.__gx}, {self.__gy} and status is {self.activity} at {current_time}")
+        self.__state["last_tick"] = tick
+        # print(f"[INFO] Agent {self.id} is now at {self.__gx}, {self.__gy} and status is {self.activity} at tick {tick}")
 
-    def act(self, current_date: datetime.date, current_time, placeables, agent_props, spread_simulator: SpreadSimulator):
-        self.__map_density = agent_props["map_density"]
-        current_dt = datetime.combine(current_date, datetime.strptime(current_time, "%H:%M:%S").time())
+    def act(self, current_dt: datetime, tick: int, placeables, agent_props, spread_simulator: SpreadSimulator):
 
         # If quarantined => skip environment
         if self.__health_manager.is_quarantined():
             return
+        # Only set while profiling
+        profiler = agent_props.get("profiler")
+        if profiler is not None:
+            phase = profiler.switch("act.infection")
 
         # If susceptible => sample environment => mask => vaccine => infection chance
         if self.__health_manager.is_susceptible() and spread_simulator:
-            self._check_infection_from_environment(current_dt, spread_simulator, agent_props)
+            self._check_infection_from_environment(current_dt, spread_simulator)
 
         # If pre-symptomatic => shed virus
+        if profiler is not None:
+            profiler.switch("act.shedding")
         if spread_simulator and self.__health_manager.is_infectious():
-            # Shed with some mask effect
-            mask_eff = mask_protection_probabilities.get(self.mask, 0.0)
-            shed_amount = agent_props["base_shedding"] * (1 - mask_eff)
-            (gx, gy) = (self.__gx * agent_props["grid_density"], self.__gy * agent_props["grid_density"])
+            # Shed with some mask effect (precompiled in the profile)
+            profile = self.profile
+            grid_density = profile.grid_density
+            (gx, gy) = (self.__gx * grid_density, self.__gy * grid_density)
             # If you do sub-tiles, loop them
-            for rx in range(gx, gx + agent_props["grid_density"]):
-                for ry in range(gy, gy + agent_props["grid_density"]):
-                    spread_simulator.add_source(ry, rx, shed_amount)
+            for rx in range(gx, gx + grid_density):
+                for ry in range(gy, gy + grid_density):
+                    spread_simulator.add_source(ry, rx, profile.shed_amount)
 
         # Update any transitions from pre to symptomatic
+        if profiler is not None:
+            profiler.switch("act.infection")
         self.update_during_day(current_dt)
 
         # Simulate the movement of the agent
-        self._simulate_movement_and_breaks(current_time, placeables, agent_props)
+        if profiler is not None:
+            profiler.switch("act.movement")
+        self._simulate_movement_and_breaks(tick, placeables, agent_props)
+        if profiler is not None:
+            profiler.switch(phase)
 
 
+    def next_wake_tick(self, tick: int, clock: DayClock):
+        if self.__health_manager.is_quarantined():
+            return None
+        profile = self.profile
+        if self.activity == Activity.OUTSIDE:
+            wake_tick = max(profile.arrival_tick, tick + 1)
+            if self.__state["restart"]:
+                return wake_tick
+            if self.__state["break"]:
+                # Back from the break at the next lesson start
+                return wake_tick if not clock.is_break(wake_tick) else clock.next_tick_at_minute(wake_tick, 0)
+            return None
+        if self.activity == Activity.MOVING or self.place == Place.ENTRANCE:
+            return tick + 1
+
+        # Idle in the room: a break may start at any tick of the last ten minutes spent at the desk
+        if not clock.is_break(tick + 1):
+            if self.place != Place.TEACHER_DESK:
+                return tick + 1
+            wake_tick = clock.next_tick_at_minute(tick, DayClock.BREAK_MINUTE)
+        else:
+            if self.place == Place.TEACHER_DESK:
+                return tick + 1
+            wake_tick = clock.next_tick_at_minute(tick, 0)
+        return min(wake_tick, max(profile.leaving_tick, tick + 1))
+
     def draw(self, screen, screen_width, screen_height, tile_size):
-        draw_circle(screen, self.__gx, self.__gy, "T", tile_size, self.__map_density, self.__health_manager.status)
+        draw_circle(screen, self.__gx, self.__gy, "T", tile_size, self.profile.map_density, self.__health_manager.status)
@@ -1,20 +1,20 @@
-import logging
-import random
-
 from datetime import datetime, timedelta
+from interaction.recording.event_log import EventCode, EventSink, TextEventFormatter
+from interaction.sampler import Sampler
 from interaction.utilities import PandemicStatus
 
 
-def gamma_random(mean_days, shape=2.0):
+def gamma_random(mean_days, sampler: Sampler, shape=2.0):
     """
     Return a random sample (in days) from Gamma distribution with given mean.
     mean = shape * scale => scale = mean_days / shape
     :param mean_days: The average number of days to sample.
+    :param sampler: The sampler to draw from.
     :param shape: The shape of the distribution.
     :return: A random sample from the Gamma distribution with given mean and shape.
     """
     scale = mean_days / shape
-    return random.gammavariate(shape, scale)
+    return sampler.gamma(shape, scale)
 
 class PandemicStateManager:
     """
@@ -23,15 +23,15 @@ class PandemicStateManager:
       - We do NOT immediately quarantine upon becoming symptomatic.
       - Quarantine is forced at the END OF THE DAY if agent is symptomatic.
     """
-    def __init__(self, agent_id):
+    def __init__(self, agent_id, sampler: Sampler = None, events: EventSink = None):
         """
         :param agent_id: The agent ID.
+        :param sampler: The sampler of the infection draws and of the phase durations, a private unseeded one if None.
+        :param events: The sink of the health events, a text formatter if None.
         """
-        # Set logger properties
-        self.__logger = logging.getLogger(self.__class__.__name__)
-        logging.basicConfig(level=logging.INFO)
-
         self.__agent_id = agent_id
+        self.__sampler = sampler or Sampler()
+        self.__events = TextEventFormatter() if events is None else events
         self.__status = PandemicStatus.SUSCEPTIBLE
 
         # Timers
@@ -79,16 +79,26 @@ class PandemicStateManager:
         self.__infection_start = current_dt
 
         # Pre-symptomatic sub-duration
-        pre_symp_dur = gamma_random(self.pre_symp_mean, shape=2.0)
+        pre_symp_dur = gamma_random(self.pre_symp_mean, self.__sampler, shape=2.0)
         self.__pre_symp_end = current_dt + timedelta(days=pre_symp_dur)
 
         # Symptomatic sub-duration (though we might quarantine at end of day)
-        post_symp_dur = gamma_random(self.post_symp_mean, shape=2.0)
+        post_symp_dur = gamma_random(self.post_symp_mean, self.__sampler, shape=2.0)
         self.__symp_end = self.__pre_symp_end + timedelta(days=post_symp_dur)
 
         self.__is_pre_symptomatic = True
         self.__is_symptomatic = False
-        self.__logger.info(f"[PSM] Agent {self.agent_id} became infected at {current_dt}. pre_symp_end={self.__pre_symp_end}")
+        self.__events.emit(EventCode.INFECTED, self.agent_id, current_dt, until=self.__pre_symp_end)
+
+    def expose(self, p_infection: float, current_dt: datetime):
+        """
+        Called at each tick the agent spends in a contaminated room: infection with the given probability.
+        :param p_infection: The probability of infection during the tick.
+        :param current_dt: The current datetime object.
+        """
+        # Nothing is drawn without particles, so that the agents the scheduler leaves asleep draw the same numbers
+        if p_infection > 0 and self.__sampler.random() < p_infection:
+            self.become_infected(current_dt)
 
     def update_status_during_day(self, current_dt: datetime):
         """
@@ -116,11 +126,13 @@ class PandemicStateManager:
          - If already quarantined => no change unless we want partial-day logic
          :param current_dt: The current datetime object.
         """
+        # The agents that spent the end of the day outside may not have checked their symptoms since
+        self.update_status_during_day(current_dt)
         if self.status == PandemicStatus.INFECTED and self.__is_symptomatic:
             # Agent discovered at day end => quarantine
             self.status = PandemicStatus.QUARANTINED
             self.__quarantine_end = current_dt + timedelta(days=self.quarantine_days)
-            self.__logger.info(f"[PSM] Agent {self.agent_id} quarantined at end_of_day. Until {self.__quarantine_end}")
+            self.__events.emit(EventCode.QUARANTINED, self.agent_id, current_dt, until=self.__quarantine_end)
 
     def update_quarantine(self, current_dt: datetime):
         """
@@ -132,7 +144,7 @@ class PandemicStateManager:
                 self.status = PandemicStatus.RECOVERED
                 self.__is_symptomatic = False
                 self.__is_pre_symptomatic = False
-                self.__logger.info(f"[PSM] Agent {self.agent_id} recovered after quarantine.")
+                self.__events.emit(EventCode.RECOVERED, self.agent_id, current_dt)
 
     def is_infectious(self):
         """
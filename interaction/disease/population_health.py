@@ -0,0 +1,268 @@
+import math
+from datetime import timedelta
+
+import numpy as np
+
+from interaction.recording.event_log import EventCode, EventSink, TextEventFormatter
+from interaction.sampler import Sampler
+from interaction.timer import Timer
+from interaction.utilities import PandemicStatus
+
+
+NO_DEADLINE = np.iinfo(np.int64).max
+
+# Disease timeline (days), same values as PandemicStateManager
+PRE_SYMP_MEAN_DAYS = 2.3
+POST_SYMP_MEAN_DAYS = 3.2
+QUARANTINE_DAYS = 14
+GAMMA_SHAPE = 2.0
+
+INFECTION_MODELS = ("per_tick", "dose")
+
+
+class PopulationHealth:
+    """
+    Population-level PandemicStateManager: the status of every agent and the deadlines of its phases are stored in
+    arrays, the deadlines as calendar ticks of the timer (see Timer.absolute_tick), and the daily transitions are
+    applied to all the agents at once. The infection draws and the durations are taken from the sampler in the order of
+    the PandemicStateManagers of the agents, so a seeded run goes through the same transitions and reports the same
+    events with either.
+
+    Infection from the environment follows one of two equivalent models:
+      - per_tick: one Bernoulli draw per exposed agent and tick,
+      - dose: every agent draws an Exp(1) infection threshold once per susceptible episode and integrates the hazard
+        of each tick, -log(1 - p), into a running dose (k * mask-adjusted load without vaccine). It is infected when the
+        dose crosses the threshold, which happens with the same probability as with the per-tick draws.
+    """
+    def __init__(self, agent_ids: list, timer: Timer, sampler: Sampler, infection_prob: float = 0.0,
+                 infection_model: str = "per_tick", events: EventSink = None):
+        """
+        Constructor for PopulationHealth class.
+        :param agent_ids: The ids of the agents, in the order of the arrays (students, then the teacher).
+        :param timer: The timer of the simulation, read for the current tick and the datetimes of the logs.
+        :param sampler: The sampler to draw from.
+        :param infection_prob: Daily chance of a susceptible agent to get infected outside the room.
+        :param infection_model: per_tick or dose.
+        :param events: The sink of the health events, a text formatter if None.
+        """
+        if infection_model not in INFECTION_MODELS:
+            raise ValueError(f"Unknown infection model: {infection_model}.")
+        self.__events = TextEventFormatter() if events is None else events
+        self.__sampler = sampler
+        self.__agent_ids = list(agent_ids)
+        self.__timer = timer
+        self.__infection_prob = infection_prob
+        self.__infection_model = infection_model
+        self.__ticks_per_day = 86400 / timer.clock.time_step_seconds
+
+        n = len(self.__agent_ids)
+        self.status = np.full(n, PandemicStatus.SUSCEPTIBLE, dtype=np.int8)
+        self.__pre_symptomatic = np.zeros(n, dtype=bool)
+        self.__symptomatic = np.zeros(n, dtype=bool)
+        self.__infection_start = np.full(n, NO_DEADLINE, dtype=np.int64)
+        self.__pre_symp_end = np.full(n, NO_DEADLINE, dtype=np.int64)
+        self.__symp_end = np.full(n, NO_DEADLINE, dtype=np.int64)  # unused, since we quarantine at day's end
+        self.__quarantine_end = np.full(n, NO_DEADLINE, dtype=np.int64)
+
+        # Cumulative dose model, the agents never become susceptible again, so one threshold each is enough
+        self.__dose = np.zeros(n)
+        self.__threshold = self.__sampler.exponential(size=n) if infection_model == "dose" else None
+
+    def __len__(self):
+        return len(self.__agent_ids)
+
+    def handle(self, index: int) -> "AgentHealth":
+        """
+        Get the PandemicStateManager-like handle of one agent.
+        :param index: Index of the agent in the arrays.
+        """
+        return AgentHealth(self, index)
+
+    def infectious(self) -> np.ndarray:
+        """
+        Mask of the infected agents in the pre-symptomatic or symptomatic stage.
+        """
+        return (self.status == PandemicStatus.INFECTED) & (self.__pre_symptomatic | self.__symptomatic)
+
+    def is_infectious(self, index: int) -> bool:
+        return self.status[index] == PandemicStatus.INFECTED and \
+            bool(self.__pre_symptomatic[index] or self.__symptomatic[index])
+
+    def morning_check(self):
+        """
+        Vectorised PandemicStateManager.update_quarantine, then the daily infection draw of the susceptible agents.
+        Called once at the start of each day.
+        """
+        now = self.__timer.absolute_tick
+        recovered = (self.status == PandemicStatus.QUARANTINED) & (now >= self.__quarantine_end)
+        self.status[recovered] = PandemicStatus.RECOVERED
+        self.__pre_symptomatic[recovered] = False
+        self.__symptomatic[recovered] = False
+        if recovered.any():
+            current_dt = self.__timer.current_time_of_day
+            for i in np.flatnonzero(recovered):
+                self.__events.emit(EventCode.RECOVERED, self.__agent_ids[i], current_dt)
+
+        # One draw per susceptible agent in the order of the agents, the stream of PandemicStateManager
+        susceptible = np.flatnonzero(self.status == PandemicStatus.SUSCEPTIBLE)
+        self.infect(susceptible[self.__sampler.random(len(susceptible)) < self.__infection_prob])
+
+    def infect(self, mask: np.ndarray):
+        """
+        Vectorised PandemicStateManager.become_infected: the susceptible agents selected by mask become infected and
+        their pre-symptomatic and symptomatic durations are sampled.
+        :param mask: Boolean mask, or array of indices, of the agents.
+        """
+        indices = np.asarray(mask)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = indices[self.status[indices] == PandemicStatus.SUSCEPTIBLE]
+        if not len(indices):
+            return
+        now = self.__timer.absolute_tick
+        # Both durations of an agent are drawn in turn, the stream of PandemicStateManager
+        durations = self.__sampler.gamma(GAMMA_SHAPE, size=2 * len(indices))
+        pre_symp_days = durations[0::2] * (PRE_SYMP_MEAN_DAYS / GAMMA_SHAPE)
+        post_symp_days = durations[1::2] * (POST_SYMP_MEAN_DAYS / GAMMA_SHAPE)
+        # A deadline is the first tick at or after the end of the phase
+        pre_symp_end = now + np.ceil(pre_symp_days * self.__ticks_per_day).astype(np.int64)
+        self.status[indices] = PandemicStatus.INFECTED
+        self.__infection_start[indices] = now
+        self.__pre_symp_end[indices] = pre_symp_end
+        self.__symp_end[indices] = pre_symp_end + np.ceil(post_symp_days * self.__ticks_per_day).astype(np.int64)
+        self.__pre_symptomatic[indices] = True
+        self.__symptomatic[indices] = False
+
+        current_dt = self.__timer.current_time_of_day
+        for i, days in zip(indices, pre_symp_days):
+            self.__events.emit(EventCode.INFECTED, self.__agent_ids[i], current_dt,
+                               until=current_dt + timedelta(days=float(days)))
+
+    def infect_one(self, index: int):
+        """
+        Scalar infect, for the handles of the agents: updates the arrays in place without allocating.
+        :param index: Index of the agent.
+        """
+        if self.status[index] != PandemicStatus.SUSCEPTIBLE:
+            return
+        now = self.__timer.absolute_tick
+        pre_symp_days = self.__sampler.gamma(GAMMA_SHAPE, PRE_SYMP_MEAN_DAYS / GAMMA_SHAPE)
+        post_symp_days = self.__sampler.gamma(GAMMA_SHAPE, POST_SYMP_MEAN_DAYS / GAMMA_SHAPE)
+        pre_symp_end = now + math.ceil(pre_symp_days * self.__ticks_per_day)
+        self.status[index] = PandemicStatus.INFECTED
+        self.__infection_start[index] = now
+        self.__pre_symp_end[index] = pre_symp_end
+        self.__symp_end[index] = pre_symp_end + math.ceil(post_symp_days * self.__ticks_per_day)
+        self.__pre_symptomatic[index] = True
+        self.__symptomatic[index] = False
+
+        current_dt = self.__timer.current_time_of_day
+        self.__events.emit(EventCode.INFECTED, self.__agent_ids[index], current_dt,
+                           until=current_dt + timedelta(days=pre_symp_days))
+
+    def expose(self, indices: np.ndarray, p_infection: np.ndarray):
+        """
+        Vectorised PandemicStateManager.expose: infection of agents exposed to the droplets during a tick.
+        :param indices: Array of indices of the exposed agents.
+        :param p_infection: Array of their probabilities of infection during the tick.
+        """
+        if self.__infection_model == "dose":
+            with np.errstate(divide="ignore"):
+                self.__dose[indices] -= np.log1p(-np.asarray(p_infection, dtype=float))
+            self.infect(indices[self.__dose[indices] >= self.__threshold[indices]])
+        else:
+            self.infect(indices[self.__sampler.random(len(indices)) < p_infection])
+
+    def expose_one(self, index: int, p_infection: float):
+        """
+        Scalar expose, for the handles of the agents: no array is allocated, the uniform draws are the same as expose.
+        :param index: Index of the exposed agent.
+        :param p_infection: Its probability of infection during the tick.
+        """
+        if self.__infection_model == "dose":
+            self.__dose[index] -= math.log1p(-p_infection) if p_infection < 1 else -math.inf
+            if self.__dose[index] >= self.__threshold[index]:
+                self.infect_one(index)
+        elif p_infection > 0 and self.__sampler.random() < p_infection:
+            self.infect_one(index)
+
+    def update_during_day(self):
+        """
+        Vectorised PandemicStateManager.update_status_during_day: the pre-symptomatic agents whose phase is over
+        become symptomatic (and stay INFECTED until the end of day test).
+        """
+        onset = self.__pre_symptomatic & (self.__timer.absolute_tick >= self.__pre_symp_end) & \
+            (self.status == PandemicStatus.INFECTED)
+        self.__pre_symptomatic[onset] = False
+        self.__symptomatic[onset] = True
+
+    def end_of_day_test(self) -> np.ndarray:
+        """
+        Vectorised PandemicStateManager.end_of_day_test: the symptomatic agents are quarantined.
+        :return: The indices of the agents quarantined by the test.
+        """
+        tested = np.flatnonzero((self.status == PandemicStatus.INFECTED) & self.__symptomatic)
+        if not len(tested):
+            return tested
+        self.status[tested] = PandemicStatus.QUARANTINED
+        self.__quarantine_end[tested] = self.__timer.absolute_tick + round(QUARANTINE_DAYS * self.__ticks_per_day)
+        current_dt = self.__timer.current_time_of_day
+        quarantine_end = current_dt + timedelta(days=QUARANTINE_DAYS)
+        for i in tested:
+            self.__events.emit(EventCode.QUARANTINED, self.__agent_ids[i], current_dt, until=quarantine_end)
+        return tested
+
+
+class AgentHealth:
+    """
+    Handle of one agent in a PopulationHealth, with the interface of PandemicStateManager. The daily transitions are
+    applied by the PopulationHealth for all the agents at once, so the per-agent hooks do nothing.
+    """
+    __slots__ = ("__health", "__index")
+
+    def __init__(self, health: PopulationHealth, index: int):
+        """
+        Constructor for AgentHealth class.
+        :param health: The population health manager.
+        :param index: Index of the agent in its arrays.
+        """
+        self.__health = health
+        self.__index = index
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def status(self) -> int:
+        return int(self.__health.status[self.__index])
+
+    def become_infected(self, current_dt=None):
+        self.__health.infect_one(self.__index)
+
+    def expose(self, p_infection: float, current_dt=None):
+        self.__health.expose_one(self.__index, p_infection)
+
+    def update_status_during_day(self, current_dt=None):
+        pass
+
+    def end_of_day_test(self, current_dt=None):
+        pass
+
+    def update_quarantine(self, current_dt=None):
+        pass
+
+    def is_infectious(self):
+        return self.__health.is_infectious(self.__index)
+
+    def is_quarantined(self):
+        return self.status == PandemicStatus.QUARANTINED
+
+    def is_susceptible(self):
+        return self.status == PandemicStatus.SUSCEPTIBLE
+
+    def is_infected(self):
+        return self.status == PandemicStatus.INFECTED
+
+    def is_recovered(self):
+        return self.status == PandemicStatus.RECOVERED
@@ -6,7 +6,7 @@ class SpreadSimulator:
     Simulates the spreading of droplet particles and represents the environment as a grid.
     """
     def __init__(self, rows: int, cols: int, max_load: float = 16000.0,
-                 decay_const: float = 0.1, diffusion_coeff: float = 0.02):
+                 decay_const: float = 0.1, diffusion_coeff: float = 0.02, min_load: float = 0.0):
         """
         Constructor for the SpreadSimulator class.
         :param rows: Row size of the simulation.
@@ -14,6 +14,8 @@ class SpreadSimulator:
         :param max_load: Max number of particles in each cell.
         :param decay_const: Parameter to control the decay of the spread.
         :param diffusion_coeff: Parameter to control the diffusion coefficient.
+        :param min_load: Loads below this one are cleared after each update, since diffusion alone never brings a cell
+        back to zero. 0 keeps every load.
         """
         self.__rows = rows
         self.__cols = cols
@@ -21,8 +23,43 @@ class SpreadSimulator:
 
         self.__decay_const = decay_const
         self.__diffusion_coeff = diffusion_coeff
+        self.__min_load = min_load
 
         self.__grid = [[0.0 for _ in range(cols)] for _ in range(rows)]
+        self.__contaminated = False  # particles were added since the last reset
+
+    @property
+    def rows(self) -> int:
+        return self.__rows
+
+    @property
+    def cols(self) -> int:
+        return self.__cols
+
+    @property
+    def max_load(self) -> float:
+        return self.__max_load
+
+    @property
+    def min_load(self) -> float:
+        return self.__min_load
+
+    @property
+    def grid(self) -> list[list[float]]:
+        """
+        Get the live grid of particles. It is not copied, so callers must treat it as read-only.
+        :return: The 2D list [row][col] of particle loads.
+        """
+        return self.__grid
+
+    @property
+    def contaminated(self) -> bool:
+        """
+        Check if the grid may hold particles: set when particles are added, cleared by a reset or once every load has
+        fallen under min_load.
+        :return: A boolean value indicating if the grid may hold particles.
+        """
+        return self.__contaminated
 
     def reset_grid(self):
         """
@@ -31,6 +68,7 @@ class SpreadSimulator:
         for r in range(self.__rows):
             for c in range(self.__cols):
                 self.__grid[r][c] = 0.0
+        self.__contaminated = False
 
     def add_source(self, row: int, col: int, amount: float):
         """
@@ -40,6 +78,7 @@ class SpreadSimulator:
         :param amount: Amount of particles to add.
         """
         if 0 <= row < self.__rows and 0 <= col < self.__cols:
+            self.__contaminated = True
             self.__grid[row][col] += amount
             if self.__grid[row][col] > self.__max_load:
                 self.__grid[row][col] = self.__max_load
@@ -55,6 +94,69 @@ class SpreadSimulator:
             return self.__grid[row][col]
         return 0.0
 
+    def block_has_load(self, row: int, col: int, size: int) -> bool:
+        """
+        Check if some cell of a square block holds particles.
+        :param row: Top row of the block.
+        :param col: Left column of the block.
+        :param size: Side of the block, in cells.
+        :return: True if a cell of the block inside the grid has a positive load.
+        """
+        grid = self.__grid
+        left, right = max(col, 0), min(col + size, self.__cols)
+        for r in range(max(row, 0), min(row + size, self.__rows)):
+            if any(grid[r][left:right]):
+                return True
+        return False
+
+    def block_loads(self, rows, cols, size: int):
+        """
+        Vectorised get_rate: mean load of square blocks of cells, cells outside the grid count as 0.
+        :param rows: Array of the top rows of the blocks.
+        :param cols: Array of the left columns of the blocks.
+        :param size: Side of the blocks, in cells.
+        :return: Array of mean loads, one per block.
+        """
+        import numpy as np
+        grid = self.__grid
+        r, c, inside = self._block_cells(rows, cols, size)
+        loads = np.zeros(r.shape, dtype=float)
+        # Only the cells under the blocks are read, the grid itself stays a list of lists
+        loads[inside] = [grid[ri][ci] for ri, ci in zip(r[inside].tolist(), c[inside].tolist())]
+        return loads.sum(axis=1) / (size * size)
+
+    def add_block_sources(self, rows, cols, size: int, amounts):
+        """
+        Vectorised add_source: add an amount of particles to every cell of square blocks.
+        :param rows: Array of the top rows of the blocks.
+        :param cols: Array of the left columns of the blocks.
+        :param size: Side of the blocks, in cells.
+        :param amounts: Array of amounts, one per block (added to each of its cells).
+        """
+        import numpy as np
+        r, c, inside = self._block_cells(rows, cols, size)
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=float)[:, None], r.shape)
+        # Sum the amounts per cell, then clamp once per cell: the same as clamping after each addition,
+        # since the amounts are positive
+        cells, inverse = np.unique(r[inside] * self.__cols + c[inside], return_inverse=True)
+        added = np.bincount(inverse, weights=amounts[inside])
+        if len(cells):
+            self.__contaminated = True
+        for cell, amount in zip(cells.tolist(), added.tolist()):
+            row, col = divmod(cell, self.__cols)
+            self.__grid[row][col] = min(self.__grid[row][col] + amount, self.__max_load)
+
+    def _block_cells(self, rows, cols, size: int):
+        """
+        Cells of square blocks, as arrays of shape (blocks, size * size) of rows and columns plus an inside-grid mask.
+        """
+        import numpy as np
+        dr, dc = np.divmod(np.arange(size * size), size)
+        r = np.asarray(rows)[:, None] + dr
+        c = np.asarray(cols)[:, None] + dc
+        inside = (r >= 0) & (r < self.__rows) & (c >= 0) & (c < self.__cols)
+        return r, c, inside
+
     def _get_neighbors(self, row: int, col: int) -> list:
         """
         Returns the neighbors of the cell.
@@ -102,12 +204,21 @@ class SpreadSimulator:
                     for (nr, nc) in neighbors:
                         temp_grid[nr][nc] += portion
 
-        # Copy the new values
+        # Copy the new values, clearing the negligible loads
+        max_load, min_load = self.__max_load, self.__min_load
+        loaded = False
         for r in range(self.__rows):
+            row, new_row = self.__grid[r], temp_grid[r]
             for c in range(self.__cols):
-                if temp_grid[r][c] > self.__max_load:
-                    temp_grid[r][c] = self.__max_load
-                self.__grid[r][c] = temp_grid[r][c]
+                val = new_row[c]
+                if val > max_load:
+                    val = max_load
+                elif val < min_load:
+                    val = 0.0
+                row[c] = val
+                if val:
+                    loaded = True
+        self.__contaminated = loaded
 
     def update(self):
         """
@@ -115,12 +226,33 @@ class SpreadSimulator:
           1) Decay the droplets in each cell
           2) Diffuse droplets among neighboring cells
         """
+        # An empty grid stays empty
+        if not self.__contaminated:
+            return
+
         # 1) Decay
         self._apply_decay()
 
         # 2) Diffusion
         self._apply_diffusion()
 
+    def advance(self, ticks: int, stop=None) -> int:
+        """
+        Advance several ticks at once, e.g. over a stretch where no agent acts. The ticks left once the grid is empty
+        cost nothing.
+        :param ticks: Number of ticks to advance.
+        :param stop: Optional function called with the number of ticks advanced so far before each tick but the first,
+        the advance stops there when it returns True (e.g. when particles reach an agent).
+        :return: The number of ticks advanced.
+        """
+        for done in range(ticks):
+            if not self.__contaminated:
+                break
+            if done and stop is not None and stop(done):
+                return done
+            self.update()
+        return ticks
+
     def draw(self, screen, screen_width, screen_height):
         """
         Draw the particles on the screen.
@@ -0,0 +1,222 @@
+import datetime
+import math
+import os
+
+import numpy as np
+
+
+class SpatialHash:
+    """
+    Uniform grid of square buckets over the sub-tiles, holding the agents in the room. Agents are only re-bucketed
+    when they cross into another bucket, and with buckets as wide as the contact radius, every pair of agents in
+    contact lies in the same or in neighbouring buckets.
+    """
+    def __init__(self, bucket_size: int):
+        """
+        Constructor for SpatialHash class.
+        :param bucket_size: Side of the buckets, in sub-tiles.
+        """
+        if bucket_size <= 0:
+            raise ValueError("Bucket size must be positive.")
+        self.__bucket_size = bucket_size
+        self.__buckets = {}    # (bx, by) -> set of agent indices
+        self.__bucket_of = {}  # agent index -> (bx, by)
+        self.__positions = {}  # agent index -> (gx, gy)
+
+    @property
+    def bucket_size(self) -> int:
+        return self.__bucket_size
+
+    @property
+    def positions(self) -> dict:
+        return self.__positions
+
+    def move(self, index: int, position: tuple[int, int]):
+        """
+        Update the position of an agent, inserting it if needed.
+        :param index: Index of the agent.
+        :param position: (gx, gy) in sub-tiles.
+        """
+        self.__positions[index] = position
+        bucket = (position[0] // self.__bucket_size, position[1] // self.__bucket_size)
+        old = self.__bucket_of.get(index)
+        if old == bucket:
+            return
+        if old is not None:
+            self._discard(old, index)
+        self.__bucket_of[index] = bucket
+        self.__buckets.setdefault(bucket, set()).add(index)
+
+    def remove(self, index: int):
+        """
+        Remove an agent (e.g. when it leaves the room).
+        """
+        old = self.__bucket_of.pop(index, None)
+        if old is not None:
+            self._discard(old, index)
+            del self.__positions[index]
+
+    def near(self, index: int, radius: float) -> list[int]:
+        """
+        List the agents closer than radius to an agent (euclidean distance in sub-tiles).
+        :param index: Index of the agent, which must be in the hash.
+        :param radius: The contact radius, at most the bucket size.
+        :return: The indices of the other agents.
+        """
+        buckets, positions = self.__buckets, self.__positions
+        xi, yi = positions[index]
+        bx, by = self.__bucket_of[index]
+        radius_sq = radius * radius
+        result = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in buckets.get((bx + dx, by + dy), ()):
+                    xj, yj = positions[j]
+                    if j != index and (xi - xj) ** 2 + (yi - yj) ** 2 <= radius_sq:
+                        result.append(j)
+        return result
+
+    def _discard(self, bucket: tuple[int, int], index: int):
+        members = self.__buckets[bucket]
+        members.discard(index)
+        if not members:
+            del self.__buckets[bucket]
+
+
+class ContactNetwork:
+    """
+    Opt-in recorder of the close contacts between agents: how long each pair of agents spent within a radius of each
+    other. The contacts are kept incrementally: only the agents that moved during a tick are looked up in a SpatialHash,
+    and each open contact remembers the tick it started at, so a tick where nobody moves costs no pair check at all.
+    The durations are summed in a sparse edge table, written out at the end of each day as contacts_<date>.npz
+    (source and target agent ids, seconds in contact).
+    """
+    def __init__(self, directory: str, agent_ids: list[int], radius: float, seconds_per_tick: int):
+        """
+        Constructor for ContactNetwork class.
+        :param directory: Directory of the daily output files.
+        :param agent_ids: Ids of the agents, in the order they are passed to record().
+        :param radius: Contact radius, in sub-tiles.
+        :param seconds_per_tick: Duration of a tick.
+        """
+        if radius <= 0:
+            raise ValueError("Contact radius must be positive.")
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__agent_ids = np.asarray(agent_ids, dtype=np.int32)
+        self.__radius = radius
+        self.__seconds_per_tick = seconds_per_tick
+        self.__hash = SpatialHash(max(1, math.ceil(radius)))
+
+        self.__day_date = None
+        self.__tick = 0  # ticks recorded during the day
+        self.__edges = {}  # (i, j) -> ticks in contact during the day, for the contacts that ended
+        self.__open = {}  # (i, j) -> tick at which the contact started
+        self.__contacts = {}  # agent index -> set of the agents it is in contact with
+        self.__closed = False
+
+    @property
+    def edges(self) -> dict:
+        """
+        Get the edge table of the current day, (i, j) agent indices -> ticks in contact, open contacts included.
+        """
+        edges = dict(self.__edges)
+        for pair, start in self.__open.items():
+            edges[pair] = edges.get(pair, 0) + self.__tick - start
+        return edges
+
+    def start_day(self, day_date: datetime.date):
+        """
+        Start the edge table of a new day (the previous one is written if it was not).
+        """
+        self.end_day()
+        self.__day_date = day_date
+
+    def record(self, agents: list):
+        """
+        Update the hash with the positions of the agents after a tick, then the contacts of the agents that moved.
+        :param agents: Agents in the same order as the agent ids given to the constructor.
+        """
+        spatial_hash = self.__hash
+        positions = spatial_hash.positions
+        moved = []
+        for i, agent in enumerate(agents):
+            position = agent.grid_position
+            if position[0] < 0:
+                if i in positions:
+                    spatial_hash.remove(i)
+                    moved.append(i)
+            elif positions.get(i) != position:
+                spatial_hash.move(i, position)
+                moved.append(i)
+
+        if moved:
+            now, contacts = self.__tick, self.__contacts
+            for i in moved:
+                for j in contacts.pop(i, ()):
+                    contacts[j].discard(i)
+                    self._close((i, j) if i < j else (j, i), now)
+            for i in moved:
+                if i not in positions:
+                    continue
+                for j in spatial_hash.near(i, self.__radius):
+                    pair = (i, j) if i < j else (j, i)
+                    if pair not in self.__open:
+                        self.__open[pair] = now
+                        contacts.setdefault(i, set()).add(j)
+                        contacts.setdefault(j, set()).add(i)
+        self.__tick += 1
+
+    def repeat(self, ticks: int):
+        """
+        Count ticks during which nobody moved (the open contacts go on).
+        """
+        self.__tick += ticks
+
+    def end_day(self):
+        """
+        Write the edge table of the day and clear it.
+        """
+        if self.__day_date is None:
+            return
+        edges = self.edges
+        pairs = np.asarray(list(edges.keys()), dtype=np.int64).reshape(-1, 2)
+        ticks = np.fromiter(edges.values(), dtype=np.int64, count=len(edges))
+        np.savez_compressed(
+            os.path.join(self.__directory, f"contacts_{self.__day_date.isoformat()}.npz"),
+            source=self.__agent_ids[pairs[:, 0]],
+            target=self.__agent_ids[pairs[:, 1]],
+            seconds=ticks * self.__seconds_per_tick,
+            radius=np.asarray([self.__radius], dtype=float),
+        )
+        # The contacts of the next day are looked up from scratch
+        self.__day_date = None
+        self.__tick = 0
+        self.__edges = {}
+        self.__open = {}
+        self.__contacts = {}
+        self.__hash = SpatialHash(self.__hash.bucket_size)
+
+    def close(self):
+        """
+        Write the pending day.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.end_day()
+
+    def _close(self, pair: tuple[int, int], now: int):
+        start = self.__open.pop(pair)
+        if now > start:
+            self.__edges[pair] = self.__edges.get(pair, 0) + now - start
+
+
+def load_contacts(file_path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load a daily contact file written by ContactNetwork.
+    :param file_path: Path of the file.
+    :return: The source ids, target ids and seconds in contact of every edge.
+    """
+    with np.load(file_path, allow_pickle=False) as data:
+        return data["source"], data["target"], data["seconds"]
@@ -0,0 +1,175 @@
+import datetime
+import json
+import logging
+from array import array
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from interaction.timer import Timer
+
+
+NO_AGENT = -2 ** 31  # agent id of the events that concern no agent (the teacher is -1)
+
+
+class EventCode(object):
+    DAY_START = 1
+    INFECTED = 2
+    QUARANTINED = 3
+    RECOVERED = 4
+
+
+class EventSink:
+    """
+    Destination of the simulation events (day starts and health transitions).
+    """
+    def emit(self, code: int, agent_id: int, current_dt: datetime.datetime, until: datetime.datetime = None):
+        """
+        Report an event.
+        :param code: The EventCode of the event.
+        :param agent_id: The id of the agent, NO_AGENT if the event concerns no agent.
+        :param current_dt: The datetime of the event, for the text log.
+        :param until: End of the phase started by the event (pre-symptomatic phase or quarantine), for the text log.
+        """
+        pass
+
+    def close(self):
+        pass
+
+
+class TextEventFormatter(EventSink):
+    """
+    Human-readable log of the events, the same lines as the ones the analysis scripts used to parse. The messages
+    are only formatted by the logging handlers, if the records are kept.
+    """
+    def __init__(self):
+        self.__health_logger = logging.getLogger("PandemicStateManager")
+        self.__day_logger = logging.getLogger("SceneOrchestrator")
+
+    def emit(self, code: int, agent_id: int, current_dt: datetime.datetime, until: datetime.datetime = None):
+        if code == EventCode.DAY_START:
+            self.__day_logger.info("A new simulation started at %s", current_dt)
+        elif code == EventCode.INFECTED:
+            self.__health_logger.info("[PSM] Agent %s became infected at %s. pre_symp_end=%s",
+                                      agent_id, current_dt, until)
+        elif code == EventCode.QUARANTINED:
+            self.__health_logger.info("[PSM] Agent %s quarantined at end_of_day. Until %s", agent_id, until)
+        elif code == EventCode.RECOVERED:
+            self.__health_logger.info("[PSM] Agent %s recovered after quarantine.", agent_id)
+
+
+class EventLog(EventSink):
+    """
+    Typed log of the events: one row per event with the agent id, the event code and the calendar tick of the timer
+    (see Timer.absolute_tick), kept in compact columns and written as a compressed npz file with the run metadata
+    when the log is closed. The text log is only produced if a formatter is given.
+    """
+    def __init__(self, file_path: str, timer: "Timer", agent_ids: list[int], metadata: dict = None,
+                 formatter: EventSink = None):
+        """
+        Constructor for EventLog class.
+        :param file_path: Path of the output file.
+        :param timer: The timer of the simulation, read for the tick of each event.
+        :param agent_ids: Ids of the simulated agents.
+        :param metadata: Description of the run (e.g. the engine configuration), stored as JSON.
+        :param formatter: Optional sink the events are also forwarded to (e.g. a TextEventFormatter).
+        """
+        self.__file_path = file_path
+        self.__timer = timer
+        self.__agent_ids = np.asarray(agent_ids, dtype=np.int32)
+        self.__metadata = metadata or {}
+        self.__formatter = formatter
+        self.__start_date = timer.current_date
+
+        self.__agent = array("i")
+        self.__code = array("B")
+        self.__tick = array("q")
+        self.__closed = False
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    def __len__(self):
+        return len(self.__code)
+
+    def emit(self, code: int, agent_id: int, current_dt: datetime.datetime, until: datetime.datetime = None):
+        self.__agent.append(agent_id)
+        self.__code.append(code)
+        self.__tick.append(self.__timer.absolute_tick)
+        if self.__formatter is not None:
+            self.__formatter.emit(code, agent_id, current_dt, until)
+
+    def close(self):
+        """
+        Write the events and the metadata of the run.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        clock = self.__timer.clock
+        np.savez_compressed(
+            self.__file_path,
+            agent=np.frombuffer(self.__agent, dtype=np.int32),
+            code=np.frombuffer(self.__code, dtype=np.uint8),
+            tick=np.frombuffer(self.__tick, dtype=np.int64),
+            agent_ids=self.__agent_ids,
+            start_date=np.asarray([self.__start_date.toordinal()], dtype=np.int32),
+            start_seconds=np.asarray([clock.start_seconds], dtype=np.int32),
+            time_step_seconds=np.asarray([clock.time_step_seconds], dtype=np.int32),
+            metadata=np.asarray(json.dumps(self.__metadata, default=str)),
+        )
+        if self.__formatter is not None:
+            self.__formatter.close()
+
+
+class Events:
+    """
+    Read-only view over an event file: one entry per event in the agent, code and tick columns.
+    """
+    def __init__(self, agent, code, tick, agent_ids, start_date, start_seconds, time_step_seconds, metadata):
+        self.agent = agent
+        self.code = code
+        self.tick = tick
+        self.agent_ids = agent_ids
+        self.start_date = start_date
+        self.start_seconds = start_seconds
+        self.time_step_seconds = time_step_seconds
+        self.metadata = metadata
+
+    def __len__(self):
+        return len(self.code)
+
+    def day_ordinals(self) -> np.ndarray:
+        """
+        Get the date of every event, as date ordinals.
+        """
+        seconds = self.start_seconds + self.tick * self.time_step_seconds
+        return self.start_date.toordinal() + seconds // 86400
+
+    def of(self, code: int) -> np.ndarray:
+        """
+        Get the mask of the events of a kind.
+        """
+        return self.code == code
+
+
+def load_events(file_path: str) -> Events:
+    """
+    Load an event file written by EventLog.
+    :param file_path: Path of the event file.
+    :return: An Events object.
+    """
+    with np.load(file_path, allow_pickle=False) as data:
+        return Events(
+            agent=data["agent"],
+            code=data["code"],
+            tick=data["tick"],
+            agent_ids=data["agent_ids"],
+            start_date=datetime.date.fromordinal(int(data["start_date"][0])),
+            start_seconds=int(data["start_seconds"][0]),
+            time_step_seconds=int(data["time_step_seconds"][0]),
+            metadata=json.loads(str(data["metadata"])),
+        )
+
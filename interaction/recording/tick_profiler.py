@@ -0,0 +1,168 @@
+import json
+import os
+import time
+
+
+BUCKETS = 64  # log2 buckets of nanoseconds
+
+_clock = time.perf_counter_ns
+
+
+class TickProfiler:
+    """
+    Opt-in profiler of the phases of the simulation loop. The loop switches the current phase (morning, act, spread,
+    render...) as it goes, and the time between two switches is charged to the phase that was current, so a phase
+    entered inside another one (e.g. a path search during the movement of an agent) is not counted twice. One switch
+    costs a single read of the monotonic clock.
+    The time of each phase is summed over a step (one call of SceneOrchestrator.simulate_once, plus the rendering that
+    follows it), and each step adds one sample per phase to a histogram with log2 buckets. When the run is closed, a
+    text report with the totals and percentiles of every phase is written, along with a Chrome trace (chrome://tracing
+    or Perfetto) of the first steps: one slice per step and a counter of the time of each phase.
+    """
+    def __init__(self, directory: str, trace_steps: int = 20000):
+        """
+        Constructor for TickProfiler class.
+        :param directory: Directory of the report and of the trace.
+        :param trace_steps: Number of steps kept in the trace, 0 disables the trace.
+        """
+        if trace_steps < 0:
+            raise ValueError("Number of traced steps cannot be negative.")
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__trace_steps = trace_steps
+        self.__origin = _clock()
+
+        self.__phase = None
+        self.__since = 0
+        self.__step = {}  # phase -> nanoseconds during the current step
+        self.__step_start = None
+        self.__step_tick = 0
+        self.__steps = 0
+        self.__ticks = 0
+
+        self.__totals = {}  # phase -> nanoseconds
+        self.__histograms = {}  # phase -> samples per log2 bucket
+        self.__maxima = {}  # phase -> longest step
+        self.__trace = []
+        self.__closed = False
+
+    @property
+    def steps(self) -> int:
+        return self.__steps
+
+    @property
+    def totals(self) -> dict:
+        """
+        Get the time spent in each phase over the closed steps, in nanoseconds.
+        """
+        return dict(self.__totals)
+
+    @property
+    def histograms(self) -> dict:
+        """
+        Get the histogram of each phase: bucket b counts the steps where the phase took [2**(b-1), 2**b) nanoseconds.
+        """
+        return {phase: list(counts) for phase, counts in self.__histograms.items()}
+
+    def switch(self, phase):
+        """
+        Charge the time since the last switch to the current phase, and make another one current.
+        :param phase: Name of the new phase, None to stop counting (e.g. while the engine waits).
+        :return: The previous phase, to switch back to after a nested phase.
+        """
+        now = _clock()
+        previous = self.__phase
+        if previous is not None:
+            step = self.__step
+            step[previous] = step.get(previous, 0) + now - self.__since
+        self.__phase = phase
+        self.__since = now
+        return previous
+
+    def start_step(self, tick: int, ticks: int = 1):
+        """
+        Close the current step and start a new one.
+        :param tick: The tick of the day the step starts at.
+        :param ticks: The number of ticks of the previous step (more than one after a jump).
+        """
+        self.end_step(ticks)
+        self.__step_start = _clock()
+        self.__step_tick = tick
+
+    def end_step(self, ticks: int = 1):
+        """
+        Add the times of the current step to the histograms.
+        :param ticks: The number of ticks simulated during the step.
+        """
+        if self.__step_start is None:
+            return
+        phase = self.switch(None)
+        now = self.__since
+        step, self.__step = self.__step, {}
+        for name, ns in step.items():
+            self.__totals[name] = self.__totals.get(name, 0) + ns
+            histogram = self.__histograms.get(name)
+            if histogram is None:
+                histogram = self.__histograms[name] = [0] * BUCKETS
+            histogram[min(ns.bit_length(), BUCKETS - 1)] += 1
+            if ns > self.__maxima.get(name, 0):
+                self.__maxima[name] = ns
+
+        if self.__steps < self.__trace_steps:
+            ts = (self.__step_start - self.__origin) / 1000
+            self.__trace.append({"name": "step", "ph": "X", "pid": 0, "tid": 0, "ts": ts,
+                                 "dur": (now - self.__step_start) / 1000,
+                                 "args": {"day_tick": self.__step_tick, "ticks": ticks}})
+            self.__trace.append({"name": "phases (ms)", "ph": "C", "pid": 0, "tid": 0, "ts": ts,
+                                 "args": {name: ns / 1e6 for name, ns in step.items()}})
+        self.__steps += 1
+        self.__ticks += ticks
+        self.__step_start = None
+        # A step started while a phase was current
+        self.switch(phase)
+
+    def report(self) -> str:
+        """
+        Format the totals and the percentiles of the phases, the longest first.
+        """
+        total = sum(self.__totals.values())
+        lines = [f"{self.__steps} steps, {self.__ticks} ticks, {total / 1e9:.3f} s profiled",
+                 f"{'phase':<16}{'total s':>10}{'share':>8}{'steps':>8}{'mean us':>10}"
+                 f"{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for name, ns in sorted(self.__totals.items(), key=lambda item: -item[1]):
+            histogram, longest = self.__histograms[name], self.__maxima[name]
+            samples = sum(histogram)
+            percentiles = "".join(f"{min(_percentile(histogram, q), longest) / 1000:>10.1f}" for q in (0.5, 0.9, 0.99))
+            lines.append(f"{name:<16}{ns / 1e9:>10.3f}{100 * ns / max(total, 1):>7.1f}%{samples:>8}"
+                         f"{ns / samples / 1000:>10.1f}{percentiles}{longest / 1000:>10.1f}")
+        return "\n".join(lines)
+
+    def close(self, ticks: int = 1):
+        """
+        Close the last step and write profile_report.txt and profile_trace.json.
+        :param ticks: The number of ticks of the last step.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.end_step(ticks)
+        self.switch(None)
+        with open(os.path.join(self.__directory, "profile_report.txt"), "w") as report:
+            report.write(self.report() + "\n")
+        if self.__trace_steps:
+            with open(os.path.join(self.__directory, "profile_trace.json"), "w") as trace:
+                json.dump({"traceEvents": self.__trace, "displayTimeUnit": "ms"}, trace)
+
+
+def _percentile(histogram: list[int], q: float) -> float:
+    """
+    Estimate a percentile from a log2 histogram, interpolating linearly inside the bucket it falls in (nanoseconds).
+    """
+    rank = q * sum(histogram)
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            low = (1 << bucket) >> 1
+            return low + (low or 1) * max(rank - seen, 0) / count
+        seen += count
+    return 0.0
@@ -0,0 +1,207 @@
+import datetime
+import zipfile
+
+import numpy as np
+
+
+NO_PLACE = 0  # Place code stored when the agent has no assigned place yet
+
+
+class TrajectoryRecorder:
+    """
+    Opt-in recorder of per-tick agent state.
+    Each tick appends one row per column (grid position, activity, place, status) into preallocated arrays.
+    Full chunks are flushed as separate members of a compressed zip archive, so the whole run never lives in memory.
+    The archive is readable by numpy.load, but load_trajectory should be used to merge the chunks back.
+    """
+    def __init__(self, file_path: str, agent_ids: list[int], chunk_ticks: int = 4096):
+        """
+        Constructor for TrajectoryRecorder class.
+        :param file_path: Path of the compressed output file.
+        :param agent_ids: Ids of the recorded agents, in the order they are passed to record().
+        :param chunk_ticks: Number of ticks buffered in memory before a flush.
+        """
+        if chunk_ticks <= 0:
+            raise ValueError("Chunk size must be positive.")
+        self.__file_path = file_path
+        self.__agent_ids = np.asarray(agent_ids, dtype=np.int16)
+        self.__chunk_ticks = chunk_ticks
+
+        num_agents = len(agent_ids)
+        self.__seconds = np.zeros(chunk_ticks, dtype=np.int32)
+        self.__gx = np.zeros((chunk_ticks, num_agents), dtype=np.int16)
+        self.__gy = np.zeros((chunk_ticks, num_agents), dtype=np.int16)
+        self.__activity = np.zeros((chunk_ticks, num_agents), dtype=np.uint8)
+        self.__place = np.zeros((chunk_ticks, num_agents), dtype=np.uint8)
+        self.__status = np.zeros((chunk_ticks, num_agents), dtype=np.uint8)
+
+        self.__fill = 0          # Rows used in the current chunk
+        self.__rows_written = 0  # Rows already flushed to the archive
+        self.__chunk_count = 0
+
+        # Day index: date ordinal and first row of each simulated day
+        self.__day_dates = []
+        self.__day_rows = []
+
+        self.__archive = zipfile.ZipFile(file_path, mode="w", compression=zipfile.ZIP_DEFLATED)
+        self._write_array("agent_ids", self.__agent_ids)
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    @property
+    def closed(self) -> bool:
+        return self.__archive is None
+
+    @property
+    def rows(self) -> int:
+        """
+        Get the number of recorded ticks.
+        :return: The number of ticks recorded so far, flushed or not.
+        """
+        return self.__rows_written + self.__fill
+
+    def start_day(self, day_date: datetime.date):
+        """
+        Mark the beginning of a new simulated day in the day index.
+        :param day_date: The date of the simulated day.
+        """
+        self.__day_dates.append(day_date.toordinal())
+        self.__day_rows.append(self.rows)
+
+    def record(self, seconds: int, agents: list):
+        """
+        Append the state of the agents for one tick.
+        :param seconds: Seconds elapsed since the start of the simulated day.
+        :param agents: Agents in the same order as the agent ids given to the constructor.
+        """
+        row = self.__fill
+        self.__seconds[row] = seconds
+        gx, gy, activity, place, status = self.__gx[row], self.__gy[row], self.__activity[row], \
+            self.__place[row], self.__status[row]
+        for i, agent in enumerate(agents):
+            gx[i], gy[i] = agent.grid_position
+            activity[i] = agent.activity
+            place[i] = agent.place or NO_PLACE
+            status[i] = agent.pandemic_status
+
+        self.__fill += 1
+        if self.__fill == self.__chunk_ticks:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered rows to the archive as a new chunk.
+        """
+        if self.__fill == 0 or self.closed:
+            return
+        n = self.__fill
+        suffix = f"{self.__chunk_count:05d}"
+        self._write_array(f"seconds_{suffix}", self.__seconds[:n])
+        self._write_array(f"gx_{suffix}", self.__gx[:n])
+        self._write_array(f"gy_{suffix}", self.__gy[:n])
+        self._write_array(f"activity_{suffix}", self.__activity[:n])
+        self._write_array(f"place_{suffix}", self.__place[:n])
+        self._write_array(f"status_{suffix}", self.__status[:n])
+
+        self.__chunk_count += 1
+        self.__rows_written += n
+        self.__fill = 0
+
+    def close(self):
+        """
+        Flush the pending rows, write the day index and close the archive.
+        """
+        if self.closed:
+            return
+        self.flush()
+        self._write_array("day_dates", np.asarray(self.__day_dates, dtype=np.int32))
+        self._write_array("day_rows", np.asarray(self.__day_rows, dtype=np.int64))
+        self._write_array("chunk_count", np.asarray([self.__chunk_count], dtype=np.int32))
+        self.__archive.close()
+        self.__archive = None
+
+    def _write_array(self, name: str, array: np.ndarray):
+        with self.__archive.open(f"{name}.npy", mode="w", force_zip64=True) as member:
+            np.lib.format.write_array(member, np.ascontiguousarray(array), allow_pickle=False)
+
+
+class Trajectory:
+    """
+    Read-only view over a recorded trajectory file.
+    Every column is a 2D array [tick][agent], except seconds which has one value per tick.
+    """
+    def __init__(self, agent_ids, seconds, gx, gy, activity, place, status, day_dates, day_rows):
+        self.agent_ids = agent_ids
+        self.seconds = seconds
+        self.gx = gx
+        self.gy = gy
+        self.activity = activity
+        self.place = place
+        self.status = status
+        self.day_dates = day_dates
+        self.day_rows = day_rows
+
+    @property
+    def num_days(self) -> int:
+        return len(self.day_rows)
+
+    def day_date(self, day: int) -> datetime.date:
+        """
+        Get the date of a simulated day.
+        :param day: Index of the day in the run (0 = first simulated day).
+        :return: The date of the day.
+        """
+        return datetime.date.fromordinal(int(self.day_dates[day]))
+
+    def day_slice(self, day: int) -> slice:
+        """
+        Get the rows recorded during a simulated day.
+        :param day: Index of the day in the run (0 = first simulated day).
+        :return: A slice usable on every column.
+        """
+        start = int(self.day_rows[day])
+        stop = int(self.day_rows[day + 1]) if day + 1 < self.num_days else len(self.seconds)
+        return slice(start, stop)
+
+    def agent_column(self, agent_id: int) -> int:
+        """
+        Get the column of an agent.
+        :param agent_id: The id of the agent.
+        :return: The column index of the agent in each 2D array.
+        """
+        matches = np.flatnonzero(self.agent_ids == agent_id)
+        if len(matches) == 0:
+            raise KeyError(f"Agent {agent_id} was not recorded.")
+        return int(matches[0])
+
+
+def load_trajectory(file_path: str) -> Trajectory:
+    """
+    Load a trajectory file written by TrajectoryRecorder, merging its chunks.
+    :param file_path: Path of the trajectory file.
+    :return: A Trajectory object.
+    """
+    with np.load(file_path, allow_pickle=False) as data:
+        chunk_count = int(data["chunk_count"][0])
+        agent_ids = data["agent_ids"]
+        num_agents = len(agent_ids)
+
+        def column(name, dtype, two_d=True):
+            parts = [data[f"{name}_{i:05d}"] for i in range(chunk_count)]
+            if parts:
+                return np.concatenate(parts)
+            return np.zeros((0, num_agents) if two_d else 0, dtype=dtype)
+
+        return Trajectory(
+            agent_ids=agent_ids,
+            seconds=column("seconds", np.int32, two_d=False),
+            gx=column("gx", np.int16),
+            gy=column("gy", np.int16),
+            activity=column("activity", np.uint8),
+            place=column("place", np.uint8),
+            status=column("status", np.uint8),
+            day_dates=data["day_dates"],
+            day_rows=data["day_rows"],
+        )
@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class _Pool:
+    """
+    Pre-drawn variates of one distribution, handed out in order.
+    """
+    __slots__ = ("values", "items", "cursor")
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+        self.items = values.tolist()  # python floats, faster to hand out one at a time
+        self.cursor = 0
+
+
+class Sampler:
+    """
+    Random variates served from pools that are refilled in bulk from a seeded numpy generator, so that the per-call
+    cost of drawing one scalar (tens of microseconds with scipy) is paid once per pool. Every method returns a python
+    float when size is None, and an array of size variates otherwise, so scalar and vectorised consumers share the
+    same interface and the same stream.
+    """
+    def __init__(self, seed: int = None, pool_size: int = 4096):
+        """
+        Constructor for Sampler class.
+        :param seed: Seed of the generator.
+        :param pool_size: Number of variates drawn at each refill.
+        """
+        self.__rng = np.random.default_rng(seed)
+        self.__pool_size = pool_size
+        self.__pools = {}
+
+    def random(self, size: int = None):
+        """
+        Uniform variates in [0, 1).
+        """
+        return self._take(("random",), size, self.__rng.random)
+
+    def gamma(self, shape: float, scale: float = 1.0, size: int = None):
+        """
+        Gamma variates, drawn from a pool of standard Gamma variates of the given shape.
+        """
+        values = self._take(("gamma", shape), size, lambda n: self.__rng.standard_gamma(shape, n))
+        return values * scale
+
+    def exponential(self, scale: float = 1.0, size: int = None):
+        """
+        Exponential variates of the given mean.
+        """
+        return self._take(("exponential",), size, self.__rng.standard_exponential) * scale
+
+    def integers(self, low: int, high: int, size: int = None):
+        """
+        Uniform integers in [low, high), drawn from the uniform pool.
+        """
+        values = self._take(("random",), size, self.__rng.random)
+        if size is None:
+            return low + int(values * (high - low))
+        return low + (values * (high - low)).astype(np.int64)
+
+    def _take(self, key: tuple, size, draw):
+        """
+        Hand out the next variates of a pool, refilling it when it runs out.
+        :param key: Key of the pool (distribution and parameters).
+        :param size: None for one python float, else the number of variates.
+        :param draw: Function drawing n fresh variates.
+        """
+        pool = self.__pools.get(key)
+        if pool is None:
+            pool = self.__pools[key] = _Pool(draw(self.__pool_size))
+        if size is None:
+            if pool.cursor == len(pool.items):
+                pool = self.__pools[key] = _Pool(draw(self.__pool_size))
+            value = pool.items[pool.cursor]
+            pool.cursor += 1
+            return value
+        start = pool.cursor
+        if start + size <= len(pool.values):
+            pool.cursor += size
+            return pool.values[start:start + size]
+        # Use up the pool, then draw a new one large enough for the rest
+        rest = pool.values[start:]
+        pool = self.__pools[key] = _Pool(draw(max(self.__pool_size, size - len(rest))))
+        pool.cursor = size - len(rest)
+        return np.concatenate((rest, pool.values[:pool.cursor]))
+
@@ -1,11 +1,22 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import TYPE_CHECKING
 
-from engine.placeable import Placeable
 from interaction.agents.student import Student
 from interaction.agents.teacher import Teacher
 from interaction.disease.spread_simulator import SpreadSimulator
+from interaction.recording.event_log import NO_AGENT, EventCode, EventSink, TextEventFormatter
 from interaction.timer import Timer
+from interaction.utilities import PandemicStatus
+from loader.scene_loader import Scene
+
+if TYPE_CHECKING:
+    from interaction.agents.population import Population
+    from interaction.disease.population_health import PopulationHealth
+    from interaction.scheduler import AgentScheduler
+    from interaction.recording.contact_network import ContactNetwork
+    from interaction.recording.tick_profiler import TickProfiler
+    from interaction.recording.trajectory_recorder import TrajectoryRecorder
 
 
 class SceneOrchestrator:
@@ -17,22 +28,43 @@ class SceneOrchestrator:
             agents: list[Student],
             agents_prop,
             teacher: Teacher,
-            placeables: list[Placeable],
+            placeables: Scene,
             timer: Timer,
             spread_simulator: SpreadSimulator,
+            recorder: "TrajectoryRecorder" = None,
+            population: "Population" = None,
+            scheduler: "AgentScheduler" = None,
+            event_jump: bool = False,
+            skip_quiet_days: bool = False,
+            health: "PopulationHealth" = None,
+            contacts: "ContactNetwork" = None,
+            events: EventSink = None,
+            profiler: "TickProfiler" = None,
     ):
         """
         Constructor.
         :param agents: List of agents.
         :param agents_prop: Dictionary of agents' properties.
         :param teacher: Reference to teacher object.
-        :param placeables: List with placeables.
+        :param placeables: The indexed scene (iterable as the list of placeables).
         :param timer: Reference to timer object.
         :param spread_simulator: Reference to spread simulator.
+        :param recorder: Optional trajectory recorder, fed with the state of every agent after each tick.
+        :param population: Optional struct-of-arrays engine built from the agents, which then replaces their act logic.
+        :param scheduler: Optional active-set scheduler built from the agents, only the agents it wakes act.
+        :param event_jump: Jump over the stretches of ticks where no agent is due (needs the scheduler, ignored while
+        recording, since the recorder expects every tick).
+        :param skip_quiet_days: Skip the movement of the days that start with no infectious agent, since nothing can
+        change their health outcome (ignored while recording trajectories or contacts).
+        :param health: Optional population health manager the agents are attached to, which then applies the daily
+        transitions of every agent at once (the one of the population engine is used when it is set).
+        :param contacts: Optional contact network, fed with the positions of every agent after each tick.
+        :param events: The sink of the day starts, a text formatter if None. It is closed with the orchestrator.
+        :param profiler: Optional profiler of the phases of each tick, its report is written when the orchestrator is
+        closed.
         """
         # Set logger properties
         self.__logger = logging.getLogger(self.__class__.__name__)
-        logging.basicConfig(level=logging.INFO)
 
         self.__agents = agents
         self.__agents_prop = agents_prop
@@ -40,73 +72,272 @@ class SceneOrchestrator:
         self.__placeables = placeables
         self.__timer = timer
         self.__spread_simulator = spread_simulator
+        self.__recorder = recorder
+        self.__population = population
+        self.__scheduler = scheduler
+        self.__health = population.health if population is not None else health
+        self.__event_jump = event_jump and scheduler is not None and recorder is None
+        self.__contacts = contacts
+        self.__events = TextEventFormatter() if events is None else events
+        self.__skip_quiet_days = skip_quiet_days and recorder is None and contacts is None
+        self.__profiler = profiler
+        self.__step_ticks = 1
 
-        self.__last_time = self.__timer.current_time_of_day
         self.__finished = False
+        self.__closed = False
 
         if self.__teacher is None:
             self.__logger.warning("Teacher doesn't exist, but the simulation will continue.")
 
-    def simulate_once(self):
+    def simulate_once(self) -> int:
         """
-        Jump by the number of seconds from the config file.
+        Jump by the number of seconds from the config file, or over a whole idle stretch when event jumps are enabled.
+        :return: The number of ticks simulated.
         """
         if self.__finished:
-            return
+            return 0
+
+        # Integer clock, the datetime is only built for the timers of the PandemicStateManagers and for the logs (a
+        # PopulationHealth reads the tick counter)
+        clock = self.__timer.clock
+        tick = self.__timer.day_tick
+        current_dt = self.__timer.current_time_of_day if self.__health is None else None
+        profiler = self.__profiler
+        if profiler is not None:
+            profiler.start_step(tick, self.__step_ticks)
 
-        # Simulate the action for each agent
-        fmt = "%H:%M:%S"
-        current_date = self.__last_time.date()
-        start_time = datetime.combine(current_date, datetime.strptime(self.__agents_prop["start_time"], fmt).time())
-        end_time = datetime.combine(current_date, datetime.strptime(self.__agents_prop["end_time"], fmt).time())
+        if self.__event_jump and tick > 0:
+            if profiler is not None:
+                profiler.switch("jump")
+            skipped = self._jump(tick)
+            if skipped:
+                return self._step_done(skipped)
 
         # 1) MORNING check
-        if self.__last_time == start_time:
-            self.__logger.info(f"A new simulation started at {start_time}")
-            # Simulate for students
+        if tick == 0:
+            if profiler is not None:
+                profiler.switch("morning")
+            self.__events.emit(EventCode.DAY_START, NO_AGENT, self.__timer.current_time_of_day)
+            if self.__population is not None:
+                self.__population.morning_infection_check()
+            elif self.__health is not None:
+                # Quarantined agents were removed from the environment by the end of day test
+                self.__health.morning_check()
+            else:
+                # Simulate for students
+                for agent in self.__agents:
+                    agent.morning_infection_check(self.__agents_prop, current_dt=current_dt)
+                # Simulate for teacher
+                if self.__teacher:
+                    self.__teacher.morning_infection_check(self.__agents_prop, current_dt=current_dt)
+            if self.__scheduler is not None:
+                self.__scheduler.start_day()
+            if self.__recorder:
+                self.__recorder.start_day(self.__timer.current_date)
+            if self.__contacts is not None:
+                self.__contacts.start_day(self.__timer.current_date)
+            if self.__skip_quiet_days and self._is_quiet_day():
+                if profiler is not None:
+                    profiler.switch("end_of_day")
+                return self._skip_day()
+
+        # 2) RUN the day
+        if profiler is not None:
+            # The agents charge their infection check, shedding and movement to sub-phases of act
+            profiler.switch("act")
+        if self.__population is not None:
+            self.__population.act(tick, self.__agents_prop, self.__spread_simulator)
+        elif self.__scheduler is not None:
+            agents = self.__scheduler.agents
+            for index in self.__scheduler.due(tick, self.__spread_simulator):
+                agents[index].act(current_dt, tick, self.__placeables, self.__agents_prop, self.__spread_simulator)
+                self.__scheduler.reschedule(index, tick)
+        else:
             for agent in self.__agents:
-                agent.morning_infection_check(self.__agents_prop, current_dt=self.__last_time)
-            # Simulate for teacher
+                agent.act(current_dt, tick, self.__placeables, self.__agents_prop, self.__spread_simulator)
             if self.__teacher:
-                self.__teacher.morning_infection_check(self.__agents_prop, current_dt=self.__last_time)
+                self.__teacher.act(current_dt, tick, self.__placeables, self.__agents_prop, self.__spread_simulator)
+        if self.__population is None and self.__health is not None:
+            if profiler is not None:
+                profiler.switch("act.infection")
+            # Pre-symptomatic => symptomatic
+            self.__health.update_during_day()
+        # Search the paths requested by the agents, within the budget of the tick
+        if "path_queue" in self.__agents_prop:
+            if profiler is not None:
+                profiler.switch("pathfinding")
+            self.__agents_prop["path_queue"].process()
 
-        # 2) RUN the day
-        for agent in self.__agents:
-            agent.act(current_date, self.__timer.time_str, self.__placeables, self.__agents_prop, self.__spread_simulator)
-        if self.__teacher:
-            self.__teacher.act(current_date, self.__timer.time_str, self.__placeables, self.__agents_prop, self.__spread_simulator)
+        if profiler is not None:
+            profiler.switch("recording")
+        if self.__recorder:
+            self.__recorder.record(clock.seconds(tick), self.recorded_agents)
+        if self.__contacts is not None:
+            self.__contacts.record(self.recorded_agents)
 
         # 3) ENDING check
-        if self.__last_time == end_time - timedelta(seconds=self.__agents_prop["time_step_seconds"]):
-            # Simulate for students
-            for agent in self.__agents:
-                agent.end_of_day_test(self.__last_time)
-            # Simulate for teacher
-            if self.__teacher:
-                self.__teacher.end_of_day_test(self.__last_time)
+        if tick == clock.ticks_per_day - 1:
+            if profiler is not None:
+                profiler.switch("end_of_day")
+            self._end_of_day_test(current_dt)
 
         # Simulate the virus spread
+        if profiler is not None:
+            profiler.switch("spread")
         self.__spread_simulator.update()
 
         # Go to the next moment
-        current_time = self.__timer.tick()
+        tick = self.__timer.tick()
 
         # Check for end of the day or the simulation
-        if current_time.time() == end_time.time():
+        if tick == clock.ticks_per_day:
             self.__spread_simulator.reset_grid()
+            if self.__contacts is not None:
+                if profiler is not None:
+                    profiler.switch("recording")
+                self.__contacts.end_day()
+        self._step_done(1)
+        self.__finished = self.__timer.check_finished()
+        if self.__finished:
+            self.close()
+        return 1
+
+    def _step_done(self, ticks: int) -> int:
+        """
+        Stop charging time to the phases of the step (the rendering may still be charged to it).
+        :param ticks: The number of ticks simulated during the step.
+        :return: ticks
+        """
+        if self.__profiler is not None:
+            self.__step_ticks = ticks
+            self.__profiler.switch(None)
+        return ticks
+
+    def _end_of_day_test(self, current_dt: datetime):
+        if self.__population is not None:
+            self.__population.end_of_day_test()
+        elif self.__health is not None:
+            agents = self.recorded_agents
+            for index in self.__health.end_of_day_test():
+                agents[index].remove_from_environment()
+        else:
+            # Simulate for students
+            for agent in self.__agents:
+                agent.end_of_day_test(current_dt)
+            # Simulate for teacher
+            if self.__teacher:
+                self.__teacher.end_of_day_test(current_dt)
+
+    def _is_quiet_day(self) -> bool:
+        """
+        Check if no agent is infectious after the morning check. Nobody can shed nor get infected during such a day,
+        and nobody can become symptomatic, so only the day-level transitions matter.
+        """
+        if self.__health is not None:
+            return not (self.__health.status == PandemicStatus.INFECTED).any()
+        return all(agent.pandemic_status != PandemicStatus.INFECTED for agent in self.recorded_agents)
+
+    def _skip_day(self) -> int:
+        """
+        Go straight to the end of a quiet day: the agents stay outside and the particle field stays empty.
+        :return: The number of skipped ticks.
+        """
+        ticks = self.__timer.clock.ticks_per_day
+        self.__logger.info("No infectious agent on %s, skipping the movement of the day", self.__timer.current_date)
+        self.__timer.tick(ticks - 1)
+        self._end_of_day_test(self.__timer.current_time_of_day if self.__health is None else None)
+        self.__timer.tick()
+        self._step_done(ticks)
         self.__finished = self.__timer.check_finished()
-        self.__last_time = self.__timer.current_time_of_day
+        if self.__finished:
+            self.close()
+        return ticks
+
+    def _jump(self, tick: int) -> int:
+        """
+        Skip the ticks before the next one at which an agent is due. Only the particle field changes during them: the
+        agents sleep (no infectious agent is in the room, since it would shed at every tick) and no path is pending.
+        The field is advanced over the skipped ticks in one go, and the jump ends early at the first tick its particles
+        reach a susceptible agent, which must then draw its infection. The end of day tick is never skipped.
+        :param tick: The current tick.
+        :return: The number of skipped ticks.
+        """
+        path_queue = self.__agents_prop.get("path_queue")
+        if path_queue is not None and path_queue.pending:
+            return 0
+        scheduler, spread_simulator = self.__scheduler, self.__spread_simulator
+        last_tick = self.__timer.clock.ticks_per_day - 1
+        due_tick = scheduler.next_due_tick(tick, spread_simulator)
+        target = last_tick if due_tick is None else min(due_tick, last_tick)
+        if target <= tick:
+            return 0
+        skipped = target - tick
+        if spread_simulator:
+            if self.__profiler is not None:
+                self.__profiler.switch("spread")
+            skipped = spread_simulator.advance(
+                skipped, lambda done: scheduler.next_due_tick(tick + done, spread_simulator) == tick + done)
+        if self.__contacts is not None:
+            # Nobody moves during the skipped ticks
+            self.__contacts.repeat(skipped)
+        self.__timer.tick(skipped)
+        return skipped
+
+    def close(self):
+        """
+        Release the resources attached to the simulation (e.g. flush the trajectory recorder).
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__recorder:
+            self.__recorder.close()
+        if self.__contacts is not None:
+            self.__contacts.close()
+        self.__events.close()
+        if self.__profiler is not None:
+            self.__profiler.close(self.__step_ticks)
+            self.__logger.info("Tick profile:\n%s", self.__profiler.report())
+        navigator = self.__agents_prop.get("navigator")
+        if navigator is not None and navigator.cache is not None:
+            self.__logger.info("Path cache: %d hits, %d misses.", navigator.cache.hits, navigator.cache.misses)
 
     @property
     def agents(self) -> list[Student]:
+        if self.__population is not None:
+            return self.__population.students
         return self.__agents
 
+    @property
+    def recorded_agents(self) -> list:
+        """
+        Get the agents in the order used by the trajectory recorder (students, then the teacher).
+        :return: A list of agents.
+        """
+        if self.__population is not None:
+            return self.__population.views
+        return self.__agents + [self.__teacher] if self.__teacher else self.__agents
+
     @property
     def teacher(self) -> Teacher:
+        if self.__population is not None:
+            return self.__population.teacher
         return self.__teacher
 
     @property
-    def placeables(self) -> list[Placeable]:
+    def health(self) -> "PopulationHealth":
+        return self.__health
+
+    @property
+    def profiler(self) -> "TickProfiler":
+        return self.__profiler
+
+    @property
+    def population(self) -> "Population":
+        return self.__population
+
+    @property
+    def placeables(self) -> Scene:
         return self.__placeables
 
     @property
@@ -0,0 +1,144 @@
+import heapq
+
+from interaction.agents.agent import Agent
+from interaction.disease.spread_simulator import SpreadSimulator
+from interaction.timer import DayClock
+from interaction.utilities import Activity, PandemicStatus
+
+
+class AgentScheduler:
+    """
+    Active-set scheduler: decides which agents act at each tick.
+    After acting, every agent reports the next tick at which its act may change anything (next path step, break,
+    lesson start, leaving or arriving time) and sleeps until then in a priority queue. Two kinds of agents depend on
+    the particle field rather than on the clock, and are woken outside of their schedule:
+      - infectious agents in the room act at every tick (they shed there), outside they follow their schedule like
+        the others (their symptom onset is caught up by the end of day test),
+      - susceptible agents in the room act at the ticks their block of cells holds particles, or shares the block of
+        an infectious agent in the room (which sheds there before they read it).
+    The susceptible agents in the room are scanned at every tick once the field is contaminated, which only reads
+    their cells. The work of a tick then grows with the number of awake, infectious and exposed agents. Diffusion
+    alone leaves a trace of particles on every cell, so the field must clear its negligible loads (min_load) for the
+    agents far from the sources to sleep.
+    """
+    def __init__(self, agents: list[Agent], clock: DayClock):
+        """
+        Constructor for AgentScheduler class.
+        :param agents: The agents, in the order in which they act (students, then the teacher).
+        :param clock: The clock of the day, passed to the agents to compute their wake-up ticks.
+        """
+        self.__agents = agents
+        self.__clock = clock
+
+        self.__wake = [0] * len(agents)  # tick of the valid heap entry of each agent, -1 if asleep for the day
+        self.__sleeping = []  # heap of (wake tick, index), entries not matching __wake are stale
+        self.__next_tick = []  # agents waking at the next tick, kept out of the heap
+        self.__infectious = set()  # infectious agents in the room
+        self.__present = set()  # agents in the room
+        self.__active = 0
+
+    @property
+    def agents(self) -> list[Agent]:
+        return self.__agents
+
+    @property
+    def active(self) -> int:
+        """
+        Get the number of agents that acted during the last tick.
+        """
+        return self.__active
+
+    def start_day(self):
+        """
+        Wake every agent at tick 0 of the day. Must be called after the morning checks.
+        """
+        self.__wake = [0] * len(self.__agents)
+        self.__sleeping = []
+        self.__next_tick = list(range(len(self.__agents)))
+        self.__infectious = {i for i, agent in enumerate(self.__agents)
+                             if agent.pandemic_status == PandemicStatus.INFECTED and agent.activity != Activity.OUTSIDE}
+        self.__present.clear()
+
+    def due(self, tick: int, spread_simulator: SpreadSimulator = None) -> list[int]:
+        """
+        Get the agents that shall act at a tick.
+        :param tick: The number of ticks since the start of the day.
+        :param spread_simulator: The particle field, susceptible agents in the room are exposed to its loads.
+        :return: Sorted list of agent indices.
+        """
+        due = set(self.__next_tick)
+        self.__next_tick = []
+        wake, sleeping = self.__wake, self.__sleeping
+        while sleeping and sleeping[0][0] <= tick:
+            wake_tick, index = heapq.heappop(sleeping)
+            if wake[index] == wake_tick:
+                due.add(index)
+        due |= self.__infectious
+        if spread_simulator:
+            due.update(self._exposed(spread_simulator))
+        self.__active = len(due)
+        return sorted(due)
+
+    def next_due_tick(self, tick: int, spread_simulator: SpreadSimulator = None) -> int:
+        """
+        Get the first tick, from the given one on, at which some agent is due.
+        :param tick: The current tick.
+        :param spread_simulator: The particle field, as in due.
+        :return: The tick, None if every agent sleeps until the next day.
+        """
+        if self.__next_tick or self.__infectious:
+            return tick
+        if spread_simulator and self._exposed(spread_simulator):
+            return tick
+        wake, sleeping = self.__wake, self.__sleeping
+        while sleeping and wake[sleeping[0][1]] != sleeping[0][0]:
+            heapq.heappop(sleeping)  # drop stale entries
+        return max(sleeping[0][0], tick) if sleeping else None
+
+    def reschedule(self, index: int, tick: int):
+        """
+        Put an agent to sleep after it acted.
+        :param index: Index of the agent.
+        :param tick: The tick at which it acted.
+        """
+        agent = self.__agents[index]
+        if agent.activity != Activity.OUTSIDE:
+            self.__present.add(index)
+        else:
+            self.__present.discard(index)
+        if agent.pandemic_status == PandemicStatus.INFECTED and index in self.__present:
+            self.__infectious.add(index)
+            self.__wake[index] = -1  # woken at every tick while shedding in the room
+            return
+        self.__infectious.discard(index)
+
+        wake_tick = agent.next_wake_tick(tick, self.__clock)
+        if wake_tick is None:
+            self.__wake[index] = -1
+        elif wake_tick == tick + 1:
+            self.__wake[index] = wake_tick
+            self.__next_tick.append(index)
+        else:
+            self.__wake[index] = wake_tick
+            heapq.heappush(self.__sleeping, (wake_tick, index))
+
+    def _exposed(self, spread_simulator: SpreadSimulator) -> list[int]:
+        """
+        List the susceptible agents in the room whose infection check may see particles during the tick: their block
+        of cells holds particles, or an infectious agent in the room stands on the same block.
+        """
+        agents = self.__agents
+        shedding = {agents[i].grid_position for i in self.__infectious}
+        if not spread_simulator.contaminated and not shedding:
+            return []
+        exposed = []
+        for i in self.__present:
+            agent = agents[i]
+            if agent.pandemic_status != PandemicStatus.SUSCEPTIBLE:
+                continue
+            gx, gy = agent.grid_position
+            grid_density = agent.profile.grid_density
+            if (gx, gy) in shedding or \
+                    spread_simulator.block_has_load(gy * grid_density, gx * grid_density, grid_density):
+                exposed.append(i)
+        return exposed
@@ -1,6 +1,7 @@
 import datetime
+import math
 
-from scipy.stats import gamma
+from interaction.sampler import Sampler
 
 
 WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
@@ -18,18 +19,119 @@ def add_minutes_to_time(base_time: datetime.time, minutes: float) -> datetime.ti
     return new_dt.time()
 
 
-def sample_gamma_time(shape=2.0, scale=1.0, max_minutes=5) -> float:
+def sample_gamma_time(sampler: Sampler, shape=2.0, scale=1.0, max_minutes=5) -> float:
     """
     Returns a random delta time of maximum 5 minutes.
+    :param sampler: The sampler to draw from.
     :param shape: The shape of the random variable.
     :param scale: The scale of the random variable.
     :param max_minutes: Max limit of time.
     :return: The random delta time.
     """
-    raw = gamma.rvs(a=shape, scale=scale)  # e.g. a=shape
+    raw = sampler.gamma(shape, scale)
     return min(raw, max_minutes)
 
 
+def seconds_of_day(time_str: str) -> int:
+    """
+    Convert a "%H:%M:%S" string to a number of seconds since midnight.
+    """
+    t = datetime.datetime.strptime(time_str, "%H:%M:%S").time()
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+class DayClock(object):
+    """
+    Integer clock of a school day: tick 0 is the start time, and the day has ticks_per_day ticks.
+    The schedule times and the break boundaries are converted to ticks once, so that nothing is parsed or formatted
+    while the simulation runs; datetimes are only built for logging and display.
+    """
+    BREAK_MINUTE = 50  # breaks run from minute 50 to the end of every hour
+
+    def __init__(self, start_time: str, end_time: str, time_step_seconds: int):
+        """
+        Constructor for DayClock class.
+        :param start_time: Start time of the day ("%H:%M:%S").
+        :param end_time: End time of the day ("%H:%M:%S").
+        :param time_step_seconds: Duration of a tick in seconds.
+        """
+        if time_step_seconds <= 0:
+            raise ValueError("Time step must be a positive number of seconds.")
+        self.__start = seconds_of_day(start_time)
+        self.__end = seconds_of_day(end_time)
+        self.__step = time_step_seconds
+        if self.__end <= self.__start:
+            raise ValueError("End time must be after start time.")
+        self.__ticks_per_day = -(-(self.__end - self.__start) // self.__step)
+        self.__break = bytearray(self.minute(t) >= self.BREAK_MINUTE for t in range(self.__ticks_per_day))
+
+    @property
+    def start_seconds(self) -> int:
+        return self.__start
+
+    @property
+    def time_step_seconds(self) -> int:
+        return self.__step
+
+    @property
+    def ticks_per_day(self) -> int:
+        return self.__ticks_per_day
+
+    def tick_of(self, time_str: str) -> int:
+        """
+        Get the first tick at or after a time of the day.
+        :param time_str: A "%H:%M:%S" string.
+        :return: The tick, negative if the time is before the start of the day.
+        """
+        return -(-(seconds_of_day(time_str) - self.__start) // self.__step)
+
+    def seconds(self, tick: int) -> int:
+        """
+        Get the number of seconds since the start of the day at a tick.
+        """
+        return tick * self.__step
+
+    def minute(self, tick: int) -> int:
+        """
+        Get the minute of the hour at a tick.
+        """
+        return (self.__start + tick * self.__step) // 60 % 60
+
+    def is_break(self, tick: int) -> bool:
+        """
+        Check if a tick of the day falls in the break (minute 50 or later).
+        """
+        return self.__break[tick] == 1 if 0 <= tick < self.__ticks_per_day else self.minute(tick) >= self.BREAK_MINUTE
+
+    def next_tick_at_minute(self, tick: int, minute: int) -> int:
+        """
+        Get the first tick at or after the next time the clock shows the given minute (e.g. the next :50 break).
+        :param tick: The current tick.
+        :param minute: Minute of the hour.
+        :return: A tick greater than tick.
+        """
+        now = self.__start + tick * self.__step
+        boundary = now - now % 3600 + minute * 60
+        if boundary <= now:
+            boundary += 3600
+        return -(-(boundary - self.__start) // self.__step)
+
+    def ticks(self, minutes: float) -> int:
+        """
+        Get the number of ticks needed for a duration to elapse.
+        :param minutes: Duration in minutes.
+        :return: The smallest number of ticks lasting at least that long.
+        """
+        return math.ceil(minutes * 60 / self.__step)
+
+    def datetime(self, date: datetime.date, tick: int) -> datetime.datetime:
+        """
+        Materialise the datetime of a tick, for logging and display.
+        """
+        return datetime.datetime.combine(date, datetime.time()) + \
+            datetime.timedelta(seconds=self.__start + tick * self.__step)
+
+
 class Timer(object):
     def __init__(self, start_time: str, end_time: str, num_weeks: int, time_step_seconds: int):
         """
@@ -41,21 +143,24 @@ class Timer(object):
         """
         self.__num_weeks = num_weeks
         self.__time_step_seconds = time_step_seconds
-
-        # Parse daily times
-        fmt = "%H:%M:%S"
-        self.__daily_start_time = datetime.datetime.strptime(start_time, fmt).time()
-        self.__daily_end_time = datetime.datetime.strptime(end_time, fmt).time()
+        self.__clock = DayClock(start_time, end_time, time_step_seconds)
 
         # We start on next Monday
         today = datetime.date.today()
         base_date = today if today.weekday() == 0 else today + datetime.timedelta(days=7 - today.weekday())
         self.__day_of_week = 0  # 0=Monday, ..., 4=Friday
         self.__current_week = 1
+        self.__day_index = 0  # school days since the start of the simulation
+        self.__base_date = base_date
 
-        # Our "current_time_of_day" starts at daily_start_time
+        # Integer time: the current tick of the current day
         self.__current_date = base_date
-        self.__current_time_of_day = datetime.datetime.combine(base_date, self.__daily_start_time)
+        self.__day_tick = 0
+        self.__current_time_of_day = None  # datetime of the current tick, built on demand
+
+    @property
+    def clock(self) -> DayClock:
+        return self.__clock
 
     @property
     def current_week(self) -> int:
@@ -73,13 +178,41 @@ class Timer(object):
         """
         return WEEKDAYS[self.__day_of_week]
 
+    @property
+    def day_index(self) -> int:
+        """
+        Get the number of school days simulated before the current one.
+        """
+        return self.__day_index
+
+    @property
+    def day_tick(self) -> int:
+        """
+        Get the number of ticks since the start of the current day.
+        """
+        return self.__day_tick
+
+    @property
+    def absolute_tick(self) -> int:
+        """
+        Get the number of ticks since the start of the simulation in calendar time (nights and weekends included),
+        for the deadlines that span several days.
+        :return: The calendar tick of the current tick.
+        """
+        days = (self.__current_date - self.__base_date).days
+        return days * 86400 // self.__clock.time_step_seconds + self.__day_tick
+
+    @property
+    def current_date(self) -> datetime.date:
+        return self.__current_date
+
     @property
     def time_str(self) -> str:
         """
         Get the current time string.
         :return: A string representing the current time formatted.
         """
-        return self.__current_time_of_day.strftime("%H:%M:%S")
+        return self.current_time_of_day.strftime("%H:%M:%S")
 
     @property
     def current_time_of_day(self) -> datetime.datetime:
@@ -87,15 +220,19 @@ class Timer(object):
         Get the current time of day.
         :return: A datetime representing the current time of day.
         """
+        if self.__current_time_of_day is None:
+            self.__current_time_of_day = self.__clock.datetime(self.__current_date, self.__day_tick)
         return self.__current_time_of_day
 
-    def tick(self) -> datetime.datetime:
+    def tick(self, ticks: int = 1) -> int:
         """
         Tick the simulation.
-        :return: The current time of the simulation.
+        :param ticks: Number of ticks to advance, without passing the end of the day.
+        :return: The current tick of the day.
         """
-        self.__current_time_of_day += datetime.timedelta(seconds=self.__time_step_seconds)
-        return self.__current_time_of_day
+        self.__day_tick = min(self.__day_tick + ticks, self.__clock.ticks_per_day)
+        self.__current_time_of_day = None
+        return self.__day_tick
 
     def check_finished(self) -> bool:
         """
@@ -103,8 +240,7 @@ class Timer(object):
         :return: A boolean indicating if the simulation has finished.
         """
         # Check if we've passed today's end_time
-        today_end_dt = datetime.datetime.combine(self.__current_date, self.__daily_end_time)
-        if self.__current_time_of_day >= today_end_dt:
+        if self.__day_tick >= self.__clock.ticks_per_day:
             # Move to next day
             self.__day_of_week += 1
             if self.__day_of_week > 4:
@@ -119,8 +255,7 @@ class Timer(object):
                 days_to_add = 1
 
             self.__current_date += datetime.timedelta(days=days_to_add)
-            self.__current_time_of_day = datetime.datetime.combine(
-                self.__current_date,
-                self.__daily_start_time
-            )
+            self.__day_index += 1
+            self.__day_tick = 0
+            self.__current_time_of_day = None
         return False
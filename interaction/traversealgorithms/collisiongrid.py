@@ -1,11 +1,14 @@
 import math
 
+import numpy as np
+
 from engine.placeable import *
 
 
-def build_collision_grid(placeables, width, height, tile_size, map_density):
+def build_collision_array(placeables, width, height, tile_size, map_density) -> np.ndarray:
     """
-    :return: 2D list [row][col] of booleans: True if blocked
+    Rasterise the colliding placeables on the sub-tile grid.
+    :return: 2D boolean array [row][col]: True if blocked
     """
     # number of tiles horizontally & vertically
     num_tiles_x = width // tile_size
@@ -15,8 +18,7 @@ def build_collision_grid(placeables, width, height, tile_size, map_density):
     grid_height = num_tiles_y * map_density
 
     # Initialize all free
-    collision_grid = [[False for _ in range(grid_width)]
-                                 for _ in range(grid_height)]
+    collision_grid = np.zeros((grid_height, grid_width), dtype=bool)
 
     for p in placeables:
         if not p.collision:
@@ -28,48 +30,83 @@ def build_collision_grid(placeables, width, height, tile_size, map_density):
             sub_w = int(p.width * map_density)
             sub_h = int(p.height * map_density)
 
-            for row in range(sub_top, sub_top + sub_h):
-                for col in range(sub_left, sub_left + sub_w):
-                    if 0 <= row < grid_height and 0 <= col < grid_width:
-                        collision_grid[row][col] = True
+            collision_grid[max(sub_top, 0):max(sub_top + sub_h, 0), max(sub_left, 0):max(sub_left + sub_w, 0)] = True
 
         elif isinstance(p, Circle):
             # Circle center = (p.x, p.y) in tile coords. radius in tile coords
-            # Suppose radius is sub_r (in tile units).
             # Convert to sub-tile coords:
             center_x = p.x * map_density
             center_y = p.y * map_density
             sub_r = (tile_size / 2.5) * map_density
 
-            # bounding box
-            min_row = int(center_y - sub_r)
-            max_row = int(center_y + sub_r)
-            min_col = int(center_x - sub_r)
-            max_col = int(center_x + sub_r)
+            # bounding box, clipped to the grid
+            min_row = max(int(center_y - sub_r), 0)
+            max_row = min(int(center_y + sub_r) + 1, grid_height)
+            min_col = max(int(center_x - sub_r), 0)
+            max_col = min(int(center_x + sub_r) + 1, grid_width)
+            if min_row >= max_row or min_col >= max_col:
+                continue
 
-            for row in range(min_row, max_row + 1):
-                for col in range(min_col, max_col + 1):
-                    if 0 <= row < grid_height and 0 <= col < grid_width:
-                        # distance from center
-                        dist = math.sqrt((col - center_x)**2 + (row - center_y)**2)
-                        if dist <= sub_r:
-                            collision_grid[row][col] = True
+            # squared distance from center for every cell of the bounding box
+            dy = np.arange(min_row, max_row) - center_y
+            dx = np.arange(min_col, max_col) - center_x
+            inside = dy[:, None] ** 2 + dx[None, :] ** 2 <= sub_r ** 2
+            collision_grid[min_row:max_row, min_col:max_col] |= inside
 
         elif isinstance(p, Polygon):
-            scaled_points = []
-            for (px, py) in p.points:
-                scaled_points.append((px * map_density, py * map_density))
-
-                for row in range(0, int(grid_height)):
-                    for col in range(0, int(grid_width)):
-                        if not point_in_polygon((col, row), scaled_points):
-                            # TODO: In the future
-                            # collision_grid[row][col] = True
-                            pass
+            scaled_points = [(px * map_density, py * map_density) for (px, py) in p.points]
+            _fill_polygon(collision_grid, scaled_points)
 
     return collision_grid
 
 
+def build_collision_grid(placeables, width, height, tile_size, map_density):
+    """
+    :return: 2D list [row][col] of booleans: True if blocked
+    """
+    return build_collision_array(placeables, width, height, tile_size, map_density).tolist()
+
+
+def _fill_polygon(collision_grid, polygon):
+    """
+    Scanline fill: mark every cell (col, row) for which point_in_polygon((col, row), polygon) is True.
+    :param collision_grid: 2D boolean array [row][col], updated in place.
+    :param polygon: List of (x, y) vertices in sub-tile coordinates.
+    """
+    grid_height, grid_width = collision_grid.shape
+    crossing_rows = []
+    crossing_xs = []
+    n = len(polygon)
+    for i in range(n):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % n]
+        if y1 == y2:
+            continue  # horizontal edges never cross a scanline
+
+        # Scanlines py crossing the edge satisfy (y1 > py) != (y2 > py), i.e. min_y <= py < max_y
+        first_row = max(math.ceil(min(y1, y2)), 0)
+        last_row = min(math.ceil(max(y1, y2)), grid_height)
+        if first_row >= last_row:
+            continue
+        rows = np.arange(first_row, last_row)
+        crossing_rows.append(rows)
+        crossing_xs.append(x1 + (rows - y1) * (x2 - x1) / (y2 - y1))
+
+    if not crossing_rows:
+        return
+    rows = np.concatenate(crossing_rows)
+    xs = np.concatenate(crossing_xs)
+    order = np.lexsort((xs, rows))
+    rows, xs = rows[order], xs[order]
+
+    # Each scanline has an even number of crossings; a cell is inside between crossings 2k and 2k+1
+    for row, x_in, x_out in zip(rows[0::2], xs[0::2], xs[1::2]):
+        first_col = max(math.ceil(x_in), 0)
+        last_col = min(math.ceil(x_out), grid_width)
+        if first_col < last_col:
+            collision_grid[row, first_col:last_col] = True
+
+
 def point_in_polygon(cell, polygon):
     """
     Check if point is inside polygon.
@@ -91,4 +128,4 @@ def point_in_polygon(cell, polygon):
             x_at_py = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
             if x_at_py > px:
                 inside = not inside
-    return inside
\ No newline at end of file
+    return inside
@@ -0,0 +1,133 @@
+from array import array
+from collections import deque
+
+
+UNREACHABLE = -1
+
+
+class FlowField:
+    """
+    BFS distance field towards a fixed goal (a single cell or a whole region).
+    Every agent heading to the goal shares the same field and moves by stepping to the neighbour
+    with the lowest distance, so routing costs O(1) per step whatever the number of agents.
+    """
+    def __init__(self, collision_grid, goal_cells: list[tuple[int, int]]):
+        """
+        Constructor for FlowField class.
+        :param collision_grid: 2D list [row][col] of booleans: True if blocked.
+        :param goal_cells: Cells (row, col) of the goal, all at distance 0.
+        """
+        self.__rows = len(collision_grid)
+        self.__cols = len(collision_grid[0]) if self.__rows else 0
+        self.__distances = array('i', [UNREACHABLE]) * (self.__rows * self.__cols)
+        self.__goal_cells = frozenset(goal_cells)
+
+        # Multi-source BFS from every free goal cell
+        distances = self.__distances
+        cols = self.__cols
+        queue = deque()
+        for r, c in self.__goal_cells:
+            if 0 <= r < self.__rows and 0 <= c < cols and not collision_grid[r][c]:
+                distances[r * cols + c] = 0
+                queue.append((r, c))
+        while queue:
+            r, c = queue.popleft()
+            next_distance = distances[r * cols + c] + 1
+            for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < self.__rows and 0 <= nc < cols and not collision_grid[nr][nc] \
+                        and distances[nr * cols + nc] == UNREACHABLE:
+                    distances[nr * cols + nc] = next_distance
+                    queue.append((nr, nc))
+
+    @property
+    def goal_cells(self) -> frozenset:
+        return self.__goal_cells
+
+    def distance(self, cell: tuple[int, int]) -> int:
+        """
+        Get the number of steps from a cell to the goal.
+        :param cell: Cell (row, col).
+        :return: The distance, or UNREACHABLE.
+        """
+        r, c = cell
+        if 0 <= r < self.__rows and 0 <= c < self.__cols:
+            return self.__distances[r * self.__cols + c]
+        return UNREACHABLE
+
+    def next_step(self, cell: tuple[int, int]) -> tuple[int, int]:
+        """
+        Get the neighbour one step closer to the goal.
+        :param cell: Current cell (row, col), which must be reachable and not a goal cell.
+        :return: The next cell (row, col).
+        """
+        r, c = cell
+        target = self.__distances[r * self.__cols + c] - 1
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.__rows and 0 <= nc < self.__cols and self.__distances[nr * self.__cols + nc] == target:
+                return nr, nc
+        raise ValueError(f"Cell {cell} is not on a path to the goal.")
+
+
+class FlowPath:
+    """
+    Path that follows a FlowField lazily, one step at a time.
+    It exposes the same cursor interface as GridPath.
+    """
+    __slots__ = ("__field", "__cell")
+
+    def __init__(self, field: FlowField, start: tuple[int, int]):
+        self.__field = field
+        self.__cell = start
+
+    def next_cell(self) -> tuple[int, int]:
+        self.__cell = self.__field.next_step(self.__cell)
+        return self.__cell
+
+    def __len__(self):
+        return max(self.__field.distance(self.__cell), 0)
+
+    def __bool__(self):
+        return self.__field.distance(self.__cell) > 0
+
+
+class FlowFieldSet:
+    """
+    The flow fields of every fixed destination of a map, indexed by the cells that belong to each goal.
+    """
+    def __init__(self, collision_grid, destinations: list[list[tuple[int, int]]]):
+        """
+        Constructor for FlowFieldSet class.
+        :param collision_grid: 2D list [row][col] of booleans: True if blocked.
+        :param destinations: One list of (row, col) cells per destination (a chair, a hotspot rectangle, ...).
+        """
+        self.__fields = []
+        self.__field_by_cell = {}
+        for cells in destinations:
+            field = FlowField(collision_grid, cells)
+            self.__fields.append(field)
+            for cell in cells:
+                self.__field_by_cell.setdefault(cell, field)
+
+    def __len__(self):
+        return len(self.__fields)
+
+    def field_for(self, goal: tuple[int, int]):
+        """
+        Get the field of the destination that contains a goal cell.
+        :param goal: Goal cell (row, col).
+        :return: The FlowField, or None if the cell is not part of a fixed destination.
+        """
+        return self.__field_by_cell.get(goal)
+
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Route towards the destination that contains the goal cell.
+        When the destination is a region, the path ends on the closest cell of the region.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col), which must be part of a fixed destination.
+        :return: A FlowPath, or None if the destination cannot be reached (or is already reached).
+        """
+        path = FlowPath(self.__field_by_cell[goal], start)
+        return path if path else None
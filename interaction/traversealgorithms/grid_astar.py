@@ -0,0 +1,156 @@
+import heapq
+from array import array
+
+import numpy as np
+
+
+class GridAStar:
+    """
+    A* on a flat collision grid with integer cell indices.
+    The grid is padded with a blocked border, so neighbours never need a bounds check, and the score and parent
+    arrays are allocated once and reused: a generation stamp tells which entries belong to the current search,
+    so nothing has to be cleared between two queries.
+    Path lengths match PathFinder.astar_pathfinding (same 4-connectivity and Manhattan heuristic).
+    """
+    def __init__(self, collision_grid):
+        """
+        Constructor for GridAStar class.
+        :param collision_grid: 2D list or array [row][col] of booleans: True if blocked.
+        """
+        blocked = np.asarray(collision_grid, dtype=bool)
+        self.__rows, self.__cols = blocked.shape
+        self.__width = self.__cols + 2
+        padded = np.pad(blocked, 1, constant_values=True)
+        size = padded.size
+
+        self.__blocked = bytearray(padded.tobytes())
+        self.__row_of = array('i', np.repeat(np.arange(-1, self.__rows + 1), self.__width).tolist())
+        self.__col_of = array('i', np.tile(np.arange(-1, self.__cols + 1), self.__rows + 2).tolist())
+
+        # Search buffers, valid only where stamp == generation
+        self.__g = array('i', [0]) * size
+        self.__parent = array('i', [-1]) * size
+        self.__stamp = array('I', [0]) * size
+        self.__closed = array('I', [0]) * size
+        self.__generation = 0
+        self.__size = size
+        self.__expansions = 0
+
+        # State of the current search, see begin and resume
+        self.__open_set = []
+        self.__goal = (0, 0)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.__rows, self.__cols
+
+    @property
+    def expansions(self) -> int:
+        """
+        Get the number of nodes expanded by the current (or last) search.
+        """
+        return self.__expansions
+
+    def index(self, cell: tuple[int, int]) -> int:
+        """
+        Convert a (row, col) cell to its flat index.
+        """
+        return (cell[0] + 1) * self.__width + cell[1] + 1
+
+    def cell(self, index: int) -> tuple[int, int]:
+        """
+        Convert a flat index to its (row, col) cell.
+        """
+        return self.__row_of[index], self.__col_of[index]
+
+    def is_free(self, cell: tuple[int, int]) -> bool:
+        r, c = cell
+        return 0 <= r < self.__rows and 0 <= c < self.__cols and not self.__blocked[self.index(cell)]
+
+    def search(self, start: tuple[int, int], goal: tuple[int, int]) -> tuple:
+        """
+        Finds the shortest path from start to goal.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: Tuple of (row, col) cells from start to goal, empty if there is no path.
+        """
+        self.begin(start, goal)
+        return self.resume()
+
+    def begin(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Start an incremental search, to be continued with resume. Starting a new search abandons the previous one,
+        since all searches share the same buffers.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        """
+        self.__expansions = 0
+        self.__open_set = []
+        if not self.is_free(start) or not self.is_free(goal):
+            return
+
+        self.__generation += 1
+        start_index = self.index(start)
+        self.__goal = goal
+        self.__g[start_index] = 0
+        self.__parent[start_index] = -1
+        self.__stamp[start_index] = self.__generation
+        # Heap keys encode (f_score, -g_score, index) in one integer: on equal f, the deepest node is expanded first,
+        # which avoids sweeping the whole band of equivalent nodes on open floor
+        span = self.__size + 1  # g never reaches the number of cells
+        start_h = abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+        self.__open_set = [(start_h * span + span - 1) * self.__size + start_index]
+
+    def resume(self, max_expansions: int = None):
+        """
+        Continue the current search.
+        :param max_expansions: Maximum number of nodes to expand before giving up for now, None for no limit.
+        :return: The path as in search once the search is over, or None if the budget ran out first.
+        """
+        generation = self.__generation
+        blocked, g, parent, stamp, closed = self.__blocked, self.__g, self.__parent, self.__stamp, self.__closed
+        row_of, col_of = self.__row_of, self.__col_of
+        size, width = self.__size, self.__width
+        span = size + 1
+        open_set = self.__open_set
+        goal_r, goal_c = self.__goal
+        goal_index = self.index(self.__goal)
+        expansions = self.__expansions
+        limit = expansions + max_expansions if max_expansions is not None else -1
+
+        while open_set:
+            if expansions == limit:
+                self.__expansions = expansions
+                return None
+            current = heapq.heappop(open_set) % size
+            if closed[current] == generation:
+                continue  # stale heap entry
+            closed[current] = generation
+            expansions += 1
+            if current == goal_index:
+                self.__expansions = expansions
+                open_set.clear()
+                return self._reconstruct(current)
+
+            tentative_g = g[current] + 1
+            for neighbor in (current + width, current - width, current + 1, current - 1):
+                if blocked[neighbor]:
+                    continue
+                if stamp[neighbor] != generation or tentative_g < g[neighbor]:
+                    stamp[neighbor] = generation
+                    g[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    h = abs(row_of[neighbor] - goal_r) + abs(col_of[neighbor] - goal_c)
+                    heapq.heappush(open_set, ((tentative_g + h) * span + span - 1 - tentative_g) * size + neighbor)
+
+        self.__expansions = expansions
+        return ()  # no path found
+
+    def _reconstruct(self, current: int) -> tuple:
+        parent, row_of, col_of = self.__parent, self.__row_of, self.__col_of
+        path = []
+        while current != -1:
+            path.append((row_of[current], col_of[current]))
+            current = parent[current]
+        path.reverse()
+        return tuple(path)
@@ -0,0 +1,333 @@
+import heapq
+from collections import deque
+
+
+# Entrances at least this wide get two transitions (one at each end) instead of a single one in the middle
+WIDE_ENTRANCE = 6
+
+
+class HierarchicalPath:
+    """
+    Path that follows an abstract route and refines it lazily, one segment at a time.
+    It exposes the same cursor interface as GridPath.
+    """
+    __slots__ = ("__pathfinder", "__route", "__leg", "__segment", "__cursor")
+
+    def __init__(self, pathfinder: "HierarchicalPathfinder", route: tuple):
+        """
+        Constructor for HierarchicalPath class.
+        :param pathfinder: The pathfinder that computed the route, used to refine the segments.
+        :param route: Tuple of (cell, distance left to the goal) waypoints, from start to goal.
+        """
+        self.__pathfinder = pathfinder
+        self.__route = route
+        self.__leg = 0
+        self.__segment = ()
+        self.__cursor = 0
+
+    def next_cell(self) -> tuple[int, int]:
+        """
+        Consume the next cell of the path, refining the next segment of the route if needed.
+        :return: The (row, col) cell.
+        """
+        if self.__cursor == len(self.__segment):
+            self.__segment = self.__pathfinder.refine(self.__route[self.__leg][0], self.__route[self.__leg + 1][0])
+            self.__leg += 1
+            self.__cursor = 1  # the segment starts on the current cell
+        cell = self.__segment[self.__cursor]
+        self.__cursor += 1
+        return cell
+
+    def __len__(self):
+        return len(self.__segment) - self.__cursor + self.__route[self.__leg][1]
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class HierarchicalPathfinder:
+    """
+    HPA* on a collision grid partitioned in square clusters.
+    Transitions are placed on the free cells shared by two neighbouring clusters, and the distances between the
+    entrances of a cluster are precomputed, which forms a small abstract graph. A query only explores the clusters of
+    the start and the goal on the grid, then searches the abstract graph; the route is refined segment by segment
+    with searches bounded to one cluster. Paths are close to, but not always, the shortest.
+    """
+    def __init__(self, collision_grid, cluster_size: int = 10):
+        """
+        Constructor for HierarchicalPathfinder class.
+        :param collision_grid: 2D list [row][col] of booleans: True if blocked.
+        :param cluster_size: Width and height of a cluster, in cells.
+        """
+        if cluster_size < 2:
+            raise ValueError("Cluster size must be at least 2.")
+        self.__grid = collision_grid
+        self.__rows = len(collision_grid)
+        self.__cols = len(collision_grid[0]) if self.__rows else 0
+        self.__cluster_size = cluster_size
+        self.__cluster_rows = -(-self.__rows // cluster_size)
+        self.__cluster_cols = -(-self.__cols // cluster_size)
+
+        self.__edges = {}  # abstract node -> {neighbour node: cost}
+        self.__borders = {}  # (cluster, neighbour cluster) -> list of transitions (cell, neighbour cell)
+        self.__entrances = {}  # cluster -> entrance cells, as of the last build of the cluster
+        self.__segments = {}  # cluster -> {(cell, cell): refined segment}
+        self.__expansions = 0
+        self.__pending = ()  # route found by begin, see resume
+
+        self._rebuild({(cr, cc) for cr in range(self.__cluster_rows) for cc in range(self.__cluster_cols)})
+
+    @property
+    def cluster_size(self) -> int:
+        return self.__cluster_size
+
+    @property
+    def expansions(self) -> int:
+        """
+        Get the number of abstract nodes expanded by the last search.
+        """
+        return self.__expansions
+
+    @property
+    def node_count(self) -> int:
+        """
+        Get the number of nodes of the abstract graph.
+        """
+        return len(self.__edges)
+
+    def cluster_of(self, cell: tuple[int, int]) -> tuple[int, int]:
+        return cell[0] // self.__cluster_size, cell[1] // self.__cluster_size
+
+    def is_free(self, cell: tuple[int, int]) -> bool:
+        r, c = cell
+        return 0 <= r < self.__rows and 0 <= c < self.__cols and not self.__grid[r][c]
+
+    def update(self, cells):
+        """
+        Must be called after some cells of the collision grid have been modified:
+        only the clusters that contain them (and the borders they share with their neighbours) are rebuilt.
+        :param cells: The modified (row, col) cells.
+        """
+        self._rebuild({self.cluster_of(cell) for cell in cells})
+
+    def search(self, start: tuple[int, int], goal: tuple[int, int]) -> tuple:
+        """
+        Finds a route from start to goal on the abstract graph.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: Tuple of (cell, distance left to the goal) waypoints, empty if there is no path.
+        """
+        self.__expansions = 0
+        if start == goal or not self.is_free(start) or not self.is_free(goal):
+            return ()
+
+        # Connect the start and the goal to the entrances of their clusters
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        start_distances = self._local_distances(start, start_cluster)
+        start_edges = {node: start_distances[node] for node in self.__entrances[start_cluster]
+                       if node in start_distances}
+        if goal_cluster == start_cluster and goal in start_distances:
+            start_edges[goal] = start_distances[goal]
+        goal_distances = self._local_distances(goal, goal_cluster)
+        goal_edges = {node: goal_distances[node] for node in self.__entrances[goal_cluster] if node in goal_distances}
+
+        # A* on the abstract graph, preferring the deepest node on equal f like GridAStar
+        goal_r, goal_c = goal
+        edges = self.__edges
+        g_score = {start: 0}
+        came_from = {}
+        open_set = [(abs(start[0] - goal_r) + abs(start[1] - goal_c), 0, start)]
+        closed = set()
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.__expansions += 1
+            if current == goal:
+                return self._route(came_from, g_score, current)
+
+            g = -g
+            neighbours = edges.get(current, {})
+            if current == start:
+                neighbours = {**neighbours, **start_edges}
+            if current in goal_edges:
+                neighbours = {**neighbours, goal: goal_edges[current]}
+            for neighbour, cost in neighbours.items():
+                tentative_g = g + cost
+                if neighbour not in g_score or tentative_g < g_score[neighbour]:
+                    g_score[neighbour] = tentative_g
+                    came_from[neighbour] = current
+                    h = abs(neighbour[0] - goal_r) + abs(neighbour[1] - goal_c)
+                    heapq.heappush(open_set, (tentative_g + h, -tentative_g, neighbour))
+
+        return ()  # no path found
+
+    def begin(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Same interface as the incremental grid searches. The abstract search is short, so it runs at once.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        """
+        self.__pending = self.search(start, goal)
+
+    def resume(self, max_expansions: int = None) -> tuple:
+        """
+        :param max_expansions: Unused, the search started by begin is already over.
+        :return: The route found by the search started by begin.
+        """
+        return self.__pending
+
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Find a path between two cells, refined lazily as it is walked.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: A HierarchicalPath, or None if the goal cannot be reached.
+        """
+        route = self.search(start, goal)
+        return HierarchicalPath(self, route) if route else None
+
+    def refine(self, a: tuple[int, int], b: tuple[int, int]) -> tuple:
+        """
+        Get the grid cells between two consecutive waypoints of a route.
+        :param a: First waypoint (row, col).
+        :param b: Next waypoint (row, col).
+        :return: Tuple of (row, col) cells from a to b.
+        """
+        cluster = self.cluster_of(a)
+        if cluster != self.cluster_of(b):
+            return a, b  # transition between two neighbouring clusters
+        segments = self.__segments.setdefault(cluster, {})
+        segment = segments.get((a, b))
+        if segment is None:
+            parents = self._local_bfs(a, cluster, stop=b)
+            cells = [b]
+            while cells[-1] != a:
+                cells.append(parents[cells[-1]])
+            cells.reverse()
+            segment = segments[(a, b)] = tuple(cells)
+        return segment
+
+    def _route(self, came_from: dict, g_score: dict, goal: tuple[int, int]) -> tuple:
+        total = g_score[goal]
+        waypoints = [goal]
+        while waypoints[-1] in came_from:
+            waypoints.append(came_from[waypoints[-1]])
+        waypoints.reverse()
+        return tuple((cell, total - g_score[cell]) for cell in waypoints)
+
+    def _bounds(self, cluster: tuple[int, int]) -> tuple[int, int, int, int]:
+        """
+        Get the (top, left, bottom, right) cells of a cluster, bottom and right excluded.
+        """
+        size = self.__cluster_size
+        top, left = cluster[0] * size, cluster[1] * size
+        return top, left, min(top + size, self.__rows), min(left + size, self.__cols)
+
+    def _local_bfs(self, source: tuple[int, int], cluster: tuple[int, int], stop: tuple[int, int] = None) -> dict:
+        """
+        Breadth-first search restricted to one cluster.
+        :return: Dictionary mapping every reached cell to its parent (the source maps to None).
+        """
+        top, left, bottom, right = self._bounds(cluster)
+        grid = self.__grid
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == stop:
+                break
+            r, c = current
+            for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if top <= nr < bottom and left <= nc < right and not grid[nr][nc] and (nr, nc) not in parents:
+                    parents[(nr, nc)] = current
+                    queue.append((nr, nc))
+        return parents
+
+    def _local_distances(self, source: tuple[int, int], cluster: tuple[int, int]) -> dict:
+        """
+        Distances from a cell to every cell it can reach without leaving its cluster.
+        """
+        parents = self._local_bfs(source, cluster)
+        distances = {source: 0}
+        for cell in parents:  # parents are inserted in BFS order
+            if cell != source:
+                distances[cell] = distances[parents[cell]] + 1
+        return distances
+
+    def _border_transitions(self, cluster: tuple[int, int], neighbour: tuple[int, int]) -> list:
+        """
+        Place the transitions on the border between a cluster and its right or bottom neighbour.
+        """
+        top, left, bottom, right = self._bounds(cluster)
+        grid = self.__grid
+        if neighbour[1] > cluster[1]:  # vertical border, walk down the rows
+            pairs = [((r, right - 1), (r, right)) for r in range(top, bottom)]
+        else:  # horizontal border, walk along the columns
+            pairs = [((bottom - 1, c), (bottom, c)) for c in range(left, right)]
+
+        # Split the border in runs of cells that are free on both sides, each run is an entrance
+        runs = [[]]
+        for a, b in pairs:
+            if not grid[a[0]][a[1]] and not grid[b[0]][b[1]]:
+                runs[-1].append((a, b))
+            elif runs[-1]:
+                runs.append([])
+
+        transitions = []
+        for run in runs:
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+        return transitions
+
+    def _rebuild(self, clusters: set):
+        """
+        Rebuild the borders of the given clusters, then the intra-cluster edges of every cluster touching them.
+        """
+        borders = set()
+        for cr, cc in clusters:
+            for other in ((cr, cc - 1), (cr, cc + 1), (cr - 1, cc), (cr + 1, cc)):
+                if 0 <= other[0] < self.__cluster_rows and 0 <= other[1] < self.__cluster_cols:
+                    borders.add(min((cr, cc), other) + max((cr, cc), other))
+
+        touched = set(clusters)
+        for border in borders:
+            cluster, neighbour = border[:2], border[2:]
+            touched.update((cluster, neighbour))
+            for a, b in self.__borders.get((cluster, neighbour), ()):
+                self.__edges[a].pop(b, None)
+                self.__edges[b].pop(a, None)
+            transitions = self.__borders[(cluster, neighbour)] = self._border_transitions(cluster, neighbour)
+            for a, b in transitions:
+                self.__edges.setdefault(a, {})[b] = 1
+                self.__edges.setdefault(b, {})[a] = 1
+
+        for cluster in touched:
+            # Drop the intra-cluster edges of the previous build
+            old_entrances = self.__entrances.get(cluster, frozenset())
+            for node in old_entrances:
+                edges = self.__edges.get(node, {})
+                for other in old_entrances:
+                    edges.pop(other, None)
+            self.__segments.pop(cluster, None)
+
+            entrances = set()
+            cr, cc = cluster
+            for key in (((cr, cc - 1), cluster), (cluster, (cr, cc + 1)), ((cr - 1, cc), cluster), (cluster, (cr + 1, cc))):
+                for a, b in self.__borders.get(key, ()):
+                    entrances.add(a if self.cluster_of(a) == cluster else b)
+            self.__entrances[cluster] = frozenset(entrances)
+
+            for node in entrances:
+                distances = self._local_distances(node, cluster)
+                edges = self.__edges.setdefault(node, {})
+                for other in entrances:
+                    if other != node and other in distances:
+                        edges[other] = distances[other]
+
+            for node in old_entrances - entrances:
+                if not self.__edges.get(node):
+                    self.__edges.pop(node, None)
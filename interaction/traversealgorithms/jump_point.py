@@ -0,0 +1,259 @@
+import heapq
+from array import array
+
+import numpy as np
+
+
+class JumpPointSearch:
+    """
+    Jump Point Search adapted to 4-connected grids with uniform cost.
+    Instead of pushing every neighbour on the open list, the search jumps along straight lines and only stops on
+    cells where the optimal route may turn (forced neighbours) or on the goal. Horizontal jumps stop on forced
+    neighbours, vertical jumps also stop wherever a horizontal jump from the current cell finds a jump point.
+    Since the grid is static, jump results are precomputed per cell and direction, so each jump is O(1).
+    Returned paths have the same length as the ones of PathFinder.astar_pathfinding.
+    """
+    def __init__(self, collision_grid):
+        """
+        Constructor for JumpPointSearch class.
+        :param collision_grid: 2D list or array [row][col] of booleans: True if blocked.
+        """
+        blocked = np.asarray(collision_grid, dtype=bool)
+        self.__rows, self.__cols = blocked.shape
+        self.__width = self.__cols + 2
+        padded = np.pad(blocked, 1, constant_values=True)
+        size = padded.size
+
+        self.__blocked = bytearray(padded.tobytes())
+        self.__row_of = array('i', np.repeat(np.arange(-1, self.__rows + 1), self.__width).tolist())
+        self.__col_of = array('i', np.tile(np.arange(-1, self.__cols + 1), self.__rows + 2).tolist())
+
+        # Search buffers, valid only where stamp == generation
+        self.__g = array('i', [0]) * size
+        self.__parent = array('i', [-1]) * size
+        self.__stamp = array('I', [0]) * size
+        self.__closed = array('I', [0]) * size
+        self.__generation = 0
+        self.__size = size
+        self.__goal = 0  # index of the goal of the current search, see begin and resume
+        self.__open_set = []
+        self.__expansions = 0
+
+        # Jump tables per direction offset, see _build_jump_tables
+        self.__stop = {step: array('i', [-1]) * size for step in (1, -1, self.__width, -self.__width)}
+        self.__end = {step: array('i', [-1]) * size for step in (1, -1, self.__width, -self.__width)}
+        self._build_jump_tables()
+
+    @property
+    def expansions(self) -> int:
+        """
+        Get the number of jump points expanded by the current (or last) search.
+        """
+        return self.__expansions
+
+    def index(self, cell: tuple[int, int]) -> int:
+        return (cell[0] + 1) * self.__width + cell[1] + 1
+
+    def is_free(self, cell: tuple[int, int]) -> bool:
+        r, c = cell
+        return 0 <= r < self.__rows and 0 <= c < self.__cols and not self.__blocked[self.index(cell)]
+
+    def search(self, start: tuple[int, int], goal: tuple[int, int]) -> tuple:
+        """
+        Finds the shortest path from start to goal.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: Tuple of (row, col) cells from start to goal, empty if there is no path.
+        """
+        self.begin(start, goal)
+        return self.resume()
+
+    def begin(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Start an incremental search, to be continued with resume. Starting a new search abandons the previous one.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        """
+        self.__expansions = 0
+        self.__open_set = []
+        if not self.is_free(start) or not self.is_free(goal):
+            return
+
+        self.__generation += 1
+        start_index = self.index(start)
+        self.__goal = self.index(goal)
+        self.__g[start_index] = 0
+        self.__parent[start_index] = -1
+        self.__stamp[start_index] = self.__generation
+        span = self.__size + 1
+        start_h = abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+        self.__open_set = [(start_h * span + span - 1) * self.__size + start_index]
+
+    def resume(self, max_expansions: int = None):
+        """
+        Continue the current search.
+        :param max_expansions: Maximum number of jump points to expand before giving up for now, None for no limit.
+        :return: The path as in search once the search is over, or None if the budget ran out first.
+        """
+        generation = self.__generation
+        g, parent, stamp, closed = self.__g, self.__parent, self.__stamp, self.__closed
+        row_of, col_of = self.__row_of, self.__col_of
+        size = self.__size
+        span = size + 1
+        open_set = self.__open_set
+        goal_index = self.__goal
+        goal_r, goal_c = row_of[goal_index], col_of[goal_index]
+        expansions = self.__expansions
+        limit = expansions + max_expansions if max_expansions is not None else -1
+
+        while open_set:
+            if expansions == limit:
+                self.__expansions = expansions
+                return None
+            current = heapq.heappop(open_set) % size
+            if closed[current] == generation:
+                continue  # stale heap entry
+            closed[current] = generation
+            expansions += 1
+            if current == goal_index:
+                self.__expansions = expansions
+                open_set.clear()
+                return self._reconstruct(current)
+
+            current_r, current_c = row_of[current], col_of[current]
+            for step in self._pruned_directions(current, parent[current]):
+                jump_point = self._jump(current + step, step)
+                if jump_point == -1:
+                    continue
+                tentative_g = g[current] + abs(row_of[jump_point] - current_r) + abs(col_of[jump_point] - current_c)
+                if stamp[jump_point] != generation or tentative_g < g[jump_point]:
+                    stamp[jump_point] = generation
+                    g[jump_point] = tentative_g
+                    parent[jump_point] = current
+                    h = abs(row_of[jump_point] - goal_r) + abs(col_of[jump_point] - goal_c)
+                    heapq.heappush(open_set, ((tentative_g + h) * span + span - 1 - tentative_g) * size + jump_point)
+
+        self.__expansions = expansions
+        return ()  # no path found
+
+    def _pruned_directions(self, index: int, parent: int) -> list[int]:
+        """
+        Directions worth exploring from a jump point, given the direction we arrived from.
+        """
+        blocked, width = self.__blocked, self.__width
+        if parent == -1:
+            return [step for step in (width, -width, 1, -1) if not blocked[index + step]]
+        delta = index - parent
+        if -width < delta < width:
+            # Arrived horizontally: keep going, or turn up/down
+            forward = 1 if delta > 0 else -1
+            candidates = (forward, width, -width)
+        else:
+            # Arrived vertically: keep going, or turn left/right
+            forward = width if delta > 0 else -width
+            candidates = (forward, 1, -1)
+        return [step for step in candidates if not blocked[index + step]]
+
+    def _build_jump_tables(self):
+        """
+        Precompute, for every cell and direction, where a jump would stop if the goal were not on the way
+        (the first forced neighbour, -1 if the walk hits an obstacle) and the last free cell before the obstacle.
+        Jumps then cost O(1): the goal is handled separately at query time.
+        """
+        blocked, width = self.__blocked, self.__width
+        rows, cols = self.__rows, self.__cols
+
+        def forced_horizontal(index, step):
+            return (not blocked[index - width] and blocked[index - step - width]) or \
+                (not blocked[index + width] and blocked[index - step + width])
+
+        def forced_vertical(index, step):
+            return (not blocked[index - 1] and blocked[index - step - 1]) or \
+                (not blocked[index + 1] and blocked[index - step + 1])
+
+        for step in (1, -1):
+            stops, ends = self.__stop[step], self.__end[step]
+            columns = range(cols, 0, -1) if step == 1 else range(1, cols + 1)
+            for r in range(1, rows + 1):
+                stop = end = -1
+                for c in columns:
+                    index = r * width + c
+                    if blocked[index]:
+                        stop = end = -1
+                        continue
+                    if end == -1:
+                        end = index
+                    if forced_horizontal(index, step):
+                        stop = index
+                    stops[index], ends[index] = stop, end
+
+        # A vertical walk stops where a horizontal jump from a side cell finds a jump point
+        stop_right, stop_left = self.__stop[1], self.__stop[-1]
+        horizontal_exit = [stop_right[i + 1] != -1 or stop_left[i - 1] != -1 for i in range(self.__size - 1)] + [False]
+
+        for step in (width, -width):
+            stops, ends = self.__stop[step], self.__end[step]
+            row_range = range(rows, 0, -1) if step > 0 else range(1, rows + 1)
+            for c in range(1, cols + 1):
+                stop = end = -1
+                for r in row_range:
+                    index = r * width + c
+                    if blocked[index]:
+                        stop = end = -1
+                        continue
+                    if end == -1:
+                        end = index
+                    if forced_vertical(index, step) or horizontal_exit[index]:
+                        stop = index
+                    stops[index], ends[index] = stop, end
+
+    def _jump(self, index: int, step: int) -> int:
+        """
+        Walk from index in the given direction until a jump point is found.
+        :param index: First cell of the walk.
+        :param step: Flat offset of the direction (+-1 horizontally, +-width vertically).
+        :return: The index of the jump point, or -1 if the walk hits an obstacle.
+        """
+        if self.__blocked[index]:
+            return -1
+        stop = self.__stop[step][index]
+        limit = stop if stop != -1 else self.__end[step][index]
+        row_of, col_of = self.__row_of, self.__col_of
+        goal = self.__goal
+        goal_r, goal_c = row_of[goal], col_of[goal]
+
+        if step == 1 or step == -1:
+            # The goal is a jump point if the walk reaches it before stopping
+            if row_of[index] == goal_r and \
+                    min(col_of[index], col_of[limit]) <= goal_c <= max(col_of[index], col_of[limit]):
+                return goal
+            return stop
+
+        # Moving vertically: the walk also stops on the goal row if a horizontal jump from there reaches the goal
+        if min(row_of[index], row_of[limit]) <= goal_r <= max(row_of[index], row_of[limit]):
+            crossing = index + (goal_r - row_of[index]) * self.__width
+            if col_of[self.__end[-1][crossing]] <= goal_c <= col_of[self.__end[1][crossing]]:
+                return crossing
+        return stop
+
+    def _reconstruct(self, current: int) -> tuple:
+        """
+        Rebuild the full path by filling the straight segments between consecutive jump points.
+        """
+        parent, row_of, col_of = self.__parent, self.__row_of, self.__col_of
+        jump_points = []
+        while current != -1:
+            jump_points.append(current)
+            current = parent[current]
+        jump_points.reverse()
+
+        path = [(row_of[jump_points[0]], col_of[jump_points[0]])]
+        for a, b in zip(jump_points, jump_points[1:]):
+            delta = b - a
+            step = (1 if delta > 0 else -1) if -self.__width < delta < self.__width else \
+                (self.__width if delta > 0 else -self.__width)
+            index = a
+            while index != b:
+                index += step
+                path.append((row_of[index], col_of[index]))
+        return tuple(path)
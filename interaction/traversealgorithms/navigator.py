@@ -0,0 +1,137 @@
+from interaction.traversealgorithms.flowfield import FlowFieldSet
+from interaction.traversealgorithms.grid_astar import GridAStar
+from interaction.traversealgorithms.hierarchical import HierarchicalPath, HierarchicalPathfinder
+from interaction.traversealgorithms.jump_point import JumpPointSearch
+from interaction.traversealgorithms.path_cache import GridPath, PathCache
+
+
+SEARCH_ALGORITHMS = {
+    "astar": GridAStar,
+    "jps": JumpPointSearch,
+    "hpa": HierarchicalPathfinder,
+}
+
+
+class Navigator:
+    """
+    Single entry point used by the agents to get a path on the collision grid.
+    Paths are memoised in a PathCache, since agents walk the same routes every day.
+    When flow fields are given, goals that belong to a fixed destination are routed through them instead of a search.
+    With the hierarchical search, the cache holds the abstract routes and the cells are refined as agents walk.
+    """
+    def __init__(self, collision_grid, cache_size: int = 4096, flow_fields: FlowFieldSet = None,
+                 algorithm: str = "astar", cluster_size: int = 10):
+        """
+        Constructor for Navigator class.
+        :param collision_grid: 2D list or array [row][col] of booleans: True if blocked (lists for the hierarchical
+        search, which reads it cell by cell).
+        :param cache_size: Capacity of the path cache, 0 disables caching.
+        :param flow_fields: Optional precomputed flow fields of the fixed destinations.
+        :param algorithm: Search used for the other goals, one of SEARCH_ALGORITHMS.
+        :param cluster_size: Size of the clusters of the hierarchical search, in cells.
+        """
+        if algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm '{algorithm}', expected one of {list(SEARCH_ALGORITHMS)}.")
+        self.__collision_grid = collision_grid
+        self.__algorithm = algorithm
+        self.__cluster_size = cluster_size
+        self.__search = self._build_search()
+        self.__query = None
+        self.__cache = PathCache(cache_size) if cache_size else None
+        self.__flow_fields = flow_fields
+
+    @property
+    def collision_grid(self):
+        return self.__collision_grid
+
+    @property
+    def algorithm(self) -> str:
+        return self.__algorithm
+
+    @property
+    def cache(self) -> PathCache:
+        return self.__cache
+
+    @property
+    def flow_fields(self) -> FlowFieldSet:
+        return self.__flow_fields
+
+    @property
+    def expansions(self) -> int:
+        """
+        Get the number of nodes expanded so far by the current (or last) search.
+        """
+        return self.__search.expansions
+
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Find the shortest path between two cells.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: A path positioned after the starting cell, or None if the goal cannot be reached.
+        """
+        found, path = self.lookup(start, goal)
+        if found:
+            return path
+        self.begin_search(start, goal)
+        return self.resume_search()[1]
+
+    def lookup(self, start: tuple[int, int], goal: tuple[int, int]) -> tuple:
+        """
+        Try to answer a query without searching, from the flow fields or the path cache.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: (True, path or None) if the query was answered, (False, None) if it needs a search.
+        """
+        if self.__flow_fields is not None and self.__flow_fields.field_for(goal) is not None:
+            return True, self.__flow_fields.find_path(start, goal)
+        cells = self.__cache.get(start, goal) if self.__cache is not None else None
+        if cells is None:
+            return False, None
+        return True, self._wrap(cells)
+
+    def begin_search(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Start an incremental search, abandoning the current one if any.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        """
+        self.__query = (start, goal)
+        self.__search.begin(start, goal)
+
+    def resume_search(self, max_expansions: int = None) -> tuple:
+        """
+        Continue the search started by begin_search. Its result is cached once it is over.
+        :param max_expansions: Maximum number of nodes to expand during this call, None for no limit.
+        :return: (True, path or None) once the search is over, (False, None) if the budget ran out first.
+        """
+        cells = self.__search.resume(max_expansions)
+        if cells is None:
+            return False, None
+        if self.__cache is not None:
+            self.__cache.put(*self.__query, cells)
+        return True, self._wrap(cells)
+
+    def invalidate(self, cells=None):
+        """
+        Must be called after the collision grid has been modified.
+        :param cells: The modified (row, col) cells if known: the hierarchical search then only rebuilds their clusters.
+        """
+        if self.__algorithm == "hpa" and cells is not None:
+            self.__search.update(cells)
+        else:
+            self.__search = self._build_search()
+        if self.__cache is not None:
+            self.__cache.invalidate()
+
+    def _build_search(self):
+        if self.__algorithm == "hpa":
+            return HierarchicalPathfinder(self.__collision_grid, self.__cluster_size)
+        return SEARCH_ALGORITHMS[self.__algorithm](self.__collision_grid)
+
+    def _wrap(self, cells: tuple):
+        if not cells:
+            return None
+        if self.__algorithm == "hpa":
+            return HierarchicalPath(self.__search, cells)
+        return GridPath(cells)
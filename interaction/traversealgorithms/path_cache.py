@@ -0,0 +1,112 @@
+from collections import OrderedDict
+
+
+class GridPath:
+    """
+    Read-only path consumed through a cursor.
+    The cells are stored in an immutable tuple that can be shared between agents and the path cache,
+    so handing the same route to many agents never copies it.
+    """
+    __slots__ = ("__cells", "__cursor")
+
+    def __init__(self, cells: tuple, cursor: int = 1):
+        """
+        Constructor for GridPath class.
+        :param cells: Tuple of (row, col) cells from start to goal.
+        :param cursor: Index of the next cell to visit (1 skips the starting cell).
+        """
+        self.__cells = cells
+        self.__cursor = cursor
+
+    @property
+    def cells(self) -> tuple:
+        return self.__cells
+
+    def next_cell(self) -> tuple[int, int]:
+        """
+        Consume the next cell of the path.
+        :return: The (row, col) cell.
+        """
+        cell = self.__cells[self.__cursor]
+        self.__cursor += 1
+        return cell
+
+    def __len__(self):
+        return len(self.__cells) - self.__cursor
+
+    def __bool__(self):
+        return self.__cursor < len(self.__cells)
+
+
+class PathCache:
+    """
+    Bounded LRU cache of paths keyed by (collision grid version, start, goal).
+    Unreachable goals are cached too, as an empty tuple.
+    """
+    def __init__(self, capacity: int = 4096):
+        """
+        Constructor for PathCache class.
+        :param capacity: Maximum number of paths kept in memory.
+        """
+        if capacity <= 0:
+            raise ValueError("Cache capacity must be positive.")
+        self.__capacity = capacity
+        self.__entries = OrderedDict()
+        self.__grid_version = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def grid_version(self) -> int:
+        return self.__grid_version
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Look up a path.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: The cached tuple of cells (empty if unreachable), or None on a miss.
+        """
+        key = (self.__grid_version, start, goal)
+        cells = self.__entries.get(key)
+        if cells is None:
+            self.__misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return cells
+
+    def put(self, start: tuple[int, int], goal: tuple[int, int], cells: tuple):
+        """
+        Store a path, evicting the least recently used one when the cache is full.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :param cells: Tuple of cells from start to goal, empty if the goal is unreachable.
+        """
+        key = (self.__grid_version, start, goal)
+        self.__entries[key] = cells
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+
+    def invalidate(self):
+        """
+        Called when the collision grid changes: paths computed on the previous grid can no longer be returned.
+        """
+        self.__grid_version += 1
+        self.__entries.clear()
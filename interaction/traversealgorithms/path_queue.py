@@ -0,0 +1,153 @@
+from collections import deque
+from typing import TYPE_CHECKING
+
+from interaction.traversealgorithms.navigator import Navigator
+
+if TYPE_CHECKING:
+    from interaction.recording.tick_profiler import TickProfiler
+
+
+class PathRequest:
+    """
+    Ticket returned by PathRequestQueue.request, resolved once the path is known.
+    """
+    __slots__ = ("__start", "__goal", "__path", "__done", "__cancelled")
+
+    def __init__(self, start: tuple[int, int], goal: tuple[int, int]):
+        self.__start = start
+        self.__goal = goal
+        self.__path = None
+        self.__done = False
+        self.__cancelled = False
+
+    @property
+    def start(self) -> tuple[int, int]:
+        return self.__start
+
+    @property
+    def goal(self) -> tuple[int, int]:
+        return self.__goal
+
+    @property
+    def done(self) -> bool:
+        return self.__done
+
+    @property
+    def path(self):
+        """
+        Get the path, None while the request is pending or if the goal cannot be reached.
+        """
+        return self.__path
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__cancelled
+
+    def resolve(self, path):
+        self.__path = path
+        self.__done = True
+
+    def cancel(self):
+        """
+        Give up the request (e.g. the agent changed its plans): the queue drops it without searching.
+        """
+        self.__cancelled = True
+        self.resolve(None)
+
+
+class PathRequestQueue:
+    """
+    FIFO queue of path requests processed with a budget of node expansions per tick.
+    Queries answered by the flow fields or the path cache are resolved at once; the others are searched one at a time,
+    and a search that runs out of budget is resumed on the next tick, so the cost of a tick stays bounded however many
+    agents start moving together. The agents follow a path searched after their act from their next act on, so a
+    search that fits in the budget of its tick costs them no time.
+    """
+    def __init__(self, navigator: Navigator, expansion_budget: int = 0, profiler: "TickProfiler" = None):
+        """
+        Constructor for PathRequestQueue class.
+        :param navigator: Navigator used to answer the requests.
+        :param expansion_budget: Maximum number of nodes expanded per tick, 0 resolves every request immediately.
+        :param profiler: Optional tick profiler, the requests are charged to its pathfinding phase.
+        """
+        if expansion_budget < 0:
+            raise ValueError("Expansion budget cannot be negative.")
+        self.__navigator = navigator
+        self.__profiler = profiler
+        self.__budget = expansion_budget
+        self.__pending = deque()
+        self.__searching = False
+        self.__expansions = 0
+
+    @property
+    def navigator(self) -> Navigator:
+        return self.__navigator
+
+    @property
+    def expansion_budget(self) -> int:
+        return self.__budget
+
+    @property
+    def pending(self) -> int:
+        return len(self.__pending)
+
+    @property
+    def expansions(self) -> int:
+        """
+        Get the number of nodes expanded by the last call to process.
+        """
+        return self.__expansions
+
+    def request(self, start: tuple[int, int], goal: tuple[int, int]) -> PathRequest:
+        """
+        Ask for a path.
+        :param start: Starting cell (row, col).
+        :param goal: Goal cell (row, col).
+        :return: A PathRequest, already done if the query did not need a search (or if there is no budget).
+        """
+        if self.__profiler is not None:
+            phase = self.__profiler.switch("pathfinding")
+            ticket = self._request(start, goal)
+            self.__profiler.switch(phase)
+            return ticket
+        return self._request(start, goal)
+
+    def _request(self, start: tuple[int, int], goal: tuple[int, int]) -> PathRequest:
+        ticket = PathRequest(start, goal)
+        if not self.__budget:
+            ticket.resolve(self.__navigator.find_path(start, goal))
+            return ticket
+        found, path = self.__navigator.lookup(start, goal)
+        if found:
+            ticket.resolve(path)
+            return ticket
+        self.__pending.append(ticket)
+        return ticket
+
+    def process(self):
+        """
+        Spend the budget of one tick on the pending requests, oldest first.
+        """
+        navigator = self.__navigator
+        budget = self.__budget
+        while self.__pending and budget > 0:
+            ticket = self.__pending[0]
+            if ticket.cancelled:
+                self.__pending.popleft()
+                self.__searching = False
+                continue
+            if self.__searching:
+                before = navigator.expansions
+            else:
+                navigator.begin_search(ticket.start, ticket.goal)
+                self.__searching = True
+                before = 0
+            finished, path = navigator.resume_search(budget)
+            budget -= navigator.expansions - before
+            if not finished:
+                break
+
+            self.__pending.popleft()
+            self.__searching = False
+            ticket.resolve(path)
+        self.__expansions = self.__budget - budget
@@ -1,18 +1,29 @@
-import random
+from interaction.sampler import Sampler
 
 
-def random_subtile_in_rectangle(rect_placeable, map_density):
+def random_subtile_in_rectangle(rect_placeable, map_density, sampler: Sampler):
     """
     Generate a random subtile inside a rectangle based on a map density parameter.
     :param rect_placeable: Properties of the rectangle.
     :param map_density: Density of the standard tile.
+    :param sampler: The sampler to draw from.
     :return: A tuple that represents the random subtile.
     """
     sub_left = int(rect_placeable.x * map_density)
     sub_top = int(rect_placeable.y * map_density)
     sub_w = int(rect_placeable.width * map_density)
     sub_h = int(rect_placeable.height * map_density)
+    return random_subtile((sub_left, sub_top, sub_w, sub_h), sampler)
 
-    gx = random.randint(sub_left, sub_left + sub_w - 1)
-    gy = random.randint(sub_top, sub_top + sub_h - 1)
-    return gx, gy
\ No newline at end of file
+
+def random_subtile(subtile_rect, sampler: Sampler):
+    """
+    Generate a random subtile inside a rectangle already expressed in subtiles.
+    :param subtile_rect: (left, top, width, height) in subtiles, e.g. Scene.hotspot(...).
+    :param sampler: The sampler to draw from.
+    :return: A tuple that represents the random subtile.
+    """
+    sub_left, sub_top, sub_w, sub_h = subtile_rect
+    gx = sampler.integers(sub_left, sub_left + sub_w)
+    gy = sampler.integers(sub_top, sub_top + sub_h)
+    return gx, gy
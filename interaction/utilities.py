@@ -47,6 +47,12 @@ vaccine_protection_probabilities = {
     "pfizer/moderna": 0.88
 }
 
+# Scale factor k between the load inhaled during a tick and the chance of infection, 1 - exp(-k * load)
+infection_scale_factors = {
+    "student": 0.000014,
+    "teacher": 0.00014
+}
+
 status_color = {
     PandemicStatus.SUSCEPTIBLE: WHITE,
     PandemicStatus.INFECTED: RED,
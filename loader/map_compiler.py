@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import yaml
+
+from engine.placeable import Placeable
+from interaction.traversealgorithms.collisiongrid import build_collision_array
+from loader.scene_loader import Scene, index_placeables, placeables_from_data
+
+
+COMPILER_VERSION = 3
+
+
+class CompiledMap:
+    """
+    Everything the simulation needs from a map file, precomputed for one set of density parameters:
+      - the placeables (for rendering),
+      - the collision grid, stored as a packed bitmap,
+      - the indices of the placeables of each type,
+      - the chair cells in chair order and the sub-tile rectangles of the hotspots.
+    """
+    def __init__(self, key: str, placeables: list[Placeable], collision_bits: np.ndarray, grid_width: int,
+                 by_type: dict[str, list[int]], chairs: np.ndarray, hotspots: dict[str, tuple[int, int, int, int]],
+                 map_density: int):
+        """
+        Constructor for CompiledMap class.
+        :param key: Hash of the map file and of the density parameters.
+        :param placeables: List of placeables.
+        :param collision_bits: Collision grid packed along the columns (numpy.packbits on axis 1).
+        :param grid_width: Number of columns of the collision grid.
+        :param by_type: Dictionary type -> indices of the placeables of that type.
+        :param chairs: Array [chair_index] -> (col, row) sub-tile of the chair.
+        :param hotspots: Dictionary type -> (left, top, width, height) in sub-tiles.
+        :param map_density: The density of the standard tile used to compile the map.
+        """
+        self.__key = key
+        self.__placeables = placeables
+        self.__collision_bits = collision_bits
+        self.__grid_width = grid_width
+        self.__by_type = by_type
+        self.__chairs = chairs
+        self.__hotspots = hotspots
+        self.__map_density = map_density
+        self.__collision_grid = None
+        self.__scene = None
+
+    @property
+    def key(self) -> str:
+        return self.__key
+
+    @property
+    def placeables(self) -> list[Placeable]:
+        return self.__placeables
+
+    @property
+    def collision_bits(self) -> np.ndarray:
+        return self.__collision_bits
+
+    @property
+    def grid_shape(self) -> tuple[int, int]:
+        return self.__collision_bits.shape[0], self.__grid_width
+
+    @property
+    def by_type(self) -> dict[str, list[int]]:
+        return self.__by_type
+
+    @property
+    def chairs(self) -> np.ndarray:
+        return self.__chairs
+
+    @property
+    def hotspots(self) -> dict[str, tuple[int, int, int, int]]:
+        return self.__hotspots
+
+    @property
+    def map_density(self) -> int:
+        return self.__map_density
+
+    @property
+    def scene(self) -> Scene:
+        """
+        Get the placeables as a Scene, reusing the compiled indices.
+        """
+        if self.__scene is None:
+            self.__scene = Scene(self.__placeables, self.__map_density, self.__by_type, self.__chairs, self.__hotspots)
+        return self.__scene
+
+    @property
+    def collision_grid(self) -> np.ndarray:
+        """
+        Get the collision grid, unpacked on first use. The consumers that read it cell by cell in python loops convert
+        it to lists themselves.
+        :return: 2D boolean array [row][col]: True if blocked.
+        """
+        if self.__collision_grid is None:
+            unpacked = np.unpackbits(self.__collision_bits, axis=1, count=self.__grid_width)
+            self.__collision_grid = unpacked.view(bool)
+        return self.__collision_grid
+
+
+def map_cache_key(map_bytes: bytes, width: int, height: int, tile_size: int, map_density: int) -> str:
+    """
+    Hash a map file together with the parameters used to rasterise it.
+    :param map_bytes: Raw content of the map file.
+    :param width: Width of the simulated area in pixels.
+    :param height: Height of the simulated area in pixels.
+    :param tile_size: Tile size of each tile.
+    :param map_density: The density of the standard tile.
+    :return: A hexadecimal key.
+    """
+    digest = hashlib.sha256(map_bytes)
+    digest.update(f"|v{COMPILER_VERSION}|{width}x{height}|{tile_size}|{map_density}".encode())
+    return digest.hexdigest()[:32]
+
+
+def compile_map(map_file, width, height, tile_size, map_density, cache_dir=None) -> CompiledMap:
+    """
+    Load a map file as a CompiledMap. When a cache directory is given, the compiled artefact is reused if the map
+    file and the density parameters did not change, otherwise it is built and stored for the next start.
+    :param map_file: Path to the yaml configuration file.
+    :param width: Width of the simulated area in pixels.
+    :param height: Height of the simulated area in pixels.
+    :param tile_size: Tile size of each tile.
+    :param map_density: The density of the standard tile.
+    :param cache_dir: Directory of the compiled maps, or None to always compile in memory.
+    :return: The compiled map.
+    """
+    with open(map_file, 'rb') as file:
+        map_bytes = file.read()
+    key = map_cache_key(map_bytes, width, height, tile_size, map_density)
+
+    if cache_dir:
+        artefact_dir = os.path.join(cache_dir, key)
+        if os.path.isdir(artefact_dir):
+            return _load_artefact(key, artefact_dir)
+
+    objects = yaml.safe_load(map_bytes)['placeables']
+    compiled = _compile(key, objects, width, height, tile_size, map_density)
+
+    if cache_dir:
+        _store_artefact(compiled, objects, cache_dir)
+    return compiled
+
+
+def _compile(key, objects, width, height, tile_size, map_density) -> CompiledMap:
+    placeables = placeables_from_data(objects)
+    grid = build_collision_array(placeables, width=width, height=height, tile_size=tile_size, map_density=map_density)
+
+    by_type, chairs, hotspots = index_placeables(placeables, map_density)
+    return CompiledMap(key, placeables, np.packbits(grid, axis=1), grid.shape[1], by_type, chairs, hotspots,
+                       map_density)
+
+
+def _store_artefact(compiled: CompiledMap, objects: list, cache_dir: str):
+    """
+    Write the artefact in a temporary directory, then move it in place so concurrent workers never see it half written.
+    """
+    tmp_dir = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{compiled.key}-", dir=cache_dir)
+        np.save(os.path.join(tmp_dir, "collision.npy"), compiled.collision_bits)
+        np.save(os.path.join(tmp_dir, "chairs.npy"), compiled.chairs)
+        meta = {
+            "version": COMPILER_VERSION,
+            "grid_width": compiled.grid_shape[1],
+            "map_density": compiled.map_density,
+            "placeables": objects,
+            "by_type": compiled.by_type,
+            "hotspots": compiled.hotspots,
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), 'w') as file:
+            json.dump(meta, file)
+        os.rename(tmp_dir, os.path.join(cache_dir, compiled.key))
+    except OSError:
+        # Another process stored the same artefact first (or the cache is not writable): keep the in-memory map
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _load_artefact(key: str, artefact_dir: str) -> CompiledMap:
+    with open(os.path.join(artefact_dir, "meta.json"), 'r') as file:
+        meta = json.load(file)
+    collision_bits = np.load(os.path.join(artefact_dir, "collision.npy"), mmap_mode='r')
+    chairs = np.load(os.path.join(artefact_dir, "chairs.npy"), mmap_mode='r')
+    hotspots = {name: tuple(rect) for name, rect in meta["hotspots"].items()}
+    return CompiledMap(key, placeables_from_data(meta["placeables"]), collision_bits, meta["grid_width"],
+                       meta["by_type"], chairs, hotspots, meta["map_density"])
@@ -1,14 +1,131 @@
+import numpy as np
 import yaml
 
 from engine.placeable import *
 
 
-def load_scene_from_yaml(file_path):
-    with open(file_path, 'r') as file:
-        data = yaml.safe_load(file)
+HOTSPOT_TYPES = ("Entrance", "BackHotspot", "FrontHotspot")
+
+
+class Scene:
+    """
+    The placeables of a map, indexed for the agents' decisions:
+      - the indices of the placeables of each type,
+      - the chair sub-tiles in chair order,
+      - the sub-tile rectangles of the hotspots at the active map density.
+    A Scene iterates like the list of placeables it wraps.
+    """
+    def __init__(self, placeables: list[Placeable], map_density: int, by_type: dict[str, list[int]] = None,
+                 chairs: np.ndarray = None, hotspots: dict[str, tuple[int, int, int, int]] = None):
+        """
+        Constructor for Scene class. The indices are computed from the placeables unless they are given.
+        :param placeables: List of placeables.
+        :param map_density: The density of the standard tile.
+        :param by_type: Dictionary type -> indices of the placeables of that type.
+        :param chairs: Array [chair_index] -> (col, row) sub-tile of the chair.
+        :param hotspots: Dictionary type -> (left, top, width, height) in sub-tiles.
+        """
+        if by_type is None or chairs is None or hotspots is None:
+            by_type, chairs, hotspots = index_placeables(placeables, map_density)
+        self.__placeables = placeables
+        self.__map_density = map_density
+        self.__by_type = by_type
+        self.__chairs = chairs
+        self.__chair_cells = [(int(col), int(row)) for col, row in chairs]
+        self.__hotspots = hotspots
+
+    def __iter__(self):
+        return iter(self.__placeables)
+
+    def __len__(self):
+        return len(self.__placeables)
+
+    def __getitem__(self, index):
+        return self.__placeables[index]
+
+    @property
+    def placeables(self) -> list[Placeable]:
+        return self.__placeables
+
+    @property
+    def map_density(self) -> int:
+        return self.__map_density
+
+    @property
+    def by_type(self) -> dict[str, list[int]]:
+        return self.__by_type
+
+    @property
+    def chairs(self) -> np.ndarray:
+        return self.__chairs
+
+    @property
+    def hotspots(self) -> dict[str, tuple[int, int, int, int]]:
+        return self.__hotspots
+
+    def first(self, _type: str):
+        """
+        Get the first placeable of a type.
+        :param _type: Type of the placeable represented as string.
+        :return: The placeable, or None if the map has none.
+        """
+        indices = self.__by_type.get(_type)
+        return self.__placeables[indices[0]] if indices else None
+
+    def of_type(self, _type: str) -> list[Placeable]:
+        return [self.__placeables[i] for i in self.__by_type.get(_type, [])]
 
+    def chair(self, index: int):
+        """
+        Get the chair with the given index, None if there is no such chair.
+        """
+        indices = self.__by_type.get("Chair", [])
+        return self.__placeables[indices[index]] if 0 <= index < len(indices) else None
+
+    def chair_cell(self, index: int):
+        """
+        Get the sub-tile (col, row) of the chair with the given index, None if there is no such chair.
+        """
+        return self.__chair_cells[index] if 0 <= index < len(self.__chair_cells) else None
+
+    def hotspot(self, _type: str):
+        """
+        Get the sub-tile rectangle (left, top, width, height) of a hotspot, None if the map has none.
+        """
+        return self.__hotspots.get(_type)
+
+
+def index_placeables(placeables: list[Placeable], map_density: int) -> tuple:
+    """
+    Compute the indices of a Scene.
+    :param placeables: List of placeables.
+    :param map_density: The density of the standard tile.
+    :return: (by_type, chairs, hotspots) as expected by Scene.
+    """
+    by_type = {}
+    for index, p in enumerate(placeables):
+        by_type.setdefault(p.name, []).append(index)
+
+    chairs = np.asarray([(int(placeables[i].x * map_density), int(placeables[i].y * map_density))
+                         for i in by_type.get("Chair", [])], dtype=np.int32).reshape(-1, 2)
+
+    hotspots = {}
+    for name in HOTSPOT_TYPES:
+        if name in by_type:
+            rect = placeables[by_type[name][0]]
+            hotspots[name] = (int(rect.x * map_density), int(rect.y * map_density),
+                              int(rect.width * map_density), int(rect.height * map_density))
+    return by_type, chairs, hotspots
+
+
+def placeables_from_data(objects):
+    """
+    Build the placeables described by the 'placeables' section of a map file.
+    :param objects: List of dictionaries, one per placeable.
+    :return: List of placeables.
+    """
     placeables = []
-    for obj in data['placeables']:
+    for obj in objects:
         obj_type = obj['type']
         collision = obj['collision'] if 'collision' in obj else False
         color = tuple(obj['color'])
@@ -23,3 +140,16 @@ def load_scene_from_yaml(file_path):
             placeables.append(Circle(obj_type, x, y, color, collision))
 
     return placeables
+
+
+def load_scene_from_yaml(file_path, map_density=1) -> Scene:
+    """
+    Load the placeables of a map file.
+    :param file_path: Path to the yaml configuration file.
+    :param map_density: The density of the standard tile, used for the sub-tile indices.
+    :return: The Scene (iterable as the list of placeables).
+    """
+    with open(file_path, 'r') as file:
+        data = yaml.safe_load(file)
+
+    return Scene(placeables_from_data(data['placeables']), map_density)
@@ -1,5 +1,12 @@
+import glob
+import os
 import re
 
+from interaction.recording.event_log import EventCode, load_events
+
+# The logs of run.sh are stored next to the scripts
+LOG_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Regex Patterns
 RE_BECAME_INFECTED = re.compile(
     r"\[PSM\] Agent\s+(-?\d+)\s+became infected at (\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2}).*"
@@ -19,9 +26,16 @@ def parse_log_file_for_infections(log_path):
                 infected_agents.add(agent_id)
     return infected_agents
 
+def parse_event_file_for_infections(event_path):
+    """
+    Returns a set of agent IDs that 'became infected' in this run, from an event file.
+    """
+    log = load_events(event_path)
+    return set(log.agent[log.of(EventCode.INFECTED)].tolist())
+
 def compute_infection_rates(log_files, universal_ids=None):
     """
-    :param log_files: list of log file paths
+    :param log_files: list of log file paths (text logs, or .npz event files)
     :param universal_ids: optional set of agent IDs if you want to track them all,
                           even if never infected => 0%
     :return: dict agent_id -> fraction of runs infected
@@ -30,7 +44,7 @@ def compute_infection_rates(log_files, universal_ids=None):
     discovered_agents = set()
 
     for lf in log_files:
-        inf_set = parse_log_file_for_infections(lf)
+        inf_set = parse_event_file_for_infections(lf) if lf.endswith(".npz") else parse_log_file_for_infections(lf)
         all_infected_sets.append(inf_set)
         discovered_agents |= inf_set
 
@@ -53,7 +67,10 @@ def compute_infection_rates(log_files, universal_ids=None):
 
 
 if __name__ == "__main__":
-    logs = [f"log{i}.txt" for i in range(1, 61)]
+    # Run from the repository root: python -m log_processing.agent_simulation
+    # Prefer the typed event files of the runs, when they were recorded
+    logs = sorted(glob.glob(os.path.join(LOG_DIR, "events*.npz"))) or \
+        [os.path.join(LOG_DIR, f"log{i}.txt") for i in range(1, 61)]
     # If you want a known set: universal_ids = set(range(-1, 24))
     # else just let the script discover them.
     universal_agent_ids = {-1, 0, 3, 5, 8, 10, 14, 15, 17, 20, 23}
@@ -1,8 +1,15 @@
+import glob
+import os
 import re
 from collections import defaultdict, OrderedDict
 from datetime import datetime, timedelta, date
 
-import matplotlib.pyplot as plt
+import numpy as np
+
+from interaction.recording.event_log import EventCode, load_events
+
+# The logs of run.sh are stored next to the scripts
+LOG_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # -----------------------------------------------------------------
 # REGEX PATTERNS (adjust if your logs differ)
@@ -18,6 +25,12 @@ INFECTED_EVENT = "INFECTED"
 QUARANTINED_EVENT = "QUARANTINED"
 RECOVERED_EVENT = "RECOVERED"
 
+EVENT_TYPES = {
+    EventCode.INFECTED: INFECTED_EVENT,
+    EventCode.QUARANTINED: QUARANTINED_EVENT,
+    EventCode.RECOVERED: RECOVERED_EVENT,
+}
+
 
 # -----------------------------------------------------------------
 # PARSE A SINGLE LOG
@@ -80,6 +93,24 @@ def parse_log_file(log_path):
     return events, found_agents
 
 
+# -----------------------------------------------------------------
+# LOAD A SINGLE EVENT FILE
+# -----------------------------------------------------------------
+def parse_event_file(event_path):
+    """
+    Reads one event file (event_log_file in engine.yaml), same output as parse_log_file.
+    The events are loaded as arrays, so nothing is text-parsed.
+    Returns:
+      events: list of (date_obj, agent_id, event_type)
+      found_agents: set of all agent IDs of the run
+    """
+    log = load_events(event_path)
+    health = np.isin(log.code, list(EVENT_TYPES))
+    events = [(date.fromordinal(day), agent_id, EVENT_TYPES[code]) for day, agent_id, code in
+              zip(log.day_ordinals()[health].tolist(), log.agent[health].tolist(), log.code[health].tolist())]
+    return events, set(log.agent_ids.tolist())
+
+
 # -----------------------------------------------------------------
 # BUILD DAILY STATES
 # -----------------------------------------------------------------
@@ -211,6 +242,9 @@ def plot_siqr_combined(states_by_day, agent_ids, title="Combined SIQR"):
     x_vals = range(len(days_sorted))
     day_labels = [d.strftime("%Y-%m-%d") for d in days_sorted]
 
+    # matplotlib is only needed for plotting, so the parsers stay importable without it
+    import matplotlib.pyplot as plt
+
     # --- Stacked area with S on top => pass [r,q,i,s]
     plt.figure(figsize=(10, 6))
     plt.stackplot(
@@ -257,9 +291,9 @@ def process_multiple_logs_and_combine(log_files):
     # TODO: Find a way to extract these IDs from a yaml (better than hardcoding the ids)
     universal_agent_ids = {-1, 0, 3, 5, 8, 10, 14, 15, 17, 20, 23}
 
-    # Parse each log file
+    # Parse each log file (or load each event file)
     for log_f in log_files:
-        events, _ = parse_log_file(log_f)
+        events, _ = parse_event_file(log_f) if log_f.endswith(".npz") else parse_log_file(log_f)
         sbd = build_daily_states(events, universal_agent_ids)
         all_runs_states.append(sbd)
 
@@ -271,5 +305,8 @@ def process_multiple_logs_and_combine(log_files):
 
 
 if __name__ == "__main__":
-    logs = [f"log{i}.txt" for i in range(1, 61)]
+    # Run from the repository root: python -m log_processing.siqr_simulation
+    # Prefer the typed event files of the runs, when they were recorded
+    logs = sorted(glob.glob(os.path.join(LOG_DIR, "events*.npz"))) or \
+        [os.path.join(LOG_DIR, f"log{i}.txt") for i in range(1, 61)]
     process_multiple_logs_and_combine(logs)
@@ -42,6 +42,10 @@ do
     echo "Running iteration $i..."
     # Run the Python script and save output to logs/log<i>.txt
     python "$PYTHON_SCRIPT" > "${LOG_DIR}/log${i}.txt" 2>&1
+    # Keep the typed event log of the run, when event_log_file is set in config/engine.yaml
+    if [ -f "${LOG_DIR}/events.npz" ]; then
+        mv "${LOG_DIR}/events.npz" "${LOG_DIR}/events${i}.npz"
+    fi
 done
 
 echo "All runs completed."
@@ -0,0 +1,104 @@
+import random
+from collections import deque
+
+from engine.simulation_builder import build_orchestrator
+from loader.engine_loader import load_engine_from_yaml
+
+TICKS_PER_DAY = 4680
+
+
+def random_grid(rng: random.Random, rows: int, cols: int, density: float) -> list[list[bool]]:
+    grid = [[rng.random() < density for _ in range(cols)] for _ in range(rows)]
+    # A few straight walls with gaps, so that routes have to turn around obstacles
+    for _ in range(rng.randint(1, 4)):
+        if rng.random() < 0.5:
+            row = rng.randrange(rows)
+            for col in range(cols):
+                grid[row][col] = True
+            for col in rng.sample(range(cols), 2):
+                grid[row][col] = False
+        else:
+            col = rng.randrange(cols)
+            for row in range(rows):
+                grid[row][col] = True
+            for row in rng.sample(range(rows), 2):
+                grid[row][col] = False
+    return grid
+
+
+def free_cells(grid) -> list[tuple[int, int]]:
+    return [(r, c) for r, row in enumerate(grid) for c, blocked in enumerate(row) if not blocked]
+
+
+def bfs_distance(grid, start: tuple[int, int], goal: tuple[int, int]):
+    """
+    Length in steps of the shortest 4-connected route, None if the goal cannot be reached.
+    """
+    rows, cols = len(grid), len(grid[0])
+    distance = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        cell = frontier.popleft()
+        if cell == goal:
+            return distance[cell]
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            r, c = cell[0] + dr, cell[1] + dc
+            if 0 <= r < rows and 0 <= c < cols and not grid[r][c] and (r, c) not in distance:
+                distance[(r, c)] = distance[cell] + 1
+                frontier.append((r, c))
+    return None
+
+
+def assert_walkable(grid, path, start: tuple[int, int], goal: tuple[int, int]):
+    """
+    Check that a path of cells goes from start to goal on free cells, one 4-connected step at a time.
+    """
+    path = list(path)
+    assert path[0] == start and path[-1] == goal
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1
+    assert not any(grid[r][c] for r, c in path)
+
+
+def build_simulation(**engine):
+    """
+    Build the scene of main.py with a seeded sampler. The particle field is the real one, one cell per sub-tile so
+    that its updates stay short.
+    :param engine: Engine settings replacing the ones of config/engine.yaml.
+    :return: The orchestrator.
+    """
+    config = load_engine_from_yaml("config/engine.yaml")
+    config["engine"].update({"num_weeks": 1, "text_log": False, "random_seed": 3, "grid_density": 1,
+                             "map_cache_dir": None, **engine})
+    return build_orchestrator(config, width=1200, height=720, tile_size=60)
+
+
+def snapshot(orchestrator) -> list:
+    return [(agent.grid_position, agent.pandemic_status) for agent in orchestrator.recorded_agents]
+
+
+def force_infections(orchestrator, indices: list[int]):
+    """
+    Infect agents before the first day, through a morning check of certain infection (one uniform draw each, whichever
+    health engine is used).
+    :param indices: Indices of the agents in recorded_agents.
+    """
+    agents = orchestrator.recorded_agents
+    agent_props = {"infection_prob": 1.0, "sampler": orchestrator.agents_prop("sampler")}
+    for index in indices:
+        agents[index].morning_infection_check(agent_props, orchestrator.timer.current_time_of_day)
+
+
+def run_simulation(ticks: int = TICKS_PER_DAY, **engine):
+    """
+    Run the scene of build_simulation for a number of ticks, and record the positions and health statuses of the
+    agents after every call of simulate_once.
+    :return: The list of per-call snapshots and the closed orchestrator.
+    """
+    orchestrator = build_simulation(**engine)
+    snapshots, done = [], 0
+    while done < ticks and not orchestrator.finished:
+        done += orchestrator.simulate_once()
+        snapshots.append(snapshot(orchestrator))
+    orchestrator.close()
+    return snapshots, orchestrator
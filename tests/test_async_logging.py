@@ -0,0 +1,103 @@
+import logging
+import queue
+import threading
+
+import pytest
+
+from engine.async_logging import BoundedQueueHandler, configure_logging, shutdown_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def root_logger():
+    shutdown_logging()
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    for handler in handlers:
+        root.removeHandler(handler)
+    yield root
+    shutdown_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def make_record(message):
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, (), None)
+
+
+def test_drop_policy_counts_the_lost_records():
+    log_queue = queue.Queue(maxsize=3)
+    handler = BoundedQueueHandler(log_queue, "drop")
+    for i in range(10):
+        handler.emit(make_record(f"record {i}"))
+    assert handler.dropped == 7
+    assert [log_queue.get_nowait().getMessage() for _ in range(3)] == ["record 0", "record 1", "record 2"]
+
+
+def test_block_policy_waits_for_the_writer():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, "block")
+    received = []
+
+    def writer():
+        for _ in range(50):
+            received.append(log_queue.get(timeout=5).getMessage())
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    for i in range(50):
+        handler.emit(make_record(f"record {i}"))
+    thread.join(timeout=5)
+    assert handler.dropped == 0
+    assert received == [f"record {i}" for i in range(50)]
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), "spill")
+
+
+def test_records_reach_the_handlers_through_the_writer(root_logger):
+    target = ListHandler()
+    root_logger.addHandler(target)
+    configure_logging({"engine": {"log_level": "INFO", "log_queue_size": 100000, "log_overflow": "block"}})
+    # The handlers already attached (the target, and the capture handlers of pytest) are moved behind the queue
+    assert target not in root_logger.handlers
+    assert any(isinstance(handler, BoundedQueueHandler) for handler in root_logger.handlers)
+
+    logger = logging.getLogger("test_async_logging")
+    for i in range(1000):
+        logger.info("record %d", i)
+    logger.debug("below the level")
+    shutdown_logging()
+
+    assert target in root_logger.handlers
+    assert not any(isinstance(handler, BoundedQueueHandler) for handler in root_logger.handlers)
+    assert target.messages == [f"record {i}" for i in range(1000)]
+    logger.info("written directly")
+    assert target.messages[-1] == "written directly"
+
+
+def test_shutdown_with_a_full_queue(root_logger):
+    target = ListHandler()
+    root_logger.addHandler(target)
+    configure_logging({"engine": {"log_queue_size": 1, "log_overflow": "drop"}})
+    logger = logging.getLogger("test_async_logging")
+    for i in range(500):
+        logger.info("record %d", i)
+    shutdown_logging()
+    # Some records were dropped, the others are written in order, followed by the count of the dropped ones
+    written = [message for message in target.messages if message.startswith("record")]
+    assert written == sorted(written, key=lambda message: int(message.split()[1]))
+    assert target.messages[-1] == f"{500 - len(written)} log records were dropped while the log queue was full."
@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+
+from engine.placeable import Circle, Polygon, Rectangle
+from interaction.traversealgorithms.collisiongrid import build_collision_array, point_in_polygon
+
+
+def brute_force_polygon(points, shape):
+    grid = np.zeros(shape, dtype=bool)
+    for row in range(shape[0]):
+        for col in range(shape[1]):
+            grid[row, col] = point_in_polygon((col, row), points)
+    return grid
+
+
+def test_polygon_fill_matches_point_in_polygon():
+    rng = random.Random(7)
+    for density in (1, 2, 3):
+        for _ in range(30):
+            # Star-shaped polygon around a random centre: concave, partly off the grid, some vertices on cells
+            cx, cy = rng.uniform(0, 20), rng.uniform(0, 15)
+            angles = sorted(rng.uniform(0, 2 * np.pi) for _ in range(rng.randint(3, 9)))
+            points = []
+            for angle in angles:
+                radius = rng.uniform(1, 12)
+                x, y = cx + radius * np.cos(angle), cy + radius * np.sin(angle)
+                if rng.random() < 0.3:
+                    x, y = round(x), round(y)
+                points.append((x, y))
+            grid = build_collision_array([Polygon("Wall", points)], width=100, height=75, tile_size=5,
+                                         map_density=density)
+            scaled = [(x * density, y * density) for x, y in points]
+            assert np.array_equal(grid, brute_force_polygon(scaled, grid.shape))
+
+
+def test_non_colliding_polygon_marks_nothing():
+    floor = Polygon("Environment", [(1, 1), (1, 11), (19, 11), (19, 1)], collision=False)
+    assert not build_collision_array([floor], width=100, height=75, tile_size=5, map_density=2).any()
+
+
+def test_rectangle_and_circle_cells():
+    grid = build_collision_array([Rectangle("Table", 2, 3, 4, 2), Circle("Pillar", 14, 8, collision=True)],
+                                 width=100, height=75, tile_size=5, map_density=1)
+    assert grid[3:5, 2:6].all()
+    assert grid[3:5, 2:6].sum() == 8
+    # Radius of a circle is tile_size / 2.5 cells
+    rows, cols = np.nonzero(grid)
+    circle = (rows - 8) ** 2 + (cols - 14) ** 2 <= 4
+    assert circle.sum() == 13
+    assert grid.sum() == 8 + 13
@@ -0,0 +1,85 @@
+import datetime
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from interaction.recording.contact_network import ContactNetwork, SpatialHash, load_contacts
+
+
+def brute_force_pairs(agents, radius):
+    pairs = set()
+    for i, a in enumerate(agents):
+        for j in range(i + 1, len(agents)):
+            (xi, yi), (xj, yj) = a.grid_position, agents[j].grid_position
+            if xi >= 0 and xj >= 0 and (xi - xj) ** 2 + (yi - yj) ** 2 <= radius ** 2:
+                pairs.add((i, j))
+    return pairs
+
+
+@pytest.mark.parametrize("radius", [1.0, 2.5, 4.0])
+def test_contact_durations_match_brute_force(tmp_path, radius):
+    rng = random.Random(int(radius * 10))
+    agents = [SimpleNamespace(grid_position=(-1, -1)) for _ in range(25)]
+    network = ContactNetwork(str(tmp_path), list(range(100, 125)), radius, seconds_per_tick=5)
+    network.start_day(datetime.date(2025, 1, 6))
+    expected = {}
+    for _ in range(600):
+        for agent in agents:
+            roll = rng.random()
+            if agent.grid_position[0] < 0:
+                if roll < 0.1:
+                    agent.grid_position = (rng.randrange(20), rng.randrange(15))
+            elif roll < 0.02:
+                agent.grid_position = (-1, -1)
+            elif roll < 0.3:
+                gx, gy = agent.grid_position
+                dx, dy = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+                agent.grid_position = (min(max(gx + dx, 0), 19), min(max(gy + dy, 0), 14))
+        ticks = 1
+        network.record(agents)
+        if rng.random() < 0.1:
+            # A stretch of ticks where nobody moves
+            ticks += rng.randint(1, 20)
+            network.repeat(ticks - 1)
+        for pair in brute_force_pairs(agents, radius):
+            expected[pair] = expected.get(pair, 0) + ticks
+
+    assert network.edges == expected
+
+    network.end_day()
+    source, target, seconds = load_contacts(str(tmp_path / "contacts_2025-01-06.npz"))
+    written = {(int(s) - 100, int(t) - 100): int(d) for s, t, d in zip(source, target, seconds)}
+    assert written == {pair: 5 * count for pair, count in expected.items()}
+    assert network.edges == {}
+
+
+def test_spatial_hash_near_and_remove():
+    spatial_hash = SpatialHash(3)
+    positions = {0: (0, 0), 1: (2, 2), 2: (3, 0), 3: (7, 7)}
+    for index, position in positions.items():
+        spatial_hash.move(index, position)
+    assert sorted(spatial_hash.near(0, 3)) == [1, 2]
+    spatial_hash.move(1, (6, 6))
+    assert spatial_hash.near(0, 3) == [2]
+    assert spatial_hash.near(3, 3) == [1]
+    spatial_hash.remove(1)
+    assert spatial_hash.near(3, 3) == []
+    assert 1 not in spatial_hash.positions
+    with pytest.raises(ValueError):
+        SpatialHash(0)
+
+
+def test_days_are_written_separately(tmp_path):
+    agents = [SimpleNamespace(grid_position=(1, 1)), SimpleNamespace(grid_position=(1, 2))]
+    network = ContactNetwork(str(tmp_path), [7, 9], 1.0, seconds_per_tick=5)
+    network.start_day(datetime.date(2025, 1, 6))
+    for _ in range(3):
+        network.record(agents)
+    network.start_day(datetime.date(2025, 1, 7))
+    network.record(agents)
+    network.close()
+    first = load_contacts(str(tmp_path / "contacts_2025-01-06.npz"))
+    second = load_contacts(str(tmp_path / "contacts_2025-01-07.npz"))
+    assert [array.tolist() for array in first] == [[7], [9], [15]]
+    assert [array.tolist() for array in second] == [[7], [9], [5]]
@@ -0,0 +1,67 @@
+import numpy as np
+
+from helpers import TICKS_PER_DAY, build_simulation, snapshot
+from interaction.disease.spread_simulator import SpreadSimulator
+from interaction.recording.event_log import load_events
+
+
+def run(tmp_path, name: str, event_jump: bool):
+    """
+    Run two days with the active-set scheduler and an infectious teacher, who leaves the room at the breaks while the
+    students stay seated in the particles.
+    :return: The agents and the field keyed by the number of ticks done, the number of ticks jumped over a contaminated field, and
+    the events.
+    """
+    event_file = str(tmp_path / f"{name}.npz")
+    orchestrator = build_simulation(infection_prob=0.0, population_health=True, active_set_scheduler=True,
+                                    event_jump=event_jump, event_log_file=event_file)
+    orchestrator.health.infect([len(orchestrator.recorded_agents) - 1])
+    spread_simulator = orchestrator.spread_simulator
+    snapshots, done, jumped_contaminated = {}, 0, 0
+    while done < 2 * TICKS_PER_DAY and not orchestrator.finished:
+        contaminated = spread_simulator.contaminated
+        ticks = orchestrator.simulate_once()
+        done += ticks
+        if ticks > 1 and contaminated:
+            jumped_contaminated += ticks
+        snapshots[done] = snapshot(orchestrator), [row[:] for row in spread_simulator.grid]
+    orchestrator.close()
+    return snapshots, jumped_contaminated, load_events(event_file)
+
+
+def test_advance_matches_the_updates():
+    stepped, advanced = SpreadSimulator(20, 20, decay_const=0.05), SpreadSimulator(20, 20, decay_const=0.05)
+    for field in (stepped, advanced):
+        field.add_source(10, 10, 40.0)
+    for _ in range(30):
+        stepped.update()
+    assert advanced.advance(30) == 30
+    assert advanced.grid == stepped.grid
+
+    # Stopped before the first tick at which the particles reach the corner block
+    field = SpreadSimulator(20, 20, decay_const=0.05)
+    field.add_source(10, 10, 40.0)
+    done = field.advance(30, lambda done: field.block_has_load(0, 0, 8))
+    assert 0 < done < 30
+    assert field.block_has_load(0, 0, 8)
+    reference = SpreadSimulator(20, 20, decay_const=0.05)
+    reference.add_source(10, 10, 40.0)
+    for _ in range(done - 1):
+        reference.update()
+    assert not reference.block_has_load(0, 0, 8)
+
+    # An empty field is advanced at once
+    assert SpreadSimulator(20, 20).advance(1000) == 1000
+
+
+def test_jumps_match_the_tick_by_tick_run(tmp_path):
+    stepped, _, stepped_events = run(tmp_path, "stepped", event_jump=False)
+    jumped, jumped_contaminated, jumped_events = run(tmp_path, "jumped", event_jump=True)
+
+    assert len(jumped) < len(stepped)
+    # The field is advanced over the stretches after the teacher left the room
+    assert jumped_contaminated > 0
+    for done, agents in jumped.items():
+        assert agents == stepped[done], done
+    for column in ("agent", "code", "tick"):
+        assert np.array_equal(getattr(jumped_events, column), getattr(stepped_events, column))
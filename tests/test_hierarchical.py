@@ -0,0 +1,86 @@
+import random
+
+from interaction.traversealgorithms.hierarchical import HierarchicalPathfinder
+
+from helpers import assert_walkable, bfs_distance, free_cells, random_grid
+
+
+def walk(path) -> list:
+    cells = []
+    while path:
+        cells.append(path.next_cell())
+    return cells
+
+
+def test_hpa_paths_are_walkable():
+    rng = random.Random(5)
+    for _ in range(15):
+        grid = random_grid(rng, rng.randint(8, 45), rng.randint(8, 45), rng.uniform(0.0, 0.3))
+        cells = free_cells(grid)
+        if len(cells) < 2:
+            continue
+        pathfinder = HierarchicalPathfinder(grid, cluster_size=rng.choice((3, 5, 10)))
+        for _ in range(25):
+            start, goal = rng.sample(cells, 2)
+            expected = bfs_distance(grid, start, goal)
+            path = pathfinder.find_path(start, goal)
+            if expected is None:
+                assert path is None
+                continue
+            length = len(path)
+            cells_walked = walk(path)
+            assert len(cells_walked) == length >= expected
+            assert_walkable(grid, [start] + cells_walked, start, goal)
+
+
+def test_update_rebuilds_only_the_touched_clusters(monkeypatch):
+    grid = [[False] * 40 for _ in range(40)]
+    pathfinder = HierarchicalPathfinder(grid, cluster_size=10)
+
+    distance_clusters, border_pairs = set(), set()
+    local_distances, border_transitions = pathfinder._local_distances, pathfinder._border_transitions
+
+    def spy_distances(source, cluster):
+        distance_clusters.add(cluster)
+        return local_distances(source, cluster)
+
+    def spy_transitions(cluster, neighbour):
+        border_pairs.add((cluster, neighbour))
+        return border_transitions(cluster, neighbour)
+
+    monkeypatch.setattr(pathfinder, "_local_distances", spy_distances)
+    monkeypatch.setattr(pathfinder, "_border_transitions", spy_transitions)
+
+    changed = [(row, 15) for row in range(10, 19)]
+    for row, col in changed:
+        grid[row][col] = True
+    pathfinder.update(changed)
+
+    neighbours = {(0, 1), (2, 1), (1, 0), (1, 2)}
+    assert distance_clusters == {(1, 1)} | neighbours
+    assert border_pairs == {tuple(sorted(((1, 1), other))) for other in neighbours}
+
+
+def test_update_matches_a_fresh_build():
+    rng = random.Random(9)
+    for _ in range(10):
+        grid = random_grid(rng, 30, 30, 0.15)
+        pathfinder = HierarchicalPathfinder(grid, cluster_size=6)
+        for _ in range(5):
+            # Toggle a small block of cells, then compare against a pathfinder built on the new grid
+            top, left = rng.randrange(28), rng.randrange(28)
+            changed = [(top + dr, left + dc) for dr in range(3) for dc in range(3)]
+            blocked = rng.random() < 0.6
+            for row, col in changed:
+                grid[row][col] = blocked
+            pathfinder.update(changed)
+            fresh = HierarchicalPathfinder(grid, cluster_size=6)
+            assert pathfinder.node_count == fresh.node_count
+
+            cells = free_cells(grid)
+            for _ in range(20):
+                start, goal = rng.sample(cells, 2)
+                route, expected = pathfinder.search(start, goal), fresh.search(start, goal)
+                assert bool(route) == bool(expected) == (bfs_distance(grid, start, goal) is not None)
+                if route:
+                    assert route[0][1] == expected[0][1]
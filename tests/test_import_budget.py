@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET_SECONDS = 1.0
+
+# Run in a fresh interpreter: pygame, scipy and matplotlib cannot be imported at all, so an import of one of them
+# at module level fails the test instead of only slowing it down
+SCRIPT = textwrap.dedent("""
+    import sys
+    import time
+
+    BLOCKED = ("pygame", "scipy", "matplotlib")
+
+    class Blocker:
+        def find_spec(self, name, path=None, target=None):
+            if name.split(".")[0] in BLOCKED:
+                raise ImportError(f"{name} is not available on the headless path")
+            return None
+
+    sys.meta_path.insert(0, Blocker())
+    start = time.perf_counter()
+    import engine.streaming
+    print(time.perf_counter() - start)
+""")
+
+
+def test_headless_import_within_budget():
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, capture_output=True, text=True, check=False)
+    assert result.returncode == 0, result.stderr
+    elapsed = float(result.stdout.strip().splitlines()[-1])
+    assert elapsed < BUDGET_SECONDS, f"engine.streaming took {elapsed:.3f} s to import"
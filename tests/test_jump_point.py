@@ -0,0 +1,51 @@
+import random
+
+from interaction.traversealgorithms.grid_astar import GridAStar
+from interaction.traversealgorithms.jump_point import JumpPointSearch
+
+from helpers import assert_walkable, bfs_distance, free_cells, random_grid
+
+
+def test_jps_paths_as_short_as_astar():
+    rng = random.Random(11)
+    for _ in range(20):
+        grid = random_grid(rng, rng.randint(5, 40), rng.randint(5, 40), rng.uniform(0.0, 0.35))
+        cells = free_cells(grid)
+        if len(cells) < 2:
+            continue
+        astar, jps = GridAStar(grid), JumpPointSearch(grid)
+        for _ in range(30):
+            start, goal = rng.sample(cells, 2)
+            expected = bfs_distance(grid, start, goal)
+            astar_path, jps_path = astar.search(start, goal), jps.search(start, goal)
+            if expected is None:
+                assert astar_path == () and jps_path == ()
+                continue
+            assert len(jps_path) == len(astar_path) == expected + 1
+            assert_walkable(grid, jps_path, start, goal)
+
+
+def test_jps_blocked_endpoints_and_same_cell():
+    grid = [[False, True, False],
+            [False, False, False]]
+    jps = JumpPointSearch(grid)
+    assert jps.search((0, 0), (0, 1)) == ()
+    assert jps.search((0, 1), (0, 0)) == ()
+    assert jps.search((0, 0), (5, 5)) == ()
+    assert jps.search((1, 1), (1, 1)) == ((1, 1),)
+    assert jps.search((0, 0), (0, 2)) == ((0, 0), (1, 0), (1, 1), (1, 2), (0, 2))
+
+
+def test_jps_resumes_within_budget():
+    grid = [[False] * 30 for _ in range(30)]
+    for row in range(1, 30):
+        grid[row][15] = True
+    jps = JumpPointSearch(grid)
+    full = jps.search((29, 0), (29, 29))
+    jps.begin((29, 0), (29, 29))
+    path = None
+    while path is None:
+        before = jps.expansions
+        path = jps.resume(1)
+        assert jps.expansions - before <= 1
+    assert path == full
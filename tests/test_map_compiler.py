@@ -0,0 +1,56 @@
+import numpy as np
+
+from interaction.traversealgorithms.collisiongrid import build_collision_array
+from loader.map_compiler import compile_map, map_cache_key
+
+
+MAP_FILE = "config/map.yaml"
+
+
+def test_cache_key_changes_with_density_parameters():
+    with open(MAP_FILE, "rb") as file:
+        map_bytes = file.read()
+    base = map_cache_key(map_bytes, 800, 600, 5, 1)
+    assert map_cache_key(map_bytes, 800, 600, 5, 1) == base
+    variants = [
+        map_cache_key(map_bytes, 800, 600, 5, 2),
+        map_cache_key(map_bytes, 800, 600, 10, 1),
+        map_cache_key(map_bytes, 1000, 600, 5, 1),
+        map_cache_key(map_bytes, 800, 500, 5, 1),
+        map_cache_key(map_bytes + b"\n", 800, 600, 5, 1),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_cached_map_matches_fresh_compile(tmp_path):
+    fresh = compile_map(MAP_FILE, 800, 600, 5, 2)
+    stored = compile_map(MAP_FILE, 800, 600, 5, 2, cache_dir=str(tmp_path))
+    assert [path.name for path in tmp_path.iterdir()] == [fresh.key]
+    loaded = compile_map(MAP_FILE, 800, 600, 5, 2, cache_dir=str(tmp_path))
+
+    for compiled in (stored, loaded):
+        assert compiled.key == fresh.key
+        assert compiled.grid_shape == fresh.grid_shape
+        assert np.array_equal(compiled.collision_bits, fresh.collision_bits)
+        assert np.array_equal(compiled.chairs, fresh.chairs)
+        assert compiled.hotspots == fresh.hotspots
+        assert compiled.by_type == fresh.by_type
+
+
+def test_other_density_is_compiled_separately(tmp_path):
+    low = compile_map(MAP_FILE, 800, 600, 5, 1, cache_dir=str(tmp_path))
+    high = compile_map(MAP_FILE, 800, 600, 5, 2, cache_dir=str(tmp_path))
+    assert low.key != high.key
+    assert high.grid_shape == (2 * low.grid_shape[0], 2 * low.grid_shape[1])
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted([low.key, high.key])
+
+
+def test_collision_grid_stays_an_array(tmp_path):
+    compile_map(MAP_FILE, 800, 600, 5, 2, cache_dir=str(tmp_path))
+    loaded = compile_map(MAP_FILE, 800, 600, 5, 2, cache_dir=str(tmp_path))
+    grid = loaded.collision_grid
+    assert isinstance(grid, np.ndarray) and grid.dtype == bool
+    assert grid.shape == loaded.grid_shape
+    assert grid is loaded.collision_grid
+    expected = build_collision_array(loaded.placeables, 800, 600, 5, 2)
+    assert np.array_equal(grid, expected)
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from interaction.traversealgorithms.navigator import Navigator
+from interaction.traversealgorithms.path_queue import PathRequestQueue
+
+from helpers import free_cells, random_grid, run_simulation
+
+
+def cells_of(path):
+    return path.cells if path is not None else None
+
+
+@pytest.mark.parametrize("algorithm", ["astar", "jps"])
+def test_queue_stays_within_budget(algorithm):
+    rng = random.Random(3)
+    grid = random_grid(rng, 40, 40, 0.2)
+    cells = free_cells(grid)
+    queries = [tuple(rng.sample(cells, 2)) for _ in range(40)]
+    reference = Navigator(grid, cache_size=0, algorithm=algorithm)
+
+    for budget in (1, 7, 50):
+        queue = PathRequestQueue(Navigator(grid, cache_size=0, algorithm=algorithm), expansion_budget=budget)
+        tickets = [queue.request(start, goal) for start, goal in queries]
+        assert queue.pending == len(queries)
+        ticks = 0
+        while queue.pending:
+            queue.process()
+            assert 0 < queue.expansions <= budget
+            ticks += 1
+            assert ticks < 100000
+        for ticket, (start, goal) in zip(tickets, queries):
+            assert ticket.done
+            assert cells_of(ticket.path) == cells_of(reference.find_path(start, goal))
+
+
+def test_cached_queries_resolve_at_once():
+    grid = [[False] * 10 for _ in range(10)]
+    queue = PathRequestQueue(Navigator(grid, cache_size=16), expansion_budget=5)
+    first = queue.request((0, 0), (9, 9))
+    assert not first.done
+    while queue.pending:
+        queue.process()
+    again = queue.request((0, 0), (9, 9))
+    assert again.done and queue.pending == 0
+    assert cells_of(again.path) == cells_of(first.path)
+
+
+def test_cancelled_requests_are_dropped():
+    grid = [[False] * 10 for _ in range(10)]
+    queue = PathRequestQueue(Navigator(grid, cache_size=0), expansion_budget=3)
+    cancelled = queue.request((0, 0), (9, 9))
+    kept = queue.request((9, 0), (0, 9))
+    queue.process()
+    cancelled.cancel()
+    while queue.pending:
+        queue.process()
+    assert cancelled.done and cancelled.path is None
+    assert kept.done and cells_of(kept.path)[-1] == (0, 9)
+
+
+def test_no_budget_resolves_immediately():
+    grid = [[False, True], [False, False]]
+    queue = PathRequestQueue(Navigator(grid, cache_size=0))
+    assert cells_of(queue.request((0, 0), (1, 1)).path) == ((0, 0), (1, 0), (1, 1))
+    assert queue.request((0, 0), (0, 1)).path is None
+    assert queue.pending == 0
+    with pytest.raises(ValueError):
+        PathRequestQueue(Navigator(grid), expansion_budget=-1)
+
+
+@pytest.mark.parametrize("population_engine", ["objects", "arrays"])
+def test_searches_within_the_budget_do_not_delay_the_agents(population_engine):
+    # Every search of the scene fits in the budget of its tick, so the agents walk as with immediate searches
+    immediate, _ = run_simulation(ticks=1500, population_engine=population_engine, path_expansion_budget=0)
+    queued, _ = run_simulation(ticks=1500, population_engine=population_engine, path_expansion_budget=100000)
+    assert queued == immediate
@@ -0,0 +1,89 @@
+from helpers import TICKS_PER_DAY, build_simulation, run_simulation
+from interaction.timer import DayClock
+from interaction.utilities import PandemicStatus
+
+
+def test_arrays_engine_is_reproducible():
+    first, _ = run_simulation(population_engine="arrays")
+    second, _ = run_simulation(population_engine="arrays")
+    other, _ = run_simulation(population_engine="arrays", random_seed=4)
+    assert first == second
+    assert first != other
+
+
+def test_arrays_engine_walks_free_cells():
+    snapshots, orchestrator = run_simulation(population_engine="arrays")
+    grid = orchestrator.agents_prop("collision_grid")
+    agents = orchestrator.recorded_agents
+    seated = set()
+    for snapshot in snapshots:
+        for agent, ((gx, gy), _) in zip(agents, snapshot):
+            if (gx, gy) == (-1, -1):
+                continue
+            assert not grid[gy][gx]
+            if (gx, gy) == agent.profile.chair_cell:
+                seated.add(agent.id)
+    assert seated == {agent.id for agent in agents}
+    # Everybody has left at the end of the day
+    assert all(position == (-1, -1) for position, _ in snapshots[-1])
+
+
+def run_day_in_fixed_field(population_engine: str):
+    """
+    Run a day in a uniform particle field that neither decays, diffuses nor grows, with the dose model of infection.
+    :return: The first tick at which each agent sat on its chair, the last tick it was in the room, its leaving tick
+    and the number of infected agents.
+    """
+    orchestrator = build_simulation(population_engine=population_engine, infection_prob=0.0, population_health=True,
+                                    infection_model="dose", decay_const=0.0, diffusion_coeff=0.0, min_load=0.0,
+                                    base_shedding=0)
+    field = orchestrator.spread_simulator
+    for row in range(field.rows):
+        for col in range(field.cols):
+            field.add_source(row, col, 40.0)
+    agents = orchestrator.recorded_agents
+    seated, present, done = {}, {}, 0
+    while done < TICKS_PER_DAY:
+        done += orchestrator.simulate_once()
+        for agent in agents:
+            if agent.grid_position == agent.profile.chair_cell:
+                seated.setdefault(agent.id, done)
+            if agent.grid_position != (-1, -1):
+                present[agent.id] = done
+    leaving = {agent.id: agent.profile.leaving_tick for agent in agents}
+    infected = sum(agent.pandemic_status == PandemicStatus.INFECTED for agent in agents)
+    orchestrator.close()
+    return seated, present, leaving, infected
+
+
+def test_arrays_engine_matches_the_object_engine():
+    objects_seated, objects_present, leaving, objects_infected = run_day_in_fixed_field("objects")
+    arrays_seated, arrays_present, _, arrays_infected = run_day_in_fixed_field("arrays")
+
+    # Same chairs reached, after walks of about the same length from a random cell of the entrance
+    assert arrays_seated.keys() == objects_seated.keys() == leaving.keys()
+    for agent_id, tick in objects_seated.items():
+        assert abs(arrays_seated[agent_id] - tick) <= 10, agent_id
+    # Everybody leaves from its leaving tick
+    for agent_id, tick in objects_present.items():
+        assert tick > leaving[agent_id] and arrays_present[agent_id] > leaving[agent_id], agent_id
+        assert abs(arrays_present[agent_id] - tick) <= 20, agent_id
+    # Same thresholds, and doses that only differ by the few ticks of the walks
+    assert objects_infected > 0
+    assert abs(arrays_infected - objects_infected) <= 1
+
+
+def test_population_health_runs_build_no_datetime_per_tick(monkeypatch):
+    calls = []
+    datetime_of = DayClock.datetime
+
+    def counted(clock, date, tick):
+        calls.append(tick)
+        return datetime_of(clock, date, tick)
+
+    monkeypatch.setattr(DayClock, "datetime", counted)
+    for population_engine in ("objects", "arrays"):
+        calls.clear()
+        run_simulation(ticks=1000, population_engine=population_engine, population_health=True, infection_prob=0.0)
+        # For the day start event only
+        assert calls == [0], population_engine
@@ -0,0 +1,162 @@
+import math
+import warnings
+from datetime import timedelta
+
+import numpy as np
+
+from helpers import build_simulation, force_infections
+from interaction.disease.health_manager import PandemicStateManager
+from interaction.disease.population_health import QUARANTINE_DAYS, PopulationHealth
+from interaction.recording.event_log import EventCode, EventSink, load_events
+from interaction.sampler import Sampler
+from interaction.timer import Timer
+from interaction.utilities import PandemicStatus
+
+
+class RecordedEvents(EventSink):
+    def __init__(self):
+        self.events = []
+
+    def emit(self, code, agent_id, current_dt, until=None):
+        self.events.append((current_dt, code, agent_id, until))
+
+
+def test_population_health_matches_the_state_managers():
+    n, infection_prob = 40, 0.05
+    timers = [Timer("07:30:00", "14:00:00", 4, 5) for _ in range(2)]
+    managers_events, population_events = RecordedEvents(), RecordedEvents()
+    sampler = Sampler(seed=3)
+    managers = [PandemicStateManager(i, sampler, managers_events) for i in range(n)]
+    population = PopulationHealth(list(range(n)), timers[1], Sampler(seed=3), infection_prob,
+                                  events=population_events)
+
+    finished = False
+    while not finished:
+        # Morning check, as done by the agents
+        current_dt = timers[0].current_time_of_day
+        for manager in managers:
+            manager.update_quarantine(current_dt)
+            if manager.is_susceptible() and sampler.random() < infection_prob:
+                manager.become_infected(current_dt)
+        population.morning_check()
+        assert [manager.status for manager in managers] == population.status.tolist()
+
+        # Symptom onset during the day, then the end of day test
+        for timer in timers:
+            timer.tick(timer.clock.ticks_per_day - 1)
+        current_dt = timers[0].current_time_of_day
+        for manager in managers:
+            manager.update_status_during_day(current_dt)
+            manager.end_of_day_test(current_dt)
+        population.update_during_day()
+        population.end_of_day_test()
+        assert [manager.status for manager in managers] == population.status.tolist()
+        assert [manager.is_infectious() for manager in managers] == population.infectious().tolist()
+
+        for timer in timers:
+            timer.tick()
+            finished = timer.check_finished()
+
+    events = sorted(population_events.events)
+    assert events == sorted(managers_events.events)
+    infected = {agent: (dt, until) for dt, code, agent, until in events if code == EventCode.INFECTED}
+    quarantined = {agent: (dt, until) for dt, code, agent, until in events if code == EventCode.QUARANTINED}
+    recovered = {agent: dt for dt, code, agent, until in events if code == EventCode.RECOVERED}
+    assert quarantined and recovered
+    for agent, (dt, until) in quarantined.items():
+        # Tested at the end of the first day after the symptom onset
+        assert dt >= infected[agent][1]
+        assert dt.date() == until.date() - timedelta(days=QUARANTINE_DAYS)
+    for agent, dt in recovered.items():
+        # Recovered at the first morning after the quarantine
+        assert quarantined[agent][1] <= dt <= quarantined[agent][1] + timedelta(days=3)
+
+
+def run(tmp_path, name: str, population_health: bool):
+    """
+    Run four weeks of the object engine after two forced infections, skipping the quiet days.
+    :return: The statuses at the start of each day and the events.
+    """
+    event_file = str(tmp_path / f"{name}.npz")
+    orchestrator = build_simulation(num_weeks=4, infection_prob=0.0, population_health=population_health,
+                                    skip_quiet_days=True, event_log_file=event_file)
+    force_infections(orchestrator, [0, 7])
+    days = []
+    while not orchestrator.finished:
+        orchestrator.simulate_once()
+        if orchestrator.timer.day_tick == 0:
+            days.append([agent.pandemic_status for agent in orchestrator.recorded_agents])
+    orchestrator.close()
+    events = load_events(event_file)
+    return days, sorted(zip(events.tick.tolist(), events.code.tolist(), events.agent.tolist()))
+
+
+def test_object_engine_with_population_health(tmp_path):
+    managers_days, managers_events = run(tmp_path, "managers", population_health=False)
+    population_days, population_events = run(tmp_path, "population", population_health=True)
+
+    assert population_days == managers_days
+    assert population_events == managers_events
+    codes = {code for _, code, _ in population_events}
+    assert {EventCode.INFECTED, EventCode.QUARANTINED, EventCode.RECOVERED} <= codes
+    assert PandemicStatus.RECOVERED in population_days[-1]
+
+
+def exposed_population(infection_model: str, n: int, seed: int = 3) -> PopulationHealth:
+    return PopulationHealth(list(range(n)), Timer("07:30:00", "14:00:00", 1, 5), Sampler(seed=seed),
+                            infection_model=infection_model, events=EventSink())
+
+
+def test_dose_and_per_tick_models_infect_at_the_same_rate():
+    n, p = 20000, 0.002
+    checkpoints = (10, 50, 150)
+    infected = {}
+    for infection_model in ("per_tick", "dose"):
+        population = exposed_population(infection_model, n)
+        indices = np.arange(n)
+        counts = {}
+        for tick in range(1, 151):
+            susceptible = indices[population.status == PandemicStatus.SUSCEPTIBLE]
+            population.expose(susceptible, np.full(len(susceptible), p))
+            if tick in checkpoints:
+                counts[tick] = int((population.status == PandemicStatus.INFECTED).sum())
+        infected[infection_model] = counts
+    for tick in checkpoints:
+        expected = n * (1 - (1 - p) ** tick)
+        tolerance = 5 * math.sqrt(expected * (1 - expected / n))
+        assert abs(infected["per_tick"][tick] - expected) < tolerance, tick
+        assert abs(infected["dose"][tick] - expected) < tolerance, tick
+
+
+def test_dose_model_draws_one_threshold_per_agent():
+    n, p = 2000, 0.01
+    thresholds = Sampler(seed=3).exponential(size=n)
+    vectorised, scalar = exposed_population("dose", n), exposed_population("dose", n)
+    infection_tick = np.full(n, -1)
+    for tick in range(1, 400):
+        # The infected agents stay exposed: their dose grows, but no other threshold is drawn
+        vectorised.expose(np.arange(n), np.full(n, p))
+        for i in range(n):
+            scalar.expose_one(i, p)
+        assert np.array_equal(vectorised.status, scalar.status)
+        infection_tick[(vectorised.status == PandemicStatus.INFECTED) & (infection_tick < 0)] = tick
+    # Infected at the first tick the dose reaches the threshold drawn at the start
+    expected = np.ceil(thresholds / -math.log1p(-p) - 1e-9).astype(int)
+    reached = expected < 400
+    assert reached.any()
+    assert np.array_equal(infection_tick[reached], expected[reached])
+    assert (infection_tick[~reached] == -1).all()
+
+
+def test_certain_infection_in_the_dose_model():
+    for expose in ("expose", "expose_one"):
+        population = exposed_population("dose", 3)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            if expose == "expose":
+                population.expose(np.array([0, 1]), np.array([1.0, 0.0]))
+            else:
+                population.expose_one(0, 1.0)
+                population.expose_one(1, 0.0)
+        assert population.status.tolist() == [PandemicStatus.INFECTED, PandemicStatus.SUSCEPTIBLE,
+                                              PandemicStatus.SUSCEPTIBLE]
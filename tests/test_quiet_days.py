@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from helpers import build_simulation, force_infections
+from interaction.recording.event_log import EventCode, load_events
+from interaction.utilities import PandemicStatus
+
+INFECTED_AGENTS = [0, 7]
+
+
+def run(tmp_path, name: str, population_health: bool, skip_quiet_days: bool):
+    """
+    Run four weeks without infections from the outside, after a few forced ones.
+    :return: The date and the health statuses at the start of each day, the number of days simulated and the events.
+    """
+    event_file = str(tmp_path / f"{name}.npz")
+    orchestrator = build_simulation(num_weeks=4, infection_prob=0.0, population_health=population_health,
+                                    skip_quiet_days=skip_quiet_days, event_log_file=event_file)
+    force_infections(orchestrator, INFECTED_AGENTS)
+    timer = orchestrator.timer
+    days = []
+    while not orchestrator.finished:
+        orchestrator.simulate_once()
+        if timer.day_tick == 0 and not orchestrator.finished:
+            days.append((timer.day_index, timer.current_date,
+                         [agent.pandemic_status for agent in orchestrator.recorded_agents]))
+    orchestrator.close()
+    return days, timer.day_index, load_events(event_file)
+
+
+@pytest.mark.parametrize("population_health", [False, True])
+def test_skipped_days_match_the_simulated_ones(tmp_path, population_health):
+    simulated, simulated_days, simulated_events = run(tmp_path, "simulated", population_health, False)
+    skipped, skipped_days, skipped_events = run(tmp_path, "skipped", population_health, True)
+
+    assert skipped == simulated
+    assert skipped_days == simulated_days
+    for column in ("agent", "code", "tick"):
+        assert np.array_equal(getattr(skipped_events, column), getattr(simulated_events, column))
+    # The infected agents were quarantined and recovered, the last days being quiet
+    codes = set(skipped_events.code.tolist())
+    assert {EventCode.QUARANTINED, EventCode.RECOVERED} <= codes
+    assert PandemicStatus.INFECTED not in skipped[-1][2]
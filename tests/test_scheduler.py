@@ -0,0 +1,47 @@
+import pytest
+
+from interaction.disease.spread_simulator import SpreadSimulator
+from interaction.utilities import PandemicStatus
+
+from helpers import run_simulation
+
+
+@pytest.mark.parametrize("population_health, min_load", [(False, 0.01), (True, 0.01), (False, 0.0)])
+def test_scheduler_matches_every_agent_acting(population_health, min_load):
+    # Frequent morning infections, so that the field is loaded and the exposed agents have to be woken
+    options = dict(infection_prob=0.3, population_health=population_health, min_load=min_load)
+    everyone, _ = run_simulation(active_set_scheduler=False, **options)
+    scheduled, _ = run_simulation(active_set_scheduler=True, **options)
+    assert any(status != PandemicStatus.SUSCEPTIBLE for _, status in everyone[-1])
+    assert scheduled == everyone
+
+
+def test_negligible_loads_are_cleared():
+    source = [(r, c) for r in range(28, 33) for c in range(28, 33)]
+    fields = {floor: SpreadSimulator(60, 60, 16000, 0.0007, 0.02, min_load=floor) for floor in (0.0, 0.01)}
+    for field in fields.values():
+        for row, col in source:
+            field.add_source(row, col, 40)
+        for _ in range(200):
+            field.update()
+
+    # Without a floor, diffusion leaves particles on every cell of the grid
+    assert all(all(row) for row in fields[0.0].grid)
+    assert fields[0.0].block_has_load(0, 0, 5)
+
+    cleared = fields[0.01]
+    assert cleared.contaminated
+    assert cleared.block_has_load(28, 28, 5)
+    assert not cleared.block_has_load(0, 0, 5)
+    assert not any(cleared.grid[0])
+
+
+def test_field_is_empty_once_every_load_is_cleared():
+    field = SpreadSimulator(20, 20, 16000, decay_const=0.05, diffusion_coeff=0.02, min_load=0.01)
+    field.add_source(10, 10, 40)
+    ticks = 0
+    while field.contaminated:
+        field.update()
+        ticks += 1
+        assert ticks < 1000
+    assert not any(any(row) for row in field.grid)
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from interaction.recording import tick_profiler
+from interaction.recording.tick_profiler import TickProfiler, _percentile
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0]
+
+    def advance(ns):
+        now[0] += ns
+
+    monkeypatch.setattr(tick_profiler, "_clock", lambda: now[0])
+    return advance
+
+
+def test_phases_are_charged_once(tmp_path, clock):
+    profiler = TickProfiler(str(tmp_path))
+    durations = [(300, 40), (5000, 40), (1, 40), (70000, 40)]  # (act, pathfinding inside act) per step
+    for tick, (act, pathfinding) in enumerate(durations):
+        profiler.start_step(tick)
+        profiler.switch("act")
+        clock(act)
+        previous = profiler.switch("pathfinding")
+        clock(pathfinding)
+        profiler.switch(previous)
+        clock(act)
+        profiler.switch("spread")
+        clock(1000)
+    profiler.end_step()
+
+    assert profiler.steps == len(durations)
+    assert profiler.totals == {"act": sum(2 * act for act, _ in durations), "pathfinding": 160, "spread": 4000}
+    histograms = profiler.histograms
+    assert all(len(histogram) == tick_profiler.BUCKETS for histogram in histograms.values())
+    expected = [0] * tick_profiler.BUCKETS
+    for act, _ in durations:
+        expected[(2 * act).bit_length()] += 1
+    assert histograms["act"] == expected
+    assert histograms["pathfinding"][(40).bit_length()] == 4
+    assert histograms["spread"][(1000).bit_length()] == 4
+
+
+def test_bucket_bounds_and_percentiles():
+    histogram = [0] * tick_profiler.BUCKETS
+    # Bucket b holds [2**(b-1), 2**b) nanoseconds
+    for ns in (512, 700, 1023):
+        assert ns.bit_length() == 10
+    histogram[10] = 4
+    assert _percentile(histogram, 0.0) == 512
+    assert _percentile(histogram, 0.5) == 512 + 512 * 2 / 4
+    assert _percentile(histogram, 1.0) == 1024
+    histogram[1] = 4
+    assert _percentile(histogram, 0.25) == 1.5
+    assert 512 <= _percentile(histogram, 0.9) <= 1024
+    assert _percentile([0] * tick_profiler.BUCKETS, 0.5) == 0.0
+
+
+def test_report_and_trace(tmp_path, clock):
+    profiler = TickProfiler(str(tmp_path), trace_steps=2)
+    for tick in range(5):
+        profiler.start_step(tick, ticks=3)
+        profiler.switch("render")
+        clock(2000)
+    profiler.close(ticks=3)
+    profiler.close()
+
+    report = (tmp_path / "profile_report.txt").read_text().splitlines()
+    assert report[0] == "5 steps, 15 ticks, 0.000 s profiled"
+    fields = report[2].split()
+    assert fields[0] == "render" and fields[3] == "5"
+    # p50, p90, p99 and max in microseconds: interpolated in [1024, 2048) ns, and clamped to the longest step
+    assert [float(value) for value in fields[5:]] == [1.5, 1.9, 2.0, 2.0]
+
+    trace = json.loads((tmp_path / "profile_trace.json").read_text())["traceEvents"]
+    steps = [event for event in trace if event["ph"] == "X"]
+    assert [event["args"] for event in steps] == [{"day_tick": 0, "ticks": 3}, {"day_tick": 1, "ticks": 3}]
+    assert all(event["dur"] == 2.0 for event in steps)
+
+
+def test_negative_trace_steps_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        TickProfiler(str(tmp_path), trace_steps=-1)